@@ -0,0 +1,67 @@
+"""Cost of highlighting every match as matches per line grow.
+
+Lines are hex dumps with one match per byte plus a CSV field pattern, so a
+line with n bytes carries about 2n spans. Time per match should stay
+roughly flat as n grows, since resolving the spans is O(m log m).
+
+    python -m benchmarks.all_matches
+"""
+
+import time
+
+from src.loader import Config, Pattern, get_foreground_color
+from src.processor import process_line
+
+BYTE_COUNTS = (10, 100, 500, 1000)
+LINE_COUNT = 200
+
+
+def make_config() -> Config:
+    return Config(
+        patterns={
+            "byte": Pattern(
+                pattern=r"\b[0-9a-f]{2}\b",
+                foreground_color=get_foreground_color("cyan"),
+                background_color="",
+                attributes="",
+                all_matches=True,
+            ),
+            "field": Pattern(
+                pattern=r"[^,]+",
+                foreground_color=get_foreground_color("yellow"),
+                background_color="",
+                attributes="",
+                all_matches=True,
+            ),
+        }
+    )
+
+
+def make_line(count: int) -> str:
+    return ",".join(
+        f"{index % 256:02x} {(index * 7) % 256:02x}" for index in range(count // 2)
+    )
+
+
+def main():
+    config = make_config()
+    _ = config.rules
+
+    print(f"{'bytes':>6} {'spans/line':>11} {'lines/s':>10} {'µs/span':>8}")
+    for count in BYTE_COUNTS:
+        line = make_line(count)
+        spans = len(config.rules.matches(line))
+
+        start = time.perf_counter()
+        for _ in range(LINE_COUNT):
+            process_line(config, line)
+        elapsed = time.perf_counter() - start
+
+        print(
+            f"{count:>6} {spans:>11} {LINE_COUNT / elapsed:>10,.0f}"
+            f" {elapsed / LINE_COUNT / spans * 1e6:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Full pipeline throughput of text mode against --binary mode, reading
+stdin or a memory-mapped file argument.
+
+    python -m benchmarks.binary
+"""
+
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.corpus import write_corpus
+
+ROOT = Path(__file__).parent.parent
+CONFIG = ROOT / "examples" / "app.toml"
+LINE_COUNT = 200_000
+
+
+def run(corpus: Path, *options: str) -> float:
+    start = time.perf_counter()
+    with open(corpus, "rb") as stdin:
+        subprocess.run(
+            [sys.executable, "main.py", "-c", str(CONFIG), "--color", "always"]
+            + [*options],
+            cwd=ROOT,
+            stdin=stdin,
+            stdout=subprocess.DEVNULL,
+            check=True,
+        )
+    return time.perf_counter() - start
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        corpus = Path(directory) / "corpus.log"
+        size = write_corpus(corpus, LINE_COUNT)
+
+        for name, options in (
+            ("text stdin", ()),
+            ("binary stdin", ("--binary",)),
+            ("text file", (str(corpus),)),
+            ("binary file", ("--binary", str(corpus))),
+        ):
+            elapsed = run(corpus, *options)
+            print(
+                f"{name:<14} {LINE_COUNT / elapsed:>10,.0f} lines/s"
+                f" {size / elapsed / 1e6:>7.1f} MB/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
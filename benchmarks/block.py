@@ -0,0 +1,52 @@
+"""Throughput of matching lines one at a time and as blocks, per example config.
+
+Blocks are about as large as easel reads from a regular file. Output of
+both is compared, as matching blocks must never change a line.
+
+    python -m benchmarks.block
+"""
+
+import time
+from itertools import batched
+from pathlib import Path
+
+from benchmarks.corpus import GENERATORS, generate_lines
+from src.loader import load_config
+from src.processor import process_block, process_line
+
+EXAMPLES = Path(__file__).parent.parent / "examples"
+
+LINE_COUNT = 50_000
+
+# About the lines in a block of BLOCK_BYTES read from a regular file
+BLOCK_LINES = 1024
+
+
+def measure(config, lines: list) -> tuple[float, float, bool]:
+    start = time.perf_counter()
+    single = [process_line(config, line) for line in lines]
+    single_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    blocks: list = []
+    for block in batched(lines, BLOCK_LINES):
+        blocks += process_block(config, block)
+    block_time = time.perf_counter() - start
+    return len(lines) / single_time, len(lines) / block_time, single == blocks
+
+
+def main():
+    print(
+        f"{'config':<16} {'per line lines/s':>17} {'block lines/s':>14} {'speedup':>8}"
+    )
+    for name in sorted(GENERATORS):
+        config = load_config(str(EXAMPLES / f"{name}.toml"))
+        single, block, same = measure(config, generate_lines(name, LINE_COUNT))
+        note = "" if same else "  output differs"
+        print(
+            f"{name:<16} {single:>17,.0f} {block:>14,.0f} {block / single:>7.2f}x{note}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Startup with a large config, compiled from the TOML or loaded from the cache.
+
+python -m benchmarks.config_cache
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PATTERN_COUNT = 300
+RUNS = 10
+
+COLORS = ("red", "green", "yellow", "blue", "magenta", "cyan", "#ff8800")
+
+
+def write_config(path: str, count: int = PATTERN_COUNT):
+    with open(path, "w") as file:
+        for index in range(count):
+            file.write(
+                f"[patterns.token_{index}]\n"
+                f'pattern = "\\\\b(?:token{index}|key{index})=\\\\w+"\n'
+                f'foreground_color = "{COLORS[index % len(COLORS)]}"\n'
+                f'attributes = "bold"\n\n'
+            )
+
+
+def measure(command: list[str], environment: dict) -> list[float]:
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run(
+            command,
+            cwd=ROOT,
+            env=environment,
+            input=b"",
+            stdout=subprocess.DEVNULL,
+            check=True,
+        )
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        config = os.path.join(directory, "config.toml")
+        write_config(config)
+        environment = os.environ | {"XDG_CACHE_HOME": os.path.join(directory, "cache")}
+        command = [sys.executable, "main.py", "-c", config]
+
+        print(f"{PATTERN_COUNT} patterns")
+        print(f"{'config':<10} {'min ms':>8} {'median ms':>10}")
+        for name, extra in (("compiled", ["--rebuild-cache"]), ("cached", [])):
+            timings = measure(command + extra, environment)
+            print(
+                f"{name:<10} {min(timings) * 1000:>8.1f}"
+                f" {statistics.median(timings) * 1000:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""Log lines shared by the benchmarks."""
+
+import random
+
+SAMPLE_LINES = [
+    '127.0.0.1 - - [10/Oct/2024:13:55:36 +0000] "GET /index.html HTTP/1.1" 200 2326',
+    '10.0.0.7 - - [10/Oct/2024:13:55:37 +0000] "POST /api/login HTTP/1.1" 401 112',
+    "2024-10-10 13:55:36 INFO  server started on port 8080",
+    "2024-10-10 13:55:37 ERROR request failed: TypeError: undefined is not a function",
+    "2024-10-10T13:55:38 web_1  | WARN slow query took 2300ms",
+    "SEVERE: java.lang.NullPointerException",
+    "    at com.example.Service.handle(Service.java:42)",
+    "<3>Oct 10 13:55:39 host kernel: disk error on sda",
+    "LOG:  statement: SELECT * FROM users WHERE id = 7",
+    "commit 3f2c9a1b Author: Jane Doe <jane@example.com>",
+]
+
+
+def write_corpus(path, line_count: int) -> int:
+    """Write line_count sample lines to path and return the size in bytes."""
+    with open(path, "w") as file:
+        for index in range(line_count):
+            file.write(SAMPLE_LINES[index % len(SAMPLE_LINES)])
+            file.write("\n")
+        return file.tell()
+
+
+# Synthetic corpora for the example configs: realistic line shapes with
+# enough variety that matches, misses and level mixes resemble real logs
+
+METHODS = ["GET", "GET", "GET", "POST", "PUT", "DELETE", "HEAD", "OPTIONS"]
+PATHS = [
+    "/",
+    "/index.html",
+    "/api/users",
+    "/api/orders/42",
+    "/static/app.js",
+    "/health",
+]
+STATUSES = [200, 200, 200, 200, 201, 204, 301, 304, 400, 401, 404, 500, 502, 503]
+LEVELS = ["INFO"] * 6 + ["DEBUG"] * 3 + ["WARN", "ERROR"]
+MONTHS = [
+    "Jan",
+    "Feb",
+    "Mar",
+    "Apr",
+    "May",
+    "Jun",
+    "Jul",
+    "Aug",
+    "Sep",
+    "Oct",
+    "Nov",
+    "Dec",
+]
+MESSAGES = [
+    "request completed",
+    "cache miss for key session:8f2a",
+    "connection pool exhausted, waiting",
+    "user 1042 logged in",
+    "retrying upstream call (attempt 2)",
+    "request failed: TypeError: undefined is not a function",
+    "unhandled Exception in worker thread",
+    "scheduled job finished in 1532ms",
+]
+
+
+def address(generator: random.Random) -> str:
+    return ".".join(str(generator.randrange(1, 255)) for _ in range(4))
+
+
+def clock(index: int) -> str:
+    second = index // 10
+    return f"{second // 3600 % 24:02}:{second // 60 % 60:02}:{second % 60:02}"
+
+
+def access_line(generator: random.Random, index: int) -> str:
+    return (
+        f"{address(generator)} - - [10/Oct/2024:{clock(index)} +0000] "
+        f'"{generator.choice(METHODS)} {generator.choice(PATHS)} HTTP/1.1" '
+        f"{generator.choice(STATUSES)} {generator.randrange(100, 50_000)} "
+        f'"-" "Mozilla/5.0 (X11; Linux x86_64)"'
+    )
+
+
+def app_line(generator: random.Random, index: int) -> str:
+    message = generator.choice(MESSAGES)
+    if generator.random() < 0.2:
+        message += f" from {address(generator)}"
+    return f"2024-10-10 {clock(index)} {generator.choice(LEVELS):<5} {message}"
+
+
+def docker_line(generator: random.Random, index: int) -> str:
+    service = generator.choice(["web_1", "db_1", "worker_1", "cache_1"])
+    level = generator.choice(LEVELS + ["FATAL"] * (generator.random() < 0.01))
+    status = generator.choice(STATUSES)
+    return (
+        f"2024-10-10T{clock(index)}.{generator.randrange(1000):03}Z {service:<9} | "
+        f"{level} {generator.choice(MESSAGES)} status={status}"
+    )
+
+
+def docker_compose_line(generator: random.Random, index: int) -> str:
+    if generator.random() < 0.5:
+        return f"user{generator.randrange(10_000)}@example.com"
+    return f"+1 ({generator.randrange(200, 999)}) {generator.randrange(200, 999)}-{generator.randrange(10_000):04}"
+
+
+def express_line(generator: random.Random, index: int) -> str:
+    level = generator.choice(["info"] * 6 + ["debug", "verbose", "warn", "error"])
+    return (
+        f"{level}: {generator.choice(METHODS)} {generator.choice(PATHS)} "
+        f"{generator.choice(STATUSES)} {generator.uniform(0.5, 900):.3f} ms - {generator.randrange(100, 9000)}"
+    )
+
+
+def fastapi_line(generator: random.Random, index: int) -> str:
+    level = generator.choice(["INFO"] * 6 + ["DEBUG", "WARNING", "ERROR", "CRITICAL"])
+    return (
+        f"{level}:     {address(generator)}:{generator.randrange(30_000, 60_000)} - "
+        f'"{generator.choice(METHODS)} {generator.choice(PATHS)} HTTP/1.1" '
+        f"{generator.choice(STATUSES)}"
+    )
+
+
+def flask_line(generator: random.Random, index: int) -> str:
+    if generator.random() < 0.3:
+        level = generator.choice(["INFO", "DEBUG", "WARNING", "ERROR"])
+        return f"[2024-10-10 {clock(index)},{generator.randrange(1000):03}] {level} in app: {generator.choice(MESSAGES)}"
+    return (
+        f"{address(generator)} - - [10/Oct/2024 {clock(index)}] "
+        f'"{generator.choice(METHODS[:6])} {generator.choice(PATHS)} HTTP/1.1" {generator.choice(STATUSES)} -'
+    )
+
+
+def git_line(generator: random.Random, index: int) -> str:
+    kind = index % 6
+    if kind == 0:
+        return f"commit {generator.getrandbits(160):040x}"
+    if kind == 1:
+        return "Author: Jane Doe <jane@example.com>"
+    if kind == 2:
+        return f"Date:   Thu Oct 10 {clock(index)} 2024 +0200"
+    if kind == 3:
+        return ""
+    return f"    {generator.choice(MESSAGES)}"
+
+
+def node_line(generator: random.Random, index: int) -> str:
+    if generator.random() < 0.1:
+        return f"    at {generator.choice(['Server', 'Router', 'Layer'])}.handle (/srv/app/index.js:{generator.randrange(1, 500)}:{generator.randrange(1, 80)})"
+    level = generator.choice(LEVELS + ["TRACE", "FATAL"] * (generator.random() < 0.05))
+    return f"2024-10-10T{clock(index)}.{generator.randrange(1000):03}Z {level} {generator.choice(MESSAGES)}"
+
+
+def postgres_line(generator: random.Random, index: int) -> str:
+    level = generator.choice(
+        ["LOG"] * 6 + ["INFO", "WARNING", "ERROR", "FATAL", "STATEMENT"]
+    )
+    statement = generator.choice(
+        [
+            "SELECT * FROM users WHERE id = 7",
+            "INSERT INTO events (kind, payload) VALUES ($1, $2)",
+            "UPDATE orders SET status = 'shipped' WHERE id = 42",
+            "DELETE FROM sessions WHERE expires < now()",
+            "checkpoint complete: wrote 112 buffers (0.7%)",
+        ]
+    )
+    return f"2024-10-10 {clock(index)}.{generator.randrange(1000):03} UTC [{generator.randrange(100, 9999)}] {level}:  {statement}"
+
+
+def syslog_line(generator: random.Random, index: int) -> str:
+    priority = generator.choice([6, 6, 6, 5, 4, 3, 7, 2])
+    return (
+        f"<{priority}>{generator.choice(MONTHS)} {generator.randrange(1, 29):2} {clock(index)} "
+        f"host{generator.randrange(4)} {generator.choice(['kernel', 'sshd', 'cron', 'systemd'])}: "
+        f"{generator.choice(MESSAGES)}"
+    )
+
+
+def tomcat_line(generator: random.Random, index: int) -> str:
+    if generator.random() < 0.15:
+        return f"\tat org.apache.catalina.core.StandardWrapperValve.invoke(StandardWrapperValve.java:{generator.randrange(100, 300)})"
+    level = generator.choice(["INFO"] * 5 + ["FINE", "CONFIG", "WARNING", "SEVERE"])
+    return (
+        f"10-Oct-2024 {clock(index)}.{generator.randrange(1000):03} {level} [http-nio-8080-exec-{generator.randrange(1, 10)}] "
+        f"org.apache.catalina.core.StandardService {generator.choice(MESSAGES)}"
+    )
+
+
+GENERATORS = {
+    "apache-access": access_line,
+    "app": app_line,
+    "docker": docker_line,
+    "docker-compose": docker_compose_line,
+    "express": express_line,
+    "fastapi": fastapi_line,
+    "flask": flask_line,
+    "git": git_line,
+    "nginx-access": access_line,
+    "node": node_line,
+    "postgres": postgres_line,
+    "syslog": syslog_line,
+    "tomcat": tomcat_line,
+}
+
+
+def generate_lines(name: str, line_count: int, seed: int = 0) -> list[str]:
+    """line_count lines shaped like the logs the example config name colors."""
+    generator = random.Random(seed)
+    line = GENERATORS[name]
+    return [line(generator, index) for index in range(line_count)]
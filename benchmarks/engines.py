@@ -0,0 +1,76 @@
+"""Throughput of searching each pattern versus one alternation of them all.
+
+An engine matching every pattern in a single pass would search one regex
+joining the patterns. CPython's re finds a literal-led pattern with a fast
+prefix search, which an alternation gives up by trying every pattern at
+every position. The alternation is no faster on most example configs even
+though it finds less, only one pattern's match where several overlap, so
+rules stay searched one at a time. Patterns with groups depend on their
+own group numbering and are searched separately in both.
+
+    python -m benchmarks.engines
+"""
+
+import re
+import time
+from pathlib import Path
+
+from benchmarks.corpus import SAMPLE_LINES
+from src.loader import load_config
+
+EXAMPLES = Path(__file__).parent.parent / "examples"
+
+LINES = SAMPLE_LINES * 500
+
+
+def split_regexes(regexes: list[re.Pattern]) -> tuple[re.Pattern, list[re.Pattern]]:
+    """One alternation of the regexes without groups, and the others."""
+    combined = []
+    separate = []
+    for regex in regexes:
+        try:
+            re.compile(f"(?:{regex.pattern})")
+        except re.error:
+            # Leading global flags cannot be nested
+            separate.append(regex)
+            continue
+        if regex.groups:
+            separate.append(regex)
+        else:
+            combined.append(f"(?:{regex.pattern})")
+    return re.compile("|".join(combined)), separate
+
+
+def scan(regexes: list[re.Pattern]) -> float:
+    start = time.perf_counter()
+    for line in LINES:
+        for regex in regexes:
+            regex.search(line)
+    return len(LINES) / (time.perf_counter() - start)
+
+
+def single_pass(combined: re.Pattern, separate: list[re.Pattern]) -> float:
+    start = time.perf_counter()
+    for line in LINES:
+        for _ in combined.finditer(line):
+            pass
+        for regex in separate:
+            regex.search(line)
+    return len(LINES) / (time.perf_counter() - start)
+
+
+def main():
+    print(
+        f"{'config':<20} {'patterns':>8} {'scan lines/s':>13} {'one pass lines/s':>17}"
+    )
+    for path in sorted(EXAMPLES.glob("*.toml")):
+        regexes = [rule.regex for rule in load_config(str(path)).rules.rules]
+        combined, separate = split_regexes(regexes)
+        print(
+            f"{path.stem:<20} {len(regexes):>8}"
+            f" {scan(regexes):>13,.0f} {single_pass(combined, separate):>17,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Output cost of the flush policies against the previous typer.echo path.
+
+python -m benchmarks.flush
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+import typer
+
+from benchmarks.corpus import SAMPLE_LINES
+from src.loader import load_config
+from src.output import Writer
+from src.processor import process_line
+
+CONFIG = Path(__file__).parent.parent / "examples" / "app.toml"
+LINE_COUNT = 200_000
+
+
+def echo(lines: list[str], file) -> None:
+    for line in lines:
+        typer.echo(line, file=file, color=True)
+
+
+def writer(flush: str):
+    def write(lines: list[str], file) -> None:
+        with Writer(file, flush) as output:
+            for line in lines:
+                output.write(line)
+
+    return write
+
+
+def main():
+    config = load_config(str(CONFIG))
+    processed = [process_line(config, line) for line in SAMPLE_LINES]
+    lines = [processed[index % len(processed)] for index in range(LINE_COUNT)]
+
+    for name, function in (
+        ("typer.echo", echo),
+        ("--flush=line", writer("line")),
+        ("--flush=block", writer("block")),
+    ):
+        with tempfile.TemporaryFile("w+") as file:
+            start = time.perf_counter()
+            function(lines, file)
+            elapsed = time.perf_counter() - start
+        print(f"{name:<14} {LINE_COUNT / elapsed:>12,.0f} lines/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""End-to-end latency of --follow, from a line being appended to the file
+to its colorized form arriving on easel's stdout.
+
+    python -m benchmarks.follow_latency
+"""
+
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+CONFIG = ROOT / "examples" / "app.toml"
+SAMPLES = 200
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "app.log"
+        path.write_text("")
+        process = subprocess.Popen(
+            [sys.executable, "main.py", "-c", str(CONFIG), "--color", "always"]
+            + ["--follow", "--lines", "0", str(path)],
+            cwd=ROOT,
+            stdout=subprocess.PIPE,
+        )
+        assert process.stdout is not None
+
+        # Give the follower time to start before measuring
+        time.sleep(1)
+        latencies: list[float] = []
+        with open(path, "a") as log:
+            for index in range(SAMPLES):
+                start = time.perf_counter()
+                log.write(f"2024-10-10 13:55:36 INFO request {index}\n")
+                log.flush()
+                process.stdout.readline()
+                latencies.append((time.perf_counter() - start) * 1000)
+                time.sleep(0.005)
+
+        process.terminate()
+        process.wait()
+
+    latencies.sort()
+    print(f"samples {SAMPLES}")
+    print(f"p50 {statistics.median(latencies):.2f} ms")
+    print(f"p95 {latencies[int(SAMPLES * 0.95)]:.2f} ms")
+    print(f"p99 {latencies[int(SAMPLES * 0.99)]:.2f} ms")
+    print(f"max {latencies[-1]:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Cost per record of colorizing log records in-process.
+
+Compares formatting with logging.Formatter and ColorFormatter, and the
+time the logging thread spends handing a record to a StreamHandler, to one
+using ColorFormatter, and to QueueColorHandler, which colorizes on another
+thread.
+
+    python -m benchmarks.formatter
+"""
+
+import logging
+import os
+import time
+from pathlib import Path
+
+from src.formatter import ColorFormatter, QueueColorHandler
+
+CONFIG = Path(__file__).parent.parent / "examples" / "app.toml"
+
+FORMAT = "%(asctime)s %(levelname)s %(message)s"
+
+RECORD_COUNT = 50_000
+
+MESSAGES = [
+    ("request completed in %d ms from %s", (42, "10.0.0.7")),
+    ("cache miss for key %s", ("session:8f2a",)),
+    ("request failed: %s", ("TypeError: undefined is not a function",)),
+    ("user %d logged in", (1042,)),
+]
+
+LEVELS = [logging.INFO, logging.INFO, logging.ERROR, logging.WARNING]
+
+
+def make_records() -> list[logging.LogRecord]:
+    return [
+        logging.LogRecord(
+            "app", LEVELS[index % 4], __file__, 1, *MESSAGES[index % 4], None
+        )
+        for index in range(RECORD_COUNT)
+    ]
+
+
+def per_record(function, records: list) -> float:
+    """Best of three runs, in microseconds per record."""
+    timings = []
+    for _ in range(3):
+        start = time.perf_counter()
+        for record in records:
+            function(record)
+        timings.append(time.perf_counter() - start)
+    return min(timings) / len(records) * 1e6
+
+
+def main():
+    records = make_records()
+    plain = logging.Formatter(FORMAT)
+    colored = ColorFormatter(str(CONFIG), FORMAT)
+
+    with open(os.devnull, "w") as devnull:
+        stream = logging.StreamHandler(devnull)
+        stream.setFormatter(plain)
+        colored_stream = logging.StreamHandler(devnull)
+        colored_stream.setFormatter(colored)
+        queued = QueueColorHandler(
+            str(CONFIG), FORMAT, handler=logging.StreamHandler(devnull)
+        )
+
+        results = [
+            ("Formatter.format", per_record(plain.format, records)),
+            ("ColorFormatter.format", per_record(colored.format, records)),
+            ("StreamHandler.handle", per_record(stream.handle, records)),
+            ("  with ColorFormatter", per_record(colored_stream.handle, records)),
+            ("QueueColorHandler.handle", per_record(queued.handle, records)),
+        ]
+        queued.close()
+
+    print(f"{'step':<26} {'µs/record':>10}")
+    for name, microseconds in results:
+        print(f"{name:<26} {microseconds:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
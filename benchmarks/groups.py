@@ -0,0 +1,84 @@
+"""Styling the fields of access log lines with one pattern or one per field.
+
+Six separate patterns, each anchored on its field with lookarounds, are
+compared with a single anchored pattern styling the same fields through
+named groups, which finds them all in one match. Both style lines the
+same, which is checked.
+
+    python -m benchmarks.groups
+"""
+
+import time
+
+from src.loader import build_rules
+from src.processor import process_block, process_line
+
+from .corpus import generate_lines
+
+LINE_COUNT = 20_000
+
+FIELDS = {
+    "ip": ("cyan", r"^\S+"),
+    "time": ("magenta", r"(?<=\[)[^\]]+(?=\])"),
+    "method": ("blue", r'(?<=")[A-Z]+(?= )'),
+    "path": ("green", r"(?<= )/\S*(?= HTTP)"),
+    "status": ("yellow", r'(?<=" )\d{3}(?= )'),
+    "size": ("red", r'(?<=" \d{3} )\d+'),
+}
+
+ACCESS = (
+    r'^(?P<ip>\S+) \S+ \S+ \[(?P<time>[^\]]+)\] "(?P<method>[A-Z]+) (?P<path>\S+)'
+    r' [^"]*" (?P<status>\d{3}) (?P<size>\d+|-)'
+)
+
+
+def separate_config() -> dict:
+    return {
+        "patterns": {
+            name: {"pattern": pattern, "foreground_color": color}
+            for name, (color, pattern) in FIELDS.items()
+        }
+    }
+
+
+def grouped_config() -> dict:
+    groups = {name: {"foreground_color": color} for name, (color, _) in FIELDS.items()}
+    return {"patterns": {"access": {"pattern": ACCESS, "groups": groups}}}
+
+
+def process_lines(rules, lines: list[str]):
+    for line in lines:
+        process_line(rules, line)
+
+
+def elapsed(function, *arguments) -> float:
+    """Best of three runs, in seconds."""
+    timings = []
+    for _ in range(3):
+        start = time.perf_counter()
+        function(*arguments)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    lines = generate_lines("nginx-access", LINE_COUNT)
+
+    outputs = []
+    print(f"{'config':<10} {'line lines/s':>13} {'block lines/s':>14}")
+    for name, config in (
+        ("separate", separate_config()),
+        ("grouped", grouped_config()),
+    ):
+        rules = build_rules(config)
+        outputs.append(process_block(rules, lines))
+        per_line = elapsed(process_lines, rules, lines)
+        block = elapsed(process_block, rules, lines)
+        print(
+            f"{name:<10} {LINE_COUNT / per_line:>13,.0f} {LINE_COUNT / block:>14,.0f}"
+        )
+    assert outputs[0] == outputs[1], "grouped pattern styled lines differently"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Throughput on a repetitive stream with and without the line cache.
+
+Most lines are health checks and heartbeats that repeat exactly apart from
+their leading timestamp, as in a busy service's access log.
+
+    python -m benchmarks.line_cache
+"""
+
+import random
+import time
+
+from src.line_cache import LineCache
+from src.loader import load_config
+from src.processor import process_line
+
+from .corpus import SAMPLE_LINES
+
+LINE_COUNT = 50_000
+CACHE_SIZE = 1024
+
+LINES_PER_SECOND = 5
+
+# Length of "2024-10-10 13:55:36 "
+PREFIX = 20
+
+REPEATED = [
+    "INFO  GET /health 200 OK 2ms",
+    "INFO  heartbeat from worker-1",
+    "INFO  heartbeat from worker-2",
+    "DEBUG GET /metrics 200 OK 1ms",
+]
+
+
+def make_lines() -> list[str]:
+    generator = random.Random(0)
+    lines = []
+    for index in range(LINE_COUNT):
+        second = index // LINES_PER_SECOND
+        timestamp = f"2024-10-10 {second // 3600 % 24:02}:{second // 60 % 60:02}:{second % 60:02} "
+        if generator.random() < 0.9:
+            lines.append(timestamp + generator.choice(REPEATED))
+        else:
+            lines.append(timestamp + generator.choice(SAMPLE_LINES))
+    return lines
+
+
+def main():
+    rules = load_config("examples/app.toml").rules
+    lines = make_lines()
+
+    print(f"{'mode':<14} {'lines/s':>10} {'hit rate':>9}")
+    for name, cache in (
+        ("no cache", None),
+        ("whole line", LineCache(rules, CACHE_SIZE)),
+        ("after prefix", LineCache(rules, CACHE_SIZE, PREFIX)),
+    ):
+        process = cache.process if cache else lambda line: process_line(rules, line)
+        start = time.perf_counter()
+        for line in lines:
+            process(line)
+        elapsed = time.perf_counter() - start
+        hit_rate = f"{cache.hit_rate:.1%}" if cache else "-"
+        print(f"{name:<14} {LINE_COUNT / elapsed:>10,.0f} {hit_rate:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Escape code overhead and throughput of process_line per example config.
+
+python -m benchmarks.output_size
+"""
+
+import time
+from pathlib import Path
+
+from src.loader import load_config
+from src.processor import process_line
+
+from .corpus import SAMPLE_LINES
+
+EXAMPLES = Path(__file__).parent.parent / "examples"
+REPEAT = 1000
+
+
+def main():
+    lines = SAMPLE_LINES * REPEAT
+    plain = sum(map(len, lines))
+
+    print(f"{'config':<20} {'escape bytes/line':>18} {'lines/s':>10}")
+    for path in sorted(EXAMPLES.glob("*.toml")):
+        config = load_config(str(path))
+        start = time.perf_counter()
+        output = [process_line(config, line) for line in lines]
+        elapsed = time.perf_counter() - start
+
+        overhead = (sum(map(len, output)) - plain) / len(lines)
+        print(f"{path.stem:<20} {overhead:>18.1f} {len(lines) / elapsed:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
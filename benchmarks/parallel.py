@@ -0,0 +1,52 @@
+"""Full pipeline throughput and memory for increasing --jobs.
+
+python -m benchmarks.parallel
+"""
+
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.corpus import write_corpus
+
+ROOT = Path(__file__).parent.parent
+CONFIG = ROOT / "examples" / "app.toml"
+LINE_COUNT = 400_000
+
+
+def run(corpus: Path, jobs: int) -> float:
+    start = time.perf_counter()
+    with open(corpus, "rb") as stdin:
+        subprocess.run(
+            [sys.executable, "main.py", "-c", str(CONFIG), "--color", "always"]
+            + ["--binary", "--jobs", str(jobs)],
+            cwd=ROOT,
+            stdin=stdin,
+            stdout=subprocess.DEVNULL,
+            check=True,
+        )
+    return time.perf_counter() - start
+
+
+def main():
+    counts = sorted({1, 2, 4, os.cpu_count() or 1})
+    with tempfile.TemporaryDirectory() as directory:
+        corpus = Path(directory) / "corpus.log"
+        size = write_corpus(corpus, LINE_COUNT)
+
+        for jobs in counts:
+            elapsed = run(corpus, jobs)
+            # Largest resident set of any process run so far, in KiB on Linux
+            peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+            print(
+                f"jobs={jobs:<3} {LINE_COUNT / elapsed:>10,.0f} lines/s"
+                f" {size / elapsed / 1e6:>7.1f} MB/s  peak rss {peak / 1024:.0f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
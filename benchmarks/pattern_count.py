@@ -0,0 +1,93 @@
+"""Throughput of process_line as the number of patterns grows.
+
+Compares the compiled rule set against searching with raw pattern strings,
+which goes through the re module cache and falls off a cliff once the
+config holds more patterns than that cache.
+
+    python -m benchmarks.pattern_count
+"""
+
+import random
+import re
+import time
+
+from src.loader import Config, Pattern, get_foreground_color
+from src.processor import process_line
+
+PATTERN_COUNTS = (10, 100, 300, 600, 1000)
+LINE_COUNT = 500
+
+
+def make_config(count: int) -> Config:
+    return Config(
+        patterns={
+            f"token_{index}": Pattern(
+                pattern=rf"\btoken{index}=\d+",
+                foreground_color=get_foreground_color("red"),
+                background_color="",
+                attributes="",
+            )
+            for index in range(count)
+        }
+    )
+
+
+def make_lines(count: int) -> list[str]:
+    generator = random.Random(0)
+    return [
+        " ".join(
+            f"token{generator.randrange(count)}={generator.randrange(1000)}"
+            for _ in range(4)
+        )
+        for _ in range(LINE_COUNT)
+    ]
+
+
+def search_raw(config: Config, lines: list[str]) -> None:
+    # Mirrors the previous per-line re.search(values.pattern, line) lookups
+    for line in lines:
+        for values in config.patterns.values():
+            re.search(values.pattern, line)
+
+
+def search_compiled(config: Config, lines: list[str]) -> None:
+    rules = config.rules.rules
+    for line in lines:
+        for rule in rules:
+            rule.regex.search(line)
+
+
+def render(config: Config, lines: list[str]) -> None:
+    for line in lines:
+        process_line(config, line)
+
+
+def measure(function, config: Config, lines: list[str]) -> float:
+    start = time.perf_counter()
+    function(config, lines)
+    return time.perf_counter() - start
+
+
+def main():
+    # Searches per second should stay flat for the compiled rule set
+    print(
+        f"{'patterns':>8} {'raw searches/s':>15} {'compiled searches/s':>20}"
+        f" {'process_line lines/s':>21}"
+    )
+    for count in PATTERN_COUNTS:
+        config = make_config(count)
+        lines = make_lines(count)
+        _ = config.rules
+
+        raw = measure(search_raw, config, lines)
+        compiled = measure(search_compiled, config, lines)
+        rendered = measure(render, config, lines)
+        print(
+            f"{count:>8} {LINE_COUNT * count / raw:>15,.0f}"
+            f" {LINE_COUNT * count / compiled:>20,.0f}"
+            f" {LINE_COUNT / rendered:>21,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Wall time of short easel invocations, as run from pipelines and hooks.
+
+Compares the bare interpreter, the fast path taken for plain command lines
+and the typer path that help, version and usage errors go through. The fast
+path should add under 50 ms to the interpreter's own startup; it is timed
+here rather than in the tests, where a loaded machine would fail it.
+
+    python -m benchmarks.startup
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIG = os.path.join(ROOT, "examples", "app.toml")
+RUNS = 20
+
+# Most the fast path may add to the interpreter's startup
+TARGET_OVERHEAD = 0.05
+
+COMMANDS = {
+    "python": [sys.executable, "-c", "pass"],
+    "fast path": [sys.executable, "main.py", "-c", CONFIG],
+    "typer path": [
+        sys.executable,
+        "-c",
+        "import sys; from src.command import app; app(sys.argv[1:])",
+        "-c",
+        CONFIG,
+    ],
+}
+
+
+def measure(command: list[str], runs: int = RUNS) -> list[float]:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            command, cwd=ROOT, input=b"", stdout=subprocess.DEVNULL, check=True
+        )
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    print(f"{'command':<12} {'min ms':>8} {'median ms':>10}")
+    fastest = {}
+    for name, command in COMMANDS.items():
+        timings = measure(command)
+        fastest[name] = min(timings)
+        print(
+            f"{name:<12} {min(timings) * 1000:>8.1f}"
+            f" {statistics.median(timings) * 1000:>10.1f}"
+        )
+
+    overhead = fastest["fast path"] - fastest["python"]
+    verdict = "ok" if overhead < TARGET_OVERHEAD else "over target"
+    print(
+        f"\nfast path overhead {overhead * 1000:.1f} ms,"
+        f" target under {TARGET_OVERHEAD * 1000:.0f} ms: {verdict}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""Throughput, latency and memory for every example config, saved as JSON.
+
+Each config gets a synthetic corpus shaped like the logs it colors. Lines
+are run through process_line in a fresh process, for lines/s, MB/s,
+per-line latency percentiles and peak RSS, and through main.py as a whole
+(reading a file, writing colored output) for the same minus latency.
+
+    python -m benchmarks.suite --output before.json
+    python -m benchmarks.suite --output after.json --compare before.json
+
+Per-line latencies include the cost of reading the clock, around 0.1 µs.
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+from .corpus import GENERATORS, generate_lines
+
+ROOT = Path(__file__).parent.parent
+EXAMPLES = ROOT / "examples"
+
+LINE_COUNT = 50_000
+PERCENTILES = (50, 90, 99, 99.9)
+
+# ru_maxrss is in kilobytes on Linux but bytes on macOS
+RSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+def percentile(sorted_values: list[int], percent: float) -> int:
+    index = round(percent / 100 * (len(sorted_values) - 1))
+    return sorted_values[index]
+
+
+def measure_process_line(name: str, line_count: int) -> dict:
+    """Run in a fresh worker, so peak RSS covers this config only."""
+    from src.loader import load_config
+    from src.processor import process_line
+
+    config = load_config(str(EXAMPLES / f"{name}.toml"))
+    lines = generate_lines(name, line_count)
+    size = sum(len(line.encode()) + 1 for line in lines)
+
+    # Throughput without a clock read per line
+    start = time.perf_counter()
+    for line in lines:
+        process_line(config, line)
+    elapsed = time.perf_counter() - start
+
+    clock = time.perf_counter_ns
+    latencies = []
+    for line in lines:
+        before = clock()
+        process_line(config, line)
+        latencies.append(clock() - before)
+    latencies.sort()
+
+    return {
+        "lines_per_second": line_count / elapsed,
+        "mb_per_second": size / elapsed / 1e6,
+        "latency_us": {
+            f"p{percent:g}": percentile(latencies, percent) / 1000
+            for percent in PERCENTILES
+        },
+        "peak_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * RSS_UNIT,
+    }
+
+
+def measure_pipeline(name: str, line_count: int) -> dict:
+    """Colorize a corpus file with main.py, as a user would."""
+    with tempfile.TemporaryDirectory() as directory:
+        corpus = os.path.join(directory, "corpus.log")
+        with open(corpus, "w") as file:
+            for line in generate_lines(name, line_count):
+                file.write(line)
+                file.write("\n")
+            size = file.tell()
+
+        command = [
+            sys.executable,
+            str(ROOT / "main.py"),
+            "--config",
+            str(EXAMPLES / f"{name}.toml"),
+            "--color",
+            "always",
+            corpus,
+        ]
+        start = time.perf_counter()
+        process = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.DEVNULL)
+        # wait4 gives the resource usage of this child alone
+        _, status, usage = os.wait4(process.pid, 0)
+        elapsed = time.perf_counter() - start
+        process.returncode = os.waitstatus_to_exitcode(status)
+        if process.returncode:
+            raise RuntimeError(f"{' '.join(command)} exited with {process.returncode}")
+
+    return {
+        "lines_per_second": line_count / elapsed,
+        "mb_per_second": size / elapsed / 1e6,
+        "peak_rss_bytes": usage.ru_maxrss * RSS_UNIT,
+    }
+
+
+def revision() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def run_suite(names: list[str], line_count: int) -> dict:
+    results = {}
+    for name in names:
+        with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as pool:
+            process_line = pool.submit(measure_process_line, name, line_count).result()
+        results[name] = {
+            "process_line": process_line,
+            "pipeline": measure_pipeline(name, line_count),
+        }
+        report(name, results[name])
+
+    return {
+        "revision": revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "line_count": line_count,
+        "results": results,
+    }
+
+
+def report(name: str, result: dict):
+    line = result["process_line"]
+    pipeline = result["pipeline"]
+    latency = line["latency_us"]
+    print(
+        f"{name:<16} {line['lines_per_second']:>10,.0f} {line['mb_per_second']:>7.1f}"
+        f" {latency['p50']:>6.1f} {latency['p99']:>6.1f} {latency['p99.9']:>8.1f}"
+        f" {line['peak_rss_bytes'] / 2**20:>6.1f}"
+        f" {pipeline['lines_per_second']:>10,.0f} {pipeline['mb_per_second']:>7.1f}"
+        f" {pipeline['peak_rss_bytes'] / 2**20:>6.1f}"
+    )
+
+
+def compare(before: dict, after: dict):
+    """Print the throughput change per config between two result files."""
+    print(f"\nchange against {before.get('revision') or 'baseline'}")
+    print(f"{'config':<16} {'process_line':>12} {'pipeline':>9}")
+    for name, result in after["results"].items():
+        previous = before["results"].get(name)
+        if previous is None:
+            continue
+        changes = [
+            result[stage]["lines_per_second"] / previous[stage]["lines_per_second"] - 1
+            for stage in ("process_line", "pipeline")
+        ]
+        print(f"{name:<16} {changes[0]:>+12.1%} {changes[1]:>+9.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("configs", nargs="*", help="example configs, all by default")
+    parser.add_argument("--lines", type=int, default=LINE_COUNT)
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--compare", help="earlier results to compare against")
+    args = parser.parse_args()
+
+    names = args.configs or sorted(GENERATORS)
+    for name in names:
+        if name not in GENERATORS:
+            parser.error(f"Invalid config: {name}")
+
+    print(
+        f"{'':<16} {'process_line':^45} {'main.py':^26}\n"
+        f"{'config':<16} {'lines/s':>10} {'MB/s':>7} {'p50 µs':>6} {'p99 µs':>6}"
+        f" {'p99.9 µs':>8} {'RSS MB':>6} {'lines/s':>10} {'MB/s':>7} {'RSS MB':>6}"
+    )
+    results = run_suite(names, args.lines)
+
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+        file.write("\n")
+    print(f"\nresults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            compare(json.load(file), results)
+
+
+if __name__ == "__main__":
+    main()
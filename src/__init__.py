@@ -1 +1,15 @@
-# src package
\ No newline at end of file
+# src package
+__all__ = ["ColorFormatter", "Highlighter", "QueueColorHandler"]
+
+
+def __getattr__(name: str):
+    # Imported on first use, keeping it off the startup path of the command line
+    if name == "Highlighter":
+        from .highlighter import Highlighter
+
+        return Highlighter
+    if name in ("ColorFormatter", "QueueColorHandler"):
+        from . import formatter
+
+        return getattr(formatter, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
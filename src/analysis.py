@@ -0,0 +1,188 @@
+import re
+from collections.abc import Iterable
+
+# Parsed like required_literals does, see literals.py
+from re import _constants as constants, _parser as parser
+
+from .budget import INTERVAL_TIMERS, MatchBudget
+from .engine import Rule, RuleSet
+from .stats import Profile, ProfiledRuleSet
+
+# Repeats that give back characters when the rest of the pattern fails
+BACKTRACKING = (constants.MAX_REPEAT, constants.MIN_REPEAT)
+
+ANCHORS = (
+    (constants.AT, constants.AT_BEGINNING),
+    (constants.AT, constants.AT_BEGINNING_STRING),
+)
+
+# Lines the cost of patterns is estimated on when no sample is given; the
+# long runs of word characters are where nested quantifiers blow up
+SAMPLE_LINES = [
+    '127.0.0.1 - - [10/Oct/2024:13:55:36 +0000] "GET /index.html HTTP/1.1" 200 2326',
+    "2024-10-10 13:55:37 ERROR request failed: TypeError: undefined is not a function",
+    "2024-10-10T13:55:38 web_1  | WARN slow query took 2300ms",
+    "    at com.example.Service.handle(Service.java:42)",
+    "<3>Oct 10 13:55:39 host kernel: disk error on sda",
+    "LOG:  statement: SELECT * FROM users WHERE id = 7",
+    "a" * 30 + "!",
+    " ".join(["word"] * 200),
+    "x" * 2000,
+]
+
+# Time a pattern may take on one sample line before it counts as runaway
+SAMPLE_BUDGET_MS = 100
+
+
+class Finding:
+    """A performance hazard in a pattern, with a rewrite to try if there is one."""
+
+    __slots__ = ("key", "message", "suggestion")
+
+    def __init__(self, key: str, message: str, suggestion: str | None = None):
+        self.key = key
+        self.message = message
+        self.suggestion = suggestion
+
+    def __str__(self):
+        if self.suggestion is None:
+            return f"{self.key}: {self.message}"
+        return f"{self.key}: {self.message}\n  try: {self.suggestion}"
+
+
+def analyze_rules(rules: RuleSet) -> list[Finding]:
+    """Hazards found in the patterns of rules by looking at their structure."""
+    findings: list[Finding] = []
+    for rule in rules.rules:
+        findings += analyze_rule(rule)
+    return findings
+
+
+def analyze_rule(rule: Rule) -> list[Finding]:
+    pattern = rule.regex.pattern
+    if isinstance(pattern, bytes):
+        pattern = pattern.decode("latin-1")
+    try:
+        items = list(parser.parse(pattern, rule.regex.flags))
+    except re.error:
+        return []
+
+    findings: list[Finding] = []
+    if nested_repeat(items):
+        findings.append(
+            Finding(
+                rule.key,
+                "a repeated group contains another unbounded repeat, which can"
+                " backtrack exponentially on lines that almost match",
+                "make the inner repeat possessive, e.g. (a++)+, or the group atomic with (?>...)",
+            )
+        )
+
+    anchored = bool(items) and items[0] in ANCHORS
+    if not anchored and items and any_repeat(items[0]):
+        findings.append(
+            Finding(
+                rule.key,
+                "starts with .*, so a line without a match is scanned again from"
+                " every position",
+                f"^{pattern}",
+            )
+        )
+    elif not anchored and len(items) > 1 and any_repeat(items[-1]):
+        prefix = "\\b" if word_literal(items[0]) else "^"
+        findings.append(
+            Finding(
+                rule.key,
+                "ends in an unanchored .*, so it also matches in the middle of"
+                " other words and styles the rest of the line from there",
+                f"{prefix}{pattern}",
+            )
+        )
+
+    if not anchored and not rule.required:
+        findings.append(
+            Finding(
+                rule.key,
+                "has no literal text every match contains, so the regex runs on"
+                " every line instead of only on lines containing the literal",
+                "include a fixed word, or anchor the pattern with ^",
+            )
+        )
+    return findings
+
+
+def nested_repeat(items: Iterable[tuple], inside: bool = False) -> bool:
+    """Whether an unbounded backtracking repeat sits inside another."""
+    for opcode, argument in items:
+        if opcode in BACKTRACKING:
+            _, maximum, body = argument
+            unbounded = maximum == constants.MAXREPEAT
+            if unbounded and inside:
+                return True
+            if nested_repeat(body, inside or unbounded):
+                return True
+        elif opcode is constants.SUBPATTERN:
+            if nested_repeat(argument[3], inside):
+                return True
+        elif opcode is constants.BRANCH:
+            if any(nested_repeat(branch, inside) for branch in argument[1]):
+                return True
+        # Atomic groups and possessive repeats never backtrack into themselves
+    return False
+
+
+def any_repeat(item: tuple) -> bool:
+    opcode, argument = item
+    if opcode not in BACKTRACKING:
+        return False
+    minimum, maximum, body = argument
+    return (
+        minimum == 0
+        and maximum == constants.MAXREPEAT
+        and list(body) == [(constants.ANY, None)]
+    )
+
+
+def word_literal(item: tuple) -> bool:
+    opcode, argument = item
+    return opcode is constants.LITERAL and (
+        chr(argument).isalnum() or argument == ord("_")
+    )
+
+
+def estimate_costs(
+    rules: RuleSet, lines: list, budget_ms: int = SAMPLE_BUDGET_MS
+) -> tuple[Profile, list[Finding]]:
+    """Time every pattern on sample lines, flagging those that run away.
+
+    A pattern exceeding budget_ms on a line is stopped, and not tried on
+    the remaining lines. Without INTERVAL_TIMERS patterns run unbudgeted,
+    so none are flagged.
+    """
+    budget = (
+        MatchBudget(budget_ms, disable_after=1, warn=False) if INTERVAL_TIMERS else None
+    )
+    profile = Profile()
+    profiled = ProfiledRuleSet(rules, profile, budget)
+    for line in lines:
+        profiled.spans(line)
+
+    findings = [
+        Finding(
+            key,
+            f"took over {budget_ms} ms on a sample line and was stopped, most"
+            " likely from catastrophic backtracking",
+        )
+        for key in (budget.overruns if budget else ())
+    ]
+    return profile, findings
+
+
+def cost_table(profile: Profile, line_count: int) -> str:
+    width = max(len("pattern"), *(len(key) for key in profile.patterns))
+    lines = [f"{'pattern':<{width}} {'µs/line':>10} {'attempts':>9}"]
+    for stats in sorted(profile.patterns.values(), key=lambda stats: -stats.time):
+        lines.append(
+            f"{stats.key:<{width}} {stats.time / line_count / 1000:>10.2f} {stats.attempts:>9,}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,229 @@
+import re
+from bisect import bisect_right
+from collections.abc import Iterator, Sequence
+
+# Parsed like required_literals does, see literals.py
+from re import _constants as constants, _parser as parser
+
+from .engine import Rule, all_matches, group_spans
+
+NEWLINE = ord("\n")
+
+REPEATS = (constants.MAX_REPEAT, constants.MIN_REPEAT, constants.POSSESSIVE_REPEAT)
+
+# Classes that contain a newline, as the parser emits them
+NEWLINE_CATEGORIES = (
+    constants.CATEGORY_SPACE,
+    constants.CATEGORY_NOT_DIGIT,
+    constants.CATEGORY_NOT_WORD,
+    constants.CATEGORY_LINEBREAK,
+)
+
+# Anchors that see the whole block rather than the line
+STRING_ANCHORS = (constants.AT_BEGINNING_STRING, constants.AT_END_STRING)
+
+
+def block_regex(regex: re.Pattern) -> re.Pattern | None:
+    """The regex to search a block of newline-joined lines with, if any.
+
+    A regex that can neither match a newline, not even inside a lookaround,
+    nor anchor to the start or end of the string finds the same matches in
+    a block with MULTILINE set as in each line on its own: ^ and $ match at
+    line boundaries, and no match can run into the next line. Other regexes
+    return None and have to be searched line by line.
+    """
+    try:
+        parsed = parser.parse(regex.pattern, regex.flags)
+    except re.error:
+        return None
+    if reaches_newline(list(parsed), regex.flags):
+        return None
+    return re.compile(regex.pattern, regex.flags | re.MULTILINE)
+
+
+def reaches_newline(items: list[tuple], flags: int) -> bool:
+    """Whether parsed items can match a newline or anchor to the string."""
+    for opcode, argument in items:
+        if opcode is constants.LITERAL:
+            reaches = argument == NEWLINE
+        elif opcode is constants.NOT_LITERAL:
+            reaches = argument != NEWLINE
+        elif opcode is constants.ANY:
+            reaches = bool(flags & re.DOTALL)
+        elif opcode is constants.IN:
+            reaches = set_contains_newline(argument)
+        elif opcode is constants.AT:
+            reaches = argument in STRING_ANCHORS
+        elif opcode in REPEATS:
+            reaches = reaches_newline(list(argument[2]), flags)
+        elif opcode is constants.SUBPATTERN:
+            _, add_flags, del_flags, body = argument
+            reaches = reaches_newline(list(body), (flags | add_flags) & ~del_flags)
+        elif opcode is constants.BRANCH:
+            reaches = any(
+                reaches_newline(list(branch), flags) for branch in argument[1]
+            )
+        elif opcode in (constants.ASSERT, constants.ASSERT_NOT):
+            reaches = reaches_newline(list(argument[1]), flags)
+        elif opcode is constants.ATOMIC_GROUP:
+            reaches = reaches_newline(list(argument), flags)
+        elif opcode is constants.GROUPREF_EXISTS:
+            _, yes, no = argument
+            reaches = reaches_newline(list(yes), flags) or (
+                no is not None and reaches_newline(list(no), flags)
+            )
+        elif opcode is constants.GROUPREF:
+            # Repeats text its group matched, which is checked on its own
+            reaches = False
+        else:
+            reaches = True
+        if reaches:
+            return True
+    return False
+
+
+def set_contains_newline(items: list[tuple]) -> bool:
+    negate = False
+    contains = False
+    for opcode, argument in items:
+        if opcode is constants.NEGATE:
+            negate = True
+        elif opcode is constants.LITERAL:
+            contains = contains or argument == NEWLINE
+        elif opcode is constants.RANGE:
+            contains = contains or argument[0] <= NEWLINE <= argument[1]
+        elif opcode is constants.CATEGORY:
+            contains = contains or argument in NEWLINE_CATEGORIES
+        else:
+            return True
+    return contains != negate
+
+
+def block_spans(
+    rules: tuple[Rule, ...], regexes: tuple[re.Pattern | None, ...], lines: Sequence
+) -> list[list[int]]:
+    """Flat start, end, style index triples for each of lines, as in RuleSet.spans.
+
+    Rules with a block regex are searched in the joined lines, only within
+    the lines their required literals are found in if they have any; the
+    others are searched in each line on its own.
+    """
+    newline = b"\n" if isinstance(lines[0], bytes) else "\n"
+    block = newline.join(lines)
+    found: list[list[int]] = [[] for _ in lines]
+    if block.count(newline) >= len(lines):
+        # Lines holding newlines themselves cannot be told apart in the block
+        regexes = (None,) * len(rules)
+    starts = [0] * len(lines)
+    offset = 0
+    for number, line in enumerate(lines):
+        starts[number] = offset
+        offset += len(line) + 1
+    last = len(lines) - 1
+
+    for index, (rule, regex) in enumerate(zip(rules, regexes)):
+        if rule.multiline:
+            continue
+        if regex is None:
+            line_spans(rule, index, lines, found)
+            continue
+
+        if rule.required:
+            for number in literal_lines(block, rule.required, starts):
+                offset = starts[number]
+                end = offset + len(lines[number])
+                if rule.all_matches:
+                    for matching in regex.finditer(block, offset, end):
+                        start, stop = matching.span()
+                        if stop > start:
+                            found[number] += (start - offset, stop - offset, index)
+                            if rule.groups:
+                                group_spans(
+                                    found[number], matching, rule.groups, offset
+                                )
+                    continue
+
+                matching = regex.search(block, offset, end)
+                if matching:
+                    start, stop = matching.span()
+                    found[number] += (start - offset, stop - offset, index)
+                    if rule.groups:
+                        group_spans(found[number], matching, rule.groups, offset)
+            continue
+
+        if rule.all_matches:
+            for matching in regex.finditer(block):
+                start, stop = matching.span()
+                if stop > start:
+                    number = bisect_right(starts, start) - 1
+                    offset = starts[number]
+                    found[number] += (start - offset, stop - offset, index)
+                    if rule.groups:
+                        group_spans(found[number], matching, rule.groups, offset)
+            continue
+
+        # Only the first match of a line counts, so resume at the next line
+        search = regex.search
+        matching = search(block)
+        while matching:
+            start = matching.start()
+            number = bisect_right(starts, start) - 1
+            offset = starts[number]
+            found[number] += (start - offset, matching.end() - offset, index)
+            if rule.groups:
+                group_spans(found[number], matching, rule.groups, offset)
+            if number == last:
+                break
+            matching = search(block, starts[number + 1])
+    return found
+
+
+def literal_lines(
+    block: str | bytes, literals: tuple, starts: list[int]
+) -> Iterator[int]:
+    """Numbers of the lines of block containing any of literals, in order."""
+    find = block.find
+    following = {literal: find(literal) for literal in literals}
+    following = {
+        literal: offset for literal, offset in following.items() if offset != -1
+    }
+    last = len(starts) - 1
+    while following:
+        number = bisect_right(starts, min(following.values())) - 1
+        yield number
+        if number == last:
+            return
+
+        position = starts[number + 1]
+        for literal, offset in list(following.items()):
+            if offset < position:
+                offset = find(literal, position)
+                if offset == -1:
+                    del following[literal]
+                else:
+                    following[literal] = offset
+
+
+def line_spans(rule: Rule, index: int, lines: Sequence, found: list[list[int]]):
+    regex = rule.regex
+    required = rule.required
+    for number, line in enumerate(lines):
+        if required:
+            for literal in required:
+                if line.find(literal) != -1:
+                    break
+            else:
+                continue
+
+        if rule.all_matches:
+            for matching in all_matches(regex, line):
+                found[number] += (*matching.span(), index)
+                if rule.groups:
+                    group_spans(found[number], matching, rule.groups)
+            continue
+
+        matching = regex.search(line)
+        if matching:
+            found[number] += (matching.start(), matching.end(), index)
+            if rule.groups:
+                group_spans(found[number], matching, rule.groups)
@@ -0,0 +1,169 @@
+import os
+import signal
+import sys
+from collections.abc import Sequence
+
+from .engine import Rule, RuleSet, all_matches, group_spans
+
+# Windows has neither SIGALRM nor interval timers
+INTERVAL_TIMERS = hasattr(signal, "setitimer")
+
+
+class MatchTimeout(Exception):
+    """A pattern ran past its time budget on a line."""
+
+
+class MatchBudget:
+    """Time each pattern may take on a line, enforced with SIGALRM.
+
+    The regex engine checks for signals while it backtracks, so the alarm
+    handler interrupts even a catastrophic search. A pattern still running
+    after a whole budget of its own is skipped for that line. The timer is
+    armed once for the patterns of a line, so a pattern that began after it
+    was armed is tried again under a fresh budget rather than blamed for the
+    time of the patterns before it. With disable_after set, a pattern that
+    overruns on that many lines is not tried again. Both are reported on
+    stderr unless warn is off. Alarms only reach the main thread, so lines
+    have to be matched there, and need INTERVAL_TIMERS.
+    """
+
+    __slots__ = (
+        "seconds",
+        "disable_after",
+        "warn",
+        "overruns",
+        "disabled",
+        "armed",
+        "process",
+    )
+
+    def __init__(self, milliseconds: int, disable_after: int = 0, warn: bool = True):
+        if milliseconds <= 0:
+            raise ValueError(f"Invalid match timeout: {milliseconds}")
+
+        self.seconds = milliseconds / 1000
+        self.disable_after = disable_after
+        self.warn = warn
+        # By pattern key, so they carry over reloads
+        self.overruns: dict[str, int] = {}
+        self.disabled: set[str] = set()
+        self.armed = False
+        # Worker processes install their own handler
+        self.process = None
+
+    def arm(self):
+        if self.process != os.getpid():
+            signal.signal(signal.SIGALRM, self.expire)
+            self.process = os.getpid()
+        self.armed = True
+        signal.setitimer(signal.ITIMER_REAL, self.seconds)
+
+    def disarm(self):
+        # Cleared first, so an alarm arriving now is ignored
+        self.armed = False
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+    def expire(self, signum, frame):
+        if self.armed:
+            self.armed = False
+            raise MatchTimeout
+
+    def overrun(self, rule: Rule) -> bool:
+        """Count an overrun of rule, True once it should be disabled."""
+        count = self.overruns.get(rule.key, 0) + 1
+        self.overruns[rule.key] = count
+        if count == 1 and self.warn:
+            print(
+                f"Skipping pattern {rule.key} on a line that took over"
+                f" {self.seconds * 1000:g} ms to match",
+                file=sys.stderr,
+            )
+        if not self.disable_after or count < self.disable_after:
+            return False
+
+        self.disabled.add(rule.key)
+        if self.warn:
+            print(
+                f"Disabled pattern {rule.key} after {count} slow lines", file=sys.stderr
+            )
+        return True
+
+
+class BudgetedRuleSet(RuleSet):
+    """Rules matched one at a time within a per-line time budget, if any."""
+
+    __slots__ = ("budget", "active")
+
+    def __init__(self, rules: RuleSet, budget: MatchBudget | None):
+        super().__init__(rules.rules)
+        self.budget = budget
+        disabled = budget.disabled if budget else set()
+        # Indexes of the rules still tried, so disabling keeps rule indexes
+        self.active = tuple(
+            index for index, rule in self.line_rules if rule.key not in disabled
+        )
+
+    def arm(self):
+        if self.budget:
+            self.budget.arm()
+
+    def disarm(self):
+        if self.budget:
+            self.budget.disarm()
+
+    def skip(self, index: int):
+        if self.budget.overrun(self.rules[index]):
+            self.active = tuple(active for active in self.active if active != index)
+
+    def spans(self, line: str | bytes) -> list[int]:
+        rules = self.rules
+        active = self.active
+        found: list[int] = []
+        find = line.find
+        position = 0
+        index = -1
+        size = 0
+        while position < len(active):
+            # The timer is armed as the pattern at first begins
+            first = position
+            try:
+                self.arm()
+                while position < len(active):
+                    index = active[position]
+                    rule = rules[index]
+                    position += 1
+                    size = len(found)
+                    if rule.required:
+                        for literal in rule.required:
+                            if find(literal) != -1:
+                                break
+                        else:
+                            continue
+
+                    if rule.all_matches:
+                        for matching in all_matches(rule.regex, line):
+                            found += (*matching.span(), index)
+                            if rule.groups:
+                                group_spans(found, matching, rule.groups)
+                        continue
+
+                    matching = rule.regex.search(line)
+                    if matching:
+                        found += (matching.start(), matching.end(), index)
+                        if rule.groups:
+                            group_spans(found, matching, rule.groups)
+            except MatchTimeout:
+                if position - first > 1:
+                    # Armed before this pattern began, so it starts over
+                    del found[size:]
+                    position -= 1
+                elif position > first:
+                    self.skip(index)
+            finally:
+                self.disarm()
+        return found
+
+    def block_spans(self, lines: Sequence) -> list[list[int]]:
+        # The timer is armed per line, so lines are matched one at a time
+        spans = self.spans
+        return [spans(line) for line in lines]
@@ -0,0 +1,119 @@
+import _sre
+import hashlib
+import os
+import pickle
+import re
+import stat
+import sys
+import time
+
+# Compiled regex programs are pickled as is, so loading skips re.compile;
+# the cache key pins the interpreter whose compiler produced them
+from re import _compiler as compiler, _parser as parser
+
+from .engine import RuleSet
+from .version import __version__
+
+# Bump whenever the pickled rule set changes shape, e.g. a new Rule slot
+CACHE_FORMAT = 7
+
+# Entries unused for this long are removed whenever a new one is written
+CACHE_MAX_AGE = 30 * 24 * 60 * 60
+
+# Entries are unpickled on load, so no one but the user may write them
+SHARED_WRITE = stat.S_IWGRP | stat.S_IWOTH
+
+
+def cache_directory() -> str:
+    base = os.environ.get("XDG_CACHE_HOME", "")
+    # Relative paths are invalid per the XDG spec and are ignored
+    if not os.path.isabs(base):
+        base = os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "easel")
+
+
+def is_private(status: os.stat_result) -> bool:
+    """Whether a cache file or directory is the user's own and only theirs to write."""
+    # Windows reports neither owners nor meaningful permission bits
+    if not hasattr(os, "getuid"):
+        return True
+    return status.st_uid == os.getuid() and not status.st_mode & SHARED_WRITE
+
+
+def cache_key(data: bytes, *options) -> str:
+    """Key for a config's contents, the options it is compiled with and the build."""
+    digest = hashlib.sha256(data)
+    build = (__version__, CACHE_FORMAT, sys.hexversion, _sre.MAGIC)
+    digest.update(repr((build, options)).encode())
+    return digest.hexdigest()
+
+
+def restore_regex(
+    pattern: str | bytes, flags: int, code: list[int], groups: int, groupindex: dict
+) -> re.Pattern:
+    indexgroup: list[str | None] = [None] * (groups + 1)
+    for name, index in groupindex.items():
+        indexgroup[index] = name
+    return _sre.compile(pattern, flags, code, groups, groupindex, tuple(indexgroup))
+
+
+class RulePickler(pickle.Pickler):
+    def reducer_override(self, obj):
+        if isinstance(obj, re.Pattern):
+            # Parsing with the final flags reproduces the original program,
+            # whose opcodes are int subclasses that cannot be pickled
+            parsed = parser.parse(obj.pattern, obj.flags)
+            code = list(map(int, compiler._code(parsed, obj.flags)))
+            arguments = (obj.pattern, obj.flags, code, obj.groups, dict(obj.groupindex))
+            return restore_regex, arguments
+        return NotImplemented
+
+
+def read_cache(key: str) -> RuleSet | None:
+    directory = cache_directory()
+    path = os.path.join(directory, f"{key}.pickle")
+    try:
+        with open(path, "rb") as file:
+            # Anyone else able to plant an entry could run code through pickle
+            if not (
+                is_private(os.stat(directory)) and is_private(os.fstat(file.fileno()))
+            ):
+                return None
+            rules = pickle.load(file)
+        os.utime(path)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # Unreadable, or pickled by an incompatible build; rebuilt by the caller
+        return None
+    return rules if isinstance(rules, RuleSet) else None
+
+
+def write_cache(key: str, rules: RuleSet):
+    # Only the user may write here, since entries are unpickled on load
+    directory = cache_directory()
+    path = os.path.join(directory, f"{key}.pickle")
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        if not is_private(os.stat(directory)):
+            # read_cache would skip the entry anyway
+            return
+        descriptor = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with open(descriptor, "wb") as file:
+            RulePickler(file, pickle.HIGHEST_PROTOCOL).dump(rules)
+        os.replace(temporary, path)
+        prune_cache(directory)
+    except OSError:
+        # A read-only or full cache only costs the speedup
+        try:
+            os.unlink(temporary)
+        except OSError:
+            pass
+
+
+def prune_cache(directory: str):
+    cutoff = time.time() - CACHE_MAX_AGE
+    for entry in os.scandir(directory):
+        if entry.name.endswith(".pickle") and entry.stat().st_mtime < cutoff:
+            os.unlink(entry.path)
@@ -0,0 +1,466 @@
+import os
+import stat
+import sys
+from collections.abc import Callable, Iterator
+from functools import partial
+from itertools import islice
+from typing import TYPE_CHECKING
+
+from .engine import RuleSet
+from .loader import load_rules
+from .output import Writer, should_color
+from .processor import process_block, process_line
+from .source import (
+    decode,
+    iter_file_lines,
+    iter_idle_lines,
+    iter_lines,
+    line_ranges,
+    map_file,
+    read_mapped_lines,
+)
+
+if TYPE_CHECKING:
+    from .budget import MatchBudget
+    from .line_cache import LineCache
+    from .merge import Source
+    from .stats import Profile
+
+# Options of the colorize command as (names, key, kind, default), where kind
+# is flag, value, count (a non-negative int) or append. The fast path parses
+# these without typer, and command.py takes its defaults from them
+COMMAND_OPTIONS = (
+    (("-c", "--config"), "config", "value", None),
+    (("--all-matches",), "all_matches", "flag", False),
+    (("--binary",), "binary", "flag", False),
+    (("--flush",), "flush", "value", "auto"),
+    (("--color",), "color", "value", "auto"),
+    (("-j", "--jobs"), "jobs", "count", 1),
+    (("-f", "--follow"), "follow", "flag", False),
+    (("-n", "--lines"), "lines", "count", 10),
+    (("-e", "--exec"), "commands", "append", None),
+    (("--merge",), "merge", "flag", False),
+    (("--rebuild-cache",), "rebuild_cache", "flag", False),
+    (("--reload",), "reload", "flag", False),
+    (("--line-cache",), "line_cache", "count", 0),
+    (("--line-cache-prefix",), "line_cache_prefix", "count", 0),
+    (("--stats",), "stats", "flag", False),
+    (("--match-timeout",), "match_timeout", "count", 0),
+    (("--disable-after",), "disable_after", "count", 0),
+    (("--warn-patterns",), "warn_patterns", "flag", False),
+    (("--multiline-window",), "multiline_window", "count", 100),
+)
+
+OPTIONS = {
+    name: (key, kind) for names, key, kind, _ in COMMAND_OPTIONS for name in names
+}
+
+DEFAULTS = {
+    key: default for _, key, _, default in COMMAND_OPTIONS if default is not None
+}
+
+# Bytes of a regular file matched as one block, few enough for the block to
+# stay in the CPU cache while every pattern scans it
+BLOCK_BYTES = 64 * 1024
+
+
+def parse_args(args: list[str]) -> dict | None:
+    """Parse a plain command line, None when typer has to handle it.
+
+    Help, version, unknown options and invalid values all go to typer, so
+    its messages and exit codes stay the only ones users see.
+    """
+    options = DEFAULTS | {"files": [], "commands": []}
+    position = 0
+    while position < len(args):
+        arg = args[position]
+        position += 1
+
+        if arg == "--":
+            options["files"] += args[position:]
+            break
+        if arg == "-" or not arg.startswith("-"):
+            options["files"].append(arg)
+            continue
+
+        if arg.startswith("--"):
+            name, separator, value = arg.partition("=")
+        else:
+            # Short options may carry their value, as in -j4
+            name, separator, value = arg[:2], arg[2:], arg[2:]
+        if name not in OPTIONS:
+            return None
+
+        key, kind = OPTIONS[name]
+        if kind == "flag":
+            if separator:
+                return None
+            options[key] = True
+            continue
+
+        if not separator:
+            if position == len(args):
+                return None
+            value = args[position]
+            position += 1
+
+        if kind == "count":
+            try:
+                value = int(value)
+            except ValueError:
+                return None
+            if value < 0:
+                return None
+        if kind == "append":
+            options[key].append(value)
+        else:
+            options[key] = value
+
+    if "config" not in options:
+        return None
+    return options
+
+
+def read_source(
+    path: str, binary: bool, follow: int | None = None, idle: bool = False
+) -> Iterator:
+    if follow is not None:
+        from .follow import follow_file
+
+        return follow_file(path, binary, follow, idle=idle)
+    if path == "-":
+        if idle:
+            return iter_idle_lines(sys.stdin.buffer, binary)
+        # Decoded as files are, rather than by the text stream
+        lines = iter_lines(sys.stdin.buffer, b"\n")
+        return lines if binary else map(decode, lines)
+    return iter_file_lines(path, binary, idle)
+
+
+def colorize_source(
+    path: str,
+    rules: RuleSet,
+    colorize: bool,
+    jobs: int,
+    binary: bool,
+    follow: int | None = None,
+    cache: "LineCache | None" = None,
+    window: int = 100,
+) -> Iterator:
+    if not colorize:
+        yield from read_source(path, binary, follow)
+        return
+
+    # Matches spanning lines need the lines in order, in one process
+    if rules.multiline:
+        from .multiline import process_multiline
+
+        lines = read_source(path, binary, follow, idle=True)
+        yield from process_multiline(rules, lines, window)
+        return
+
+    if follow is None and jobs > 1:
+        from .parallel import process_file_parallel, process_parallel
+
+        # Regular files are handed to workers as byte ranges of the mapping
+        if path != "-":
+            with map_file(path) as mapped:
+                if mapped is not None:
+                    yield from process_file_parallel(rules, path, mapped, jobs, binary)
+                    return
+        yield from process_parallel(rules, read_source(path, binary), jobs)
+        return
+
+    if cache is not None:
+        process = cache.process
+        for line in read_source(path, binary, follow):
+            yield process(line)
+        return
+
+    # Regular files are complete, so they are matched a block of lines at a time
+    if follow is None and path != "-":
+        with map_file(path) as mapped:
+            if mapped is not None:
+                for start, end in line_ranges(mapped, BLOCK_BYTES):
+                    lines = read_mapped_lines(mapped, binary, start, end)
+                    yield from process_block(rules, lines)
+                return
+
+    for line in read_source(path, binary, follow):
+        yield process_line(rules, line)
+
+
+async def colorize_merged(
+    sources: list["Source"],
+    rules: RuleSet,
+    colorize: bool,
+    binary: bool,
+    writer: Writer,
+    cache: "LineCache | None" = None,
+):
+    from .merge import merge_sources
+
+    process = cache.process if cache is not None else partial(process_line, rules)
+
+    # Tag lines with their source once there is more than one to tell apart
+    width = max(len(source.name) for source in sources)
+    tags = [
+        f"{source.name:<{width}} | " if len(sources) > 1 else "" for source in sources
+    ]
+    if binary:
+        tags = [tag.encode() for tag in tags]
+
+    async for index, line in merge_sources(sources):
+        if not binary:
+            line = decode(line)
+        writer.write(tags[index] + (process(line) if colorize else line))
+
+
+def budget_rules(load: "Callable[[], RuleSet]", budget: "MatchBudget") -> RuleSet:
+    from .budget import BudgetedRuleSet
+
+    return BudgetedRuleSet(load(), budget)
+
+
+def profile_rules(
+    load: "Callable[[], RuleSet]", profile: "Profile", budget: "MatchBudget | None"
+) -> RuleSet:
+    from .stats import ProfiledRuleSet
+
+    return ProfiledRuleSet(load(), profile, budget)
+
+
+def print_stats(profile: "Profile", cache: "LineCache | None"):
+    print(profile.summary(), file=sys.stderr)
+    if cache is not None:
+        print(cache.summary(), file=sys.stderr)
+
+
+def watch_stats(profile: "Profile", cache: "LineCache | None"):
+    """Print statistics on SIGUSR1, returning the handler it replaces."""
+    import signal
+
+    if not hasattr(signal, "SIGUSR1"):
+        return None
+    return signal.signal(signal.SIGUSR1, lambda *_: print_stats(profile, cache))
+
+
+def run(
+    config: str,
+    files: list[str] | None = None,
+    all_matches: bool = False,
+    binary: bool = False,
+    flush: str = "auto",
+    color: str = "auto",
+    jobs: int = 1,
+    follow: bool = False,
+    lines: int = 10,
+    commands: list[str] | None = None,
+    merge: bool = False,
+    rebuild_cache: bool = False,
+    reload: bool = False,
+    line_cache: int = 0,
+    line_cache_prefix: int = 0,
+    stats: bool = False,
+    match_timeout: int = 0,
+    disable_after: int = 0,
+    warn_patterns: bool = False,
+    multiline_window: int = 100,
+) -> int:
+    """Colorize files, commands or stdin and return the exit status."""
+    stdout = sys.stdout.buffer if binary else sys.stdout
+    if not binary and hasattr(stdout, "reconfigure"):
+        # Bad input bytes were decoded to surrogates, see decode
+        stdout.reconfigure(errors="surrogateescape")
+    commands = commands or []
+    paths = files or ([] if commands else ["-"])
+    merge = merge or bool(commands) or (follow and len(paths) > 1)
+
+    # Followed and merged lines should show up as soon as they are written
+    if (follow or merge) and flush == "auto":
+        flush = "line"
+
+    try:
+        if follow and "-" in paths:
+            raise ValueError("--follow needs files, not stdin")
+        if multiline_window < 1:
+            raise ValueError(f"Invalid multiline window: {multiline_window}")
+        if match_timeout:
+            from .budget import INTERVAL_TIMERS
+
+            if not INTERVAL_TIMERS:
+                raise ValueError(
+                    "--match-timeout needs interval timers, which this platform lacks"
+                )
+        rules = load_rules(config, binary, all_matches, rebuild_cache)
+        if warn_patterns:
+            from .analysis import analyze_rules
+
+            for finding in analyze_rules(rules):
+                print(f"Warning: {finding}", file=sys.stderr)
+        load = partial(load_rules, config, binary, all_matches)
+        budget = None
+        if match_timeout:
+            from .budget import BudgetedRuleSet, MatchBudget
+
+            budget = MatchBudget(match_timeout, disable_after)
+            if not stats:
+                rules = BudgetedRuleSet(rules, budget)
+                load = partial(budget_rules, load, budget)
+        profile = None
+        if stats:
+            from .stats import Profile, ProfiledRuleSet
+
+            # Statistics are kept by pattern, so they carry over reloads
+            profile = Profile()
+            rules = ProfiledRuleSet(rules, profile, budget)
+            load = partial(profile_rules, load, profile, budget)
+            # Workers would keep their statistics to themselves
+            jobs = 1
+        if reload:
+            from .reload import ReloadingRuleSet
+
+            if jobs != 1:
+                # Workers keep the rules they started with, see __reduce__
+                print(
+                    "Warning: --reload runs with --jobs 1, as workers would miss reloads",
+                    file=sys.stderr,
+                )
+                jobs = 1
+            rules = ReloadingRuleSet(config, rules, load)
+        cache = None
+        if line_cache:
+            from .line_cache import LineCache
+
+            cache = LineCache(rules, line_cache, line_cache_prefix)
+        colorize = should_color(color, sys.stdout)
+        writer = Writer(stdout, flush, binary)
+        for path in paths:
+            # Opening a FIFO here would consume its writer, so only stat it
+            if path != "-" and stat.S_ISREG(os.stat(path).st_mode):
+                open(path, "rb").close()
+        sources = None
+        if merge:
+            from .merge import CommandSource, create_source
+
+            sources = [create_source(path, lines if follow else None) for path in paths]
+            sources += [CommandSource(command) for command in commands]
+    except (OSError, ValueError) as error:
+        print(error, file=sys.stderr)
+        return 1
+
+    if profile is not None:
+        previous_handler = watch_stats(profile, cache)
+
+    try:
+        if sources is not None:
+            import asyncio
+
+            with writer:
+                try:
+                    asyncio.run(
+                        colorize_merged(sources, rules, colorize, binary, writer, cache)
+                    )
+                except KeyboardInterrupt:
+                    pass
+                except OSError as error:
+                    print(error, file=sys.stderr)
+                    return 1
+            return 0
+
+        if jobs == 0:
+            jobs = os.cpu_count() or 1
+
+        # Process input lines
+        with writer:
+            for path in paths:
+                for processed in colorize_source(
+                    path,
+                    rules,
+                    colorize,
+                    jobs,
+                    binary,
+                    lines if follow else None,
+                    cache,
+                    multiline_window,
+                ):
+                    writer.write(processed)
+        return 0
+    finally:
+        if profile is not None:
+            if previous_handler is not None:
+                import signal
+
+                signal.signal(signal.SIGUSR1, previous_handler)
+            print_stats(profile, cache)
+
+
+# Lines of a sample file that easel check times patterns on
+SAMPLE_LIMIT = 1000
+
+
+def run_check(configs: list[str], sample: str | None = None) -> int:
+    """Report performance hazards in the patterns of configs, 1 if any were found."""
+    from .analysis import SAMPLE_LINES, analyze_rules, cost_table, estimate_costs
+    from .budget import INTERVAL_TIMERS
+
+    try:
+        if sample is None:
+            lines = SAMPLE_LINES
+        else:
+            lines = list(islice(iter_file_lines(sample, False), SAMPLE_LIMIT))
+        rule_sets = [load_rules(config) for config in configs]
+    except (OSError, ValueError) as error:
+        print(error, file=sys.stderr)
+        return 1
+
+    if not INTERVAL_TIMERS:
+        print(
+            "Note: no interval timers on this platform,"
+            " so runaway patterns are neither stopped nor reported\n"
+        )
+    status = 0
+    for config, rules in zip(configs, rule_sets):
+        profile, runaway = estimate_costs(rules, lines)
+        findings = analyze_rules(rules) + runaway
+        print(
+            f"{config}: {len(findings)} {'finding' if len(findings) == 1 else 'findings'}"
+        )
+        for finding in findings:
+            print(finding)
+        if profile.patterns and lines:
+            print(f"\ncost on {len(lines):,} sample lines")
+            print(cost_table(profile, len(lines)))
+        print()
+        if findings:
+            status = 1
+    return status
+
+
+def main(args: list[str] | None = None):
+    """Entry point that only imports typer when a command line needs it."""
+    args = sys.argv[1:] if args is None else args
+    if args[:1] == ["check"]:
+        from .command import check_app
+
+        check_app(args[1:], prog_name=f"{os.path.basename(sys.argv[0])} check")
+        return
+
+    options = parse_args(args)
+    if options is None:
+        from .command import app
+
+        app(args)
+        return
+
+    try:
+        status = run(**options)
+    except KeyboardInterrupt:
+        # As click reports an interrupted command
+        print("\nAborted!", file=sys.stderr)
+        status = 1
+    except BrokenPipeError:
+        # The reader went away, e.g. head; keep the final flush from failing too
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        status = 1
+    sys.exit(status)
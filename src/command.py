@@ -1,9 +1,7 @@
-import sys
 from typing import Annotated
 import typer
 
-from src.loader import load_config
-from src.processor import process_line
+from src.cli import DEFAULTS, run, run_check
 from src.version import __version__
 
 app = typer.Typer()
@@ -17,12 +15,158 @@ def get_version(version: bool | None):
 
 @app.callback(invoke_without_command=True)
 def main(
+    ctx: typer.Context,
     config: Annotated[
         str,
         typer.Option(
             "--config", "-c", help="path to toml config file", show_envvar=False
         ),
     ],
+    files: Annotated[
+        list[str] | None,
+        typer.Argument(
+            help="files to colorize, reads stdin when omitted or for -",
+            show_default=False,
+        ),
+    ] = None,
+    all_matches: Annotated[
+        bool,
+        typer.Option(
+            "--all-matches",
+            help="highlight every match of each pattern instead of only the first",
+        ),
+    ] = DEFAULTS["all_matches"],
+    binary: Annotated[
+        bool,
+        typer.Option(
+            "--binary",
+            help="match raw bytes without decoding them",
+        ),
+    ] = DEFAULTS["binary"],
+    flush: Annotated[
+        str,
+        typer.Option(
+            "--flush",
+            help="output flushing: line after every line, block in large writes, auto picks line on a terminal",
+        ),
+    ] = DEFAULTS["flush"],
+    color: Annotated[
+        str,
+        typer.Option(
+            "--color",
+            help="when to colorize: auto only on a terminal, always, or never",
+        ),
+    ] = DEFAULTS["color"],
+    jobs: Annotated[
+        int,
+        typer.Option(
+            "--jobs",
+            "-j",
+            min=0,
+            help="worker processes for large inputs, 0 for one per cpu",
+        ),
+    ] = DEFAULTS["jobs"],
+    follow: Annotated[
+        bool,
+        typer.Option(
+            "--follow",
+            "-f",
+            help="keep reading the file as it grows, across rotation and truncation",
+        ),
+    ] = DEFAULTS["follow"],
+    lines: Annotated[
+        int,
+        typer.Option(
+            "--lines",
+            "-n",
+            min=0,
+            help="with --follow, start with the last n lines of the file",
+        ),
+    ] = DEFAULTS["lines"],
+    commands: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--exec",
+            "-e",
+            help="also colorize the output of a shell command, may be repeated",
+            show_default=False,
+        ),
+    ] = None,
+    merge: Annotated[
+        bool,
+        typer.Option(
+            "--merge",
+            help="read all files and commands concurrently, tagging each line with its source",
+        ),
+    ] = DEFAULTS["merge"],
+    rebuild_cache: Annotated[
+        bool,
+        typer.Option(
+            "--rebuild-cache",
+            help="compile the config again instead of loading the cached rules",
+        ),
+    ] = DEFAULTS["rebuild_cache"],
+    reload: Annotated[
+        bool,
+        typer.Option(
+            "--reload",
+            help="apply changes to the config file without restarting",
+        ),
+    ] = DEFAULTS["reload"],
+    line_cache: Annotated[
+        int,
+        typer.Option(
+            "--line-cache",
+            min=0,
+            help="remember the output for this many distinct lines, for repetitive streams",
+        ),
+    ] = DEFAULTS["line_cache"],
+    line_cache_prefix: Annotated[
+        int,
+        typer.Option(
+            "--line-cache-prefix",
+            min=0,
+            help="with --line-cache, style the first n characters apart and cache the rest, e.g. past a timestamp",
+        ),
+    ] = DEFAULTS["line_cache_prefix"],
+    stats: Annotated[
+        bool,
+        typer.Option(
+            "--stats",
+            help="time each pattern and print statistics to stderr on exit and on SIGUSR1; implies --jobs 1",
+        ),
+    ] = DEFAULTS["stats"],
+    match_timeout: Annotated[
+        int,
+        typer.Option(
+            "--match-timeout",
+            min=0,
+            help="milliseconds each pattern may take on a line; a pattern still matching is skipped for that line (default 0, off)",
+        ),
+    ] = DEFAULTS["match_timeout"],
+    disable_after: Annotated[
+        int,
+        typer.Option(
+            "--disable-after",
+            min=0,
+            help="with --match-timeout, stop trying a pattern once it ran out of time on this many lines",
+        ),
+    ] = DEFAULTS["disable_after"],
+    warn_patterns: Annotated[
+        bool,
+        typer.Option(
+            "--warn-patterns",
+            help="warn on stderr about patterns that are likely slow, as easel check does",
+        ),
+    ] = DEFAULTS["warn_patterns"],
+    multiline_window: Annotated[
+        int,
+        typer.Option(
+            "--multiline-window",
+            min=1,
+            help="lines held back at most while a multiline pattern may still match them, also the most lines a match spans",
+        ),
+    ] = DEFAULTS["multiline_window"],
     _version: Annotated[
         bool | None,
         typer.Option(
@@ -30,16 +174,32 @@ def main(
         ),
     ] = None,
 ):
-    try:
-        config_data = load_config(config)
-    except ValueError as error:
-        typer.echo(error, err=True)
-        raise typer.Exit(1)
-
-    # Process input lines
-    while True:
-        line = sys.stdin.readline()
-        if not line:
-            break
-        processed = process_line(config_data, line.rstrip("\n"))
-        typer.echo(processed)
+    # Options are named as run() takes them
+    status = run(
+        **{key: value for key, value in ctx.params.items() if key != "_version"}
+    )
+    if status:
+        raise typer.Exit(status)
+
+
+check_app = typer.Typer()
+
+
+@check_app.command()
+def check(
+    configs: Annotated[
+        list[str],
+        typer.Argument(help="toml config files to check", show_default=False),
+    ],
+    sample: Annotated[
+        str | None,
+        typer.Option(
+            "--sample",
+            help="log file whose first 1000 lines the patterns are timed on, built-in lines by default",
+        ),
+    ] = None,
+):
+    """Report patterns that are likely slow, with rewrites to try."""
+    status = run_check(configs, sample)
+    if status:
+        raise typer.Exit(status)
@@ -0,0 +1,339 @@
+import re
+from collections.abc import Iterator, Mapping, Sequence
+from typing import TYPE_CHECKING
+
+# Parsed like required_literals does, see literals.py
+from re import _constants as constants, _parser as parser
+
+from .literals import required_literals
+from .sgr import parse_style, transition
+
+if TYPE_CHECKING:
+    from .loader import Pattern
+
+
+class Style:
+    """Escape sequences applied to the text a rule or one of its groups matched."""
+
+    __slots__ = (
+        "key",
+        "foreground_color",
+        "background_color",
+        "attributes",
+        "style",
+        "state",
+    )
+
+    def __init__(
+        self,
+        key: str,
+        foreground_color: str | bytes,
+        background_color: str | bytes,
+        attributes: str | bytes,
+    ):
+        self.key = key
+        self.foreground_color = foreground_color
+        self.background_color = background_color
+        self.attributes = attributes
+        self.style = foreground_color + background_color + attributes
+        # Parsed once so the renderer can emit only what changes between styles
+        style = self.style
+        self.state = parse_style(
+            style.decode("latin-1") if isinstance(style, bytes) else style
+        )
+
+
+class Rule(Style):
+    __slots__ = (
+        "regex",
+        "required",
+        "all_matches",
+        "multiline",
+        "groups",
+        "group_styles",
+    )
+
+    def __init__(
+        self,
+        key: str,
+        regex: re.Pattern,
+        foreground_color: str | bytes,
+        background_color: str | bytes,
+        attributes: str | bytes,
+        all_matches: bool = False,
+        multiline: bool = False,
+        groups: tuple[tuple[int, int, Style], ...] = (),
+    ):
+        super().__init__(key, foreground_color, background_color, attributes)
+        self.regex = regex
+        # At least one of these appears in any line the regex can match
+        self.required = required_literals(regex)
+        self.all_matches = all_matches
+        self.multiline = multiline
+        # Styled groups as group number, style index pairs, outer groups first
+        self.groups = tuple((group, index) for group, index, _ in groups)
+        self.group_styles = tuple(style for _, _, style in groups)
+
+
+class RuleSet:
+    __slots__ = (
+        "rules",
+        "styles",
+        "line_rules",
+        "multiline",
+        "transitions",
+        "blocks",
+        "partials",
+    )
+
+    def __init__(self, rules: tuple[Rule, ...]):
+        self.rules = rules
+        # Indexed by the styles of spans: the rules, then the styled groups
+        # of every rule in rule order, as compile_rules numbers them
+        self.styles: tuple[Style, ...] = rules + tuple(
+            style for rule in rules for style in rule.group_styles
+        )
+        # Multiline rules are matched over several lines, see multiline.py
+        self.line_rules = tuple(
+            (index, rule) for index, rule in enumerate(rules) if not rule.multiline
+        )
+        self.multiline = tuple(
+            index for index, rule in enumerate(rules) if rule.multiline
+        )
+        # Escape sequences between pairs of rule indexes, filled in as pairs are met
+        self.transitions: dict[tuple[int, int], str | bytes] = {}
+        # Regexes for matching blocks of lines, compiled on first use
+        self.blocks: tuple[re.Pattern | None, ...] | None = None
+        # Regexes for the starts of multiline matches, compiled on first use
+        self.partials: tuple[re.Pattern, ...] | None = None
+
+    def __len__(self):
+        return len(self.rules)
+
+    @property
+    def current(self) -> "RuleSet":
+        """The rules in effect, for matching and styling a line consistently."""
+        return self
+
+    def transition(self, current: int, target: int) -> str | bytes:
+        """Escape sequence switching from one style to another.
+
+        Styles are given by index, -1 standing for unstyled text. Styles that
+        are not plain SGR sequences are written out in full instead.
+        """
+        styles = self.styles
+        source = styles[current] if current >= 0 else None
+        destination = styles[target] if target >= 0 else None
+        rule = destination or source
+        if rule is None:
+            return ""
+
+        if destination is not None and (
+            destination.state is None or (source is not None and source.state is None)
+        ):
+            sequence = destination.style
+        else:
+            sequence = transition(
+                source and source.state, destination and destination.state
+            )
+            if isinstance(rule.style, bytes):
+                sequence = sequence.encode()
+
+        self.transitions[current, target] = sequence
+        return sequence
+
+    def matches(self, line: str | bytes) -> list[tuple[Rule, int, int]]:
+        """Matches of every rule as (rule, start, end), in rule order."""
+        # One search per rule: CPython's re finds a literal-led pattern with a
+        # fast prefix search, which one alternation of every rule gives up,
+        # see benchmarks/engines.py
+        rules = self.rules
+        spans = self.spans(line)
+        return [
+            (rules[index], start, end)
+            for start, end, index in zip(spans[::3], spans[1::3], spans[2::3])
+            if index < len(rules)
+        ]
+
+    def spans(self, line: str | bytes) -> list[int]:
+        """Matches of every rule as flat start, end, style index triples.
+
+        Rules are matched once unless all_matches is set, then every
+        non-empty match is reported from left to right. Each match is
+        followed by its styled groups, whose styles are indexed after the
+        rules. Multiline rules are left out.
+        """
+        found: list[int] = []
+        # find() rather than "in", which is several times slower on bytes
+        find = line.find
+        for index, rule in self.line_rules:
+            # Substring checks are far cheaper than a failed regex search
+            if rule.required:
+                for literal in rule.required:
+                    if find(literal) != -1:
+                        break
+                else:
+                    continue
+
+            if rule.all_matches:
+                for matching in all_matches(rule.regex, line):
+                    found += (*matching.span(), index)
+                    if rule.groups:
+                        group_spans(found, matching, rule.groups)
+                continue
+
+            matching = rule.regex.search(line)
+            if matching:
+                found += (matching.start(), matching.end(), index)
+                if rule.groups:
+                    group_spans(found, matching, rule.groups)
+        return found
+
+    def block_spans(self, lines: Sequence) -> list[list[int]]:
+        """Spans of each of lines, as spans returns them, matched as one block.
+
+        Patterns that can match a newline or anchor to the string with \\A or
+        \\Z are still searched line by line, so the spans are the same.
+        """
+        from .block import block_regex, block_spans
+
+        if self.blocks is None:
+            self.blocks = tuple(block_regex(rule.regex) for rule in self.rules)
+        return block_spans(self.rules, self.blocks, lines)
+
+
+def all_matches(regex: re.Pattern, line: str | bytes) -> list[re.Match]:
+    # Empty matches would only repeat escape codes between characters
+    return [
+        matching
+        for matching in regex.finditer(line)
+        if matching.end() > matching.start()
+    ]
+
+
+def group_spans(
+    found: list[int],
+    matching: re.Match,
+    groups: tuple[tuple[int, int], ...],
+    offset: int = 0,
+):
+    """Add the spans of the styled groups of matching to found.
+
+    Groups that did not take part in the match or matched nothing are left
+    out; offset is subtracted from the positions, as for a match in a block.
+    """
+    regs = matching.regs
+    for group, index in groups:
+        start, end = regs[group]
+        if end > start:
+            found += (start - offset, end - offset, index)
+
+
+def group_number(regex: re.Pattern, key: str, name: str) -> int:
+    """Number of a group of regex given by name or number."""
+    if name.isdigit() and 0 < int(name) <= regex.groups:
+        return int(name)
+    if name in regex.groupindex:
+        return regex.groupindex[name]
+    raise ValueError(f"Invalid group: {name} in pattern {key}")
+
+
+def group_parents(regex: re.Pattern) -> dict[int, int]:
+    """Groups of regex mapped to the group directly around them, 0 for none."""
+    parents: dict[int, int] = {}
+
+    def walk(items: parser.SubPattern, parent: int):
+        for opcode, argument in items:
+            if opcode is constants.SUBPATTERN:
+                group, _, _, body = argument
+                if group:
+                    parents[group] = parent
+                walk(body, group or parent)
+                continue
+            for body in subpatterns(argument):
+                walk(body, parent)
+
+    walk(parser.parse(regex.pattern, regex.flags), 0)
+    return parents
+
+
+def subpatterns(argument) -> Iterator[parser.SubPattern]:
+    if isinstance(argument, parser.SubPattern):
+        yield argument
+    elif isinstance(argument, (tuple, list)):
+        for value in argument:
+            yield from subpatterns(value)
+
+
+def encode(value: str) -> bytes:
+    return value.encode()
+
+
+def keep(value: str) -> str:
+    return value
+
+
+def compile_rules(
+    patterns: Mapping[str, "Pattern"],
+    binary: bool = False,
+    all_matches: bool = False,
+) -> RuleSet:
+    """Compile patterns with resolved escape codes into a rule set.
+
+    With binary set, regexes and escape codes are bytes so lines can be
+    matched without decoding them. With all_matches set, every pattern
+    highlights all of its matches rather than only the first. Multiline
+    patterns are compiled with MULTILINE, so ^ and $ match at every line.
+    Groups are styled in the order they open in, so nested groups are drawn
+    on top of the groups around them.
+    """
+    convert = encode if binary else keep
+    rules: list[Rule] = []
+    # Group styles are indexed after every rule
+    index = len(patterns)
+    for key, value in patterns.items():
+        try:
+            regex = re.compile(
+                convert(value.pattern), re.MULTILINE if value.multiline else 0
+            )
+        except re.error as error:
+            raise ValueError(f"Invalid pattern: {key} ({error})")
+
+        numbered = sorted(
+            (group_number(regex, key, name), name, group)
+            for name, group in value.groups.items()
+        )
+        parents = group_parents(regex) if numbered else {}
+        # Fields of each styled group, with those it left out filled in
+        fields: dict[int, tuple[str, str, str]] = {
+            0: (value.foreground_color, value.background_color, value.attributes)
+        }
+        groups: list[tuple[int, int, Style]] = []
+        for number, name, group in numbered:
+            # Left out fields come from the nearest styled group around it
+            parent = parents[number]
+            while parent not in fields:
+                parent = parents[parent]
+            foreground_color, background_color, attributes = fields[parent]
+            fields[number] = (
+                group.foreground_color or foreground_color or "",
+                group.background_color or background_color or "",
+                group.attributes or attributes or "",
+            )
+            style = Style(f"{key}.{name}", *map(convert, fields[number]))
+            groups.append((number, index, style))
+            index += 1
+
+        rules.append(
+            Rule(
+                key=key,
+                regex=regex,
+                foreground_color=convert(value.foreground_color or ""),
+                background_color=convert(value.background_color or ""),
+                attributes=convert(value.attributes or ""),
+                all_matches=all_matches or value.all_matches,
+                multiline=value.multiline,
+                groups=tuple(groups),
+            )
+        )
+    return RuleSet(tuple(rules))
@@ -0,0 +1,187 @@
+import ctypes
+import os
+import select
+import struct
+import sys
+import time
+from collections.abc import Iterator
+from typing import IO
+
+from .source import READ_SIZE, decode
+
+POLL_INTERVAL = 0.05
+
+# Safety net for missed events, e.g. on network filesystems
+WAIT_TIMEOUT = 1.0
+
+IN_MODIFY = 0x002
+IN_ATTRIB = 0x004
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class PollWaiter:
+    def __init__(self, interval: float = POLL_INTERVAL):
+        self.interval = interval
+
+    def wait(self):
+        time.sleep(self.interval)
+
+    def close(self):
+        pass
+
+
+class InotifyWaiter:
+    """Sleeps until the followed file changes, is replaced or is removed.
+
+    The parent directory is watched rather than the file, so renames and
+    re-creation during log rotation are seen as well.
+    """
+
+    def __init__(self, path: str, timeout: float = WAIT_TIMEOUT):
+        libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        directory, name = os.path.split(os.path.abspath(path))
+        mask = IN_MODIFY | IN_ATTRIB | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE
+        if (
+            libc.inotify_add_watch(self.fd, os.fsencode(directory), mask | IN_DELETE)
+            < 0
+        ):
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), "inotify_add_watch failed")
+
+        self.name = os.fsencode(name)
+        self.timeout = timeout
+
+    def wait(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            readable, _, _ = select.select([self.fd], [], [], remaining)
+            if not readable:
+                return
+            if self.name in self.read_names():
+                return
+
+    def read_names(self) -> set[bytes]:
+        names = set[bytes]()
+        try:
+            events = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return names
+
+        offset = 0
+        while offset < len(events):
+            _, _, _, length = EVENT_HEADER.unpack_from(events, offset)
+            offset += EVENT_HEADER.size
+            names.add(events[offset : offset + length].rstrip(b"\0"))
+            offset += length
+        return names
+
+    def close(self):
+        os.close(self.fd)
+
+
+def create_waiter(path: str) -> InotifyWaiter | PollWaiter:
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWaiter(path)
+        except (OSError, AttributeError):
+            pass
+    return PollWaiter()
+
+
+def tail_offset(file: IO[bytes], count: int) -> int:
+    """Offset where the last count lines of the file start."""
+    size = file.seek(0, os.SEEK_END)
+    if count <= 0:
+        return size
+
+    position = size
+    data = b""
+    while position > 0:
+        step = min(READ_SIZE, position)
+        position -= step
+        file.seek(position)
+        data = file.read(step) + data
+
+        # A trailing newline ends the last line rather than starting a new one
+        end = len(data) - 1 if data.endswith(b"\n") else len(data)
+        index = end
+        for _ in range(count):
+            index = data.rfind(b"\n", 0, index)
+            if index == -1:
+                break
+        else:
+            return position + index + 1
+    return 0
+
+
+def follow_file(
+    path: str,
+    binary: bool,
+    count: int = 10,
+    waiter: InotifyWaiter | PollWaiter | None = None,
+    idle: bool = False,
+) -> Iterator:
+    """Yield the last count lines of a file, then every line appended to it.
+
+    Like tail -F, a file that is replaced (rotated) is reopened from the
+    start and a file that shrinks (truncated) is read again from the start.
+    With idle set, None is yielded whenever the file was read to its end,
+    before waiting for it to change. Runs until the consumer stops
+    iterating.
+    """
+    waiter = waiter or create_waiter(path)
+    file = open(path, "rb")
+    inode = os.fstat(file.fileno()).st_ino
+    file.seek(tail_offset(file, count))
+    pending = b""
+
+    try:
+        while True:
+            chunk = file.read(READ_SIZE)
+            if chunk:
+                lines = (pending + chunk).split(b"\n")
+                pending = lines.pop()
+                for line in lines:
+                    yield line if binary else decode(line)
+                continue
+
+            try:
+                status = os.stat(path)
+            except FileNotFoundError:
+                status = None
+
+            if status is not None and status.st_ino != inode:
+                # Rotated: the old file is fully read, switch to the new one
+                if pending:
+                    yield pending if binary else decode(pending)
+                    pending = b""
+                file.close()
+                file = open(path, "rb")
+                inode = os.fstat(file.fileno()).st_ino
+                continue
+
+            if status is not None and status.st_size < file.tell():
+                # Truncated in place
+                if pending:
+                    yield pending if binary else decode(pending)
+                    pending = b""
+                file.seek(0)
+                continue
+
+            if idle:
+                yield None
+            waiter.wait()
+    finally:
+        file.close()
+        waiter.close()
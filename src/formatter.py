@@ -0,0 +1,80 @@
+import copy
+import logging
+import os
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+from typing import TYPE_CHECKING
+
+from .highlighter import Highlighter
+
+if TYPE_CHECKING:
+    from .engine import RuleSet
+    from .models import Config
+
+
+class ColorFormatter(logging.Formatter):
+    """Formats records as logging.Formatter does, then colorizes them.
+
+    The config is loaded once, from anything a Highlighter is built from.
+    Records spanning several lines, such as those with a traceback, are
+    colorized line by line.
+    """
+
+    def __init__(
+        self,
+        config: "str | os.PathLike | dict | Config | RuleSet",
+        fmt: str | None = None,
+        datefmt: str | None = None,
+        style: str = "%",
+        validate: bool = True,
+        *,
+        defaults: dict | None = None,
+        all_matches: bool = False,
+    ):
+        super().__init__(fmt, datefmt, style, validate, defaults=defaults)
+        self.highlighter = Highlighter(config, all_matches=all_matches)
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        if "\n" in text:
+            return self.highlighter.highlight_block(text)
+        return self.highlighter.highlight(text)
+
+
+class QueueColorHandler(QueueHandler):
+    """Colorizes and writes records on a background thread.
+
+    The logging thread only merges the message with its arguments and
+    queues the record. A listener thread formats it with a ColorFormatter
+    and hands it to handler, stderr by default. close() writes out the
+    records still queued.
+    """
+
+    def __init__(
+        self,
+        config: "str | os.PathLike | dict | Config | RuleSet",
+        fmt: str | None = None,
+        datefmt: str | None = None,
+        handler: logging.Handler | None = None,
+    ):
+        super().__init__(SimpleQueue())
+        self.target = handler or logging.StreamHandler()
+        self.target.setFormatter(ColorFormatter(config, fmt, datefmt))
+        self.listener = QueueListener(
+            self.queue, self.target, respect_handler_level=True
+        )
+        self.listener.start()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Arguments may change once logging returns, so the message is merged
+        # now; formatting and colorizing are left to the listener
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def close(self):
+        # Stopping again, e.g. from logging.shutdown, does nothing
+        self.listener.stop()
+        self.target.close()
+        super().close()
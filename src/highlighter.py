@@ -0,0 +1,93 @@
+import os
+from collections import deque
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING
+
+from .engine import RuleSet, compile_rules
+from .loader import build_rules, load_rules
+from .processor import process_block, process_line
+
+if TYPE_CHECKING:
+    from .models import Config
+
+
+class Highlighter:
+    """Colorizes lines in-process with rules compiled once.
+
+    Built from the path of a config file, a config as parsed from TOML, a
+    Config or a compiled RuleSet. With binary set, lines are bytes rather
+    than str. Lines are not checked, so a highlighter for str given bytes
+    fails inside the regex engine.
+    """
+
+    __slots__ = ("rules",)
+
+    def __init__(
+        self,
+        config: "str | os.PathLike | dict | Config | RuleSet",
+        binary: bool = False,
+        all_matches: bool = False,
+    ):
+        if isinstance(config, RuleSet):
+            rules = config
+        elif isinstance(config, dict):
+            rules = build_rules(config, binary, all_matches)
+        elif isinstance(config, (str, os.PathLike)):
+            rules = load_rules(os.fspath(config), binary, all_matches)
+        elif not all_matches:
+            # Shares the rules the Config compiled for itself
+            rules = config.binary_rules if binary else config.rules
+        else:
+            rules = compile_rules(config.patterns, binary, all_matches)
+        self.rules = rules
+
+    def highlight[T: (str, bytes)](self, line: T) -> T:
+        """A line without its newline, with escape codes added."""
+        return process_line(self.rules, line)
+
+    def highlight_iter(self, lines: Iterable) -> Iterator:
+        """Highlight lines as they are iterated, keeping their newlines.
+
+        Lines of a file object end in a newline, which is kept out of the
+        match so $ and trailing whitespace behave as on the command line.
+        With multiline rules, lines a match could still reach are held back
+        as on the command line, see MultilineWindow.
+        """
+        rules = self.rules
+        if rules.multiline:
+            yield from self.highlight_multiline(lines)
+            return
+
+        for line in lines:
+            if line[-1:] in ("\n", b"\n"):
+                yield process_line(rules, line[:-1]) + line[-1:]
+            else:
+                yield process_line(rules, line)
+
+    def highlight_multiline(self, lines: Iterable) -> Iterator:
+        from .multiline import process_multiline
+
+        newlines: deque = deque()
+
+        def stripped() -> Iterator:
+            for line in lines:
+                newline = line[-1:] if line[-1:] in ("\n", b"\n") else line[:0]
+                newlines.append(newline)
+                yield line[: len(line) - len(newline)]
+
+        for processed in process_multiline(self.rules, stripped()):
+            yield processed + newlines.popleft()
+
+    def highlight_block[T: (str, bytes)](self, text: T) -> T:
+        """Highlight text of many lines at once, faster than line by line."""
+        newline = b"\n" if isinstance(text, bytes) else "\n"
+        lines = text.split(newline)
+        # A final newline ends the last line rather than starting another
+        ended = not lines[-1]
+        if ended:
+            lines.pop()
+        if not lines:
+            return text
+
+        result = newline.join(process_block(self.rules, lines))
+        return result + newline if ended else result
@@ -0,0 +1,118 @@
+from collections import OrderedDict
+
+from .engine import RuleSet
+from .processor import process_line, render
+
+
+class LineCache:
+    """Bounded LRU cache of processed lines, for streams that repeat lines.
+
+    With prefix set, every pattern is still matched against the whole line,
+    so only the styling is saved: the first prefix characters (or bytes) of
+    a line and the rest are styled and cached as separate entries, keyed by
+    their text and the matches in them. Lines that differ only in a leading
+    timestamp then share the entry for the rest, and the output is the same
+    as process_line gives. Lines with a match across the split, or with
+    matches meeting at it, are styled whole and not cached.
+    """
+
+    __slots__ = ("rules", "active", "size", "prefix", "entries", "hits", "misses")
+
+    def __init__(self, rules: RuleSet, size: int, prefix: int = 0):
+        if size < 1:
+            raise ValueError(f"Invalid line cache size: {size}")
+
+        self.rules = rules
+        self.active = None
+        self.size = size
+        self.prefix = prefix
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def process[T: (str, bytes)](self, line: T) -> T:
+        rules = self.rules
+        # Reloaded rules style lines differently, so start over
+        active = rules.current
+        if active is not self.active:
+            self.entries.clear()
+            self.active = active
+
+        prefix = self.prefix
+        # Multiline rules match across lines, which the split can't account for
+        if not prefix or len(line) <= prefix or active.multiline:
+            return self.lookup(line)
+
+        spans = active.spans(line)
+        if not spans:
+            return line
+        head = []
+        tail = []
+        closed = opened = False
+        triples = iter(spans)
+        for start, end, index in zip(triples, triples, triples):
+            if end <= prefix:
+                head += start, end, index
+                closed |= end == prefix
+            elif start >= prefix:
+                tail += start, end, index
+                opened |= start == prefix
+            else:
+                return render(active, line, spans)
+        if closed and opened:
+            # One transition joins the matches, the pieces would reset between
+            return render(active, line, spans)
+        # Timestamps repeat within a second or so, so the prefix is cached too
+        return self.piece(line[:prefix], head, 0) + self.piece(
+            line[prefix:], tail, prefix
+        )
+
+    def lookup[T: (str, bytes)](self, text: T) -> T:
+        entries = self.entries
+        styled = entries.get(text)
+        if styled is None:
+            self.misses += 1
+            styled = process_line(self.rules, text)
+            entries[text] = styled
+            if len(entries) > self.size:
+                entries.popitem(last=False)
+        else:
+            self.hits += 1
+            entries.move_to_end(text)
+        return styled
+
+    def piece[T: (str, bytes)](self, text: T, spans: list[int], offset: int) -> T:
+        """Part of a line starting at offset, styled for spans of the whole line."""
+        if not spans:
+            return text
+        entries = self.entries
+        key = (text, *spans)
+        styled = entries.get(key)
+        if styled is None:
+            self.misses += 1
+            if offset:
+                triples = iter(spans)
+                spans = [
+                    value
+                    for start, end, index in zip(triples, triples, triples)
+                    for value in (start - offset, end - offset, index)
+                ]
+            styled = render(self.active, text, spans)
+            entries[key] = styled
+            if len(entries) > self.size:
+                entries.popitem(last=False)
+        else:
+            self.hits += 1
+            entries.move_to_end(key)
+        return styled
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"line cache: {self.hits:,} hits, {self.misses:,} misses"
+            f" ({self.hit_rate:.1%} hit rate), {len(self.entries):,}/{self.size:,} entries"
+        )
@@ -0,0 +1,94 @@
+import re
+
+# The parser behind re.compile is the only way to see the structure of a
+# pattern without reimplementing regex syntax; requires-python pins its shape
+from re import _constants as constants, _parser as parser
+
+REPEATS = (constants.MAX_REPEAT, constants.MIN_REPEAT, constants.POSSESSIVE_REPEAT)
+
+
+def required_literals(regex: re.Pattern) -> tuple:
+    """Literals of which at least one appears in every match of the regex.
+
+    Returns an empty tuple when nothing useful can be extracted, in which
+    case the regex always has to be searched. Bytes regexes yield bytes.
+    """
+    if regex.flags & re.IGNORECASE:
+        return ()
+
+    try:
+        parsed = parser.parse(regex.pattern, regex.flags)
+    except re.error:
+        return ()
+
+    literals = sequence_literals(list(parsed))
+    if not literals:
+        return ()
+    if isinstance(regex.pattern, bytes):
+        # Byte values were parsed as code points below 256
+        return tuple(sorted(literal.encode("latin-1") for literal in literals))
+    return tuple(sorted(literals))
+
+
+def sequence_literals(items: list[tuple]) -> frozenset[str] | None:
+    candidates: list[frozenset[str]] = []
+    run: list[str] = []
+
+    def flush():
+        if run:
+            candidates.append(frozenset(["".join(run)]))
+            run.clear()
+
+    for opcode, argument in items:
+        if opcode is constants.LITERAL:
+            run.append(chr(argument))
+            continue
+
+        # Zero-width anchors do not break a run of adjacent literals
+        if opcode is constants.AT:
+            continue
+
+        flush()
+        candidate = item_literals(opcode, argument)
+        if candidate:
+            candidates.append(candidate)
+    flush()
+
+    if not candidates:
+        return None
+
+    # Prefer long literals, then the requirement with the fewest alternatives
+    return max(
+        candidates,
+        key=lambda candidate: (min(map(len, candidate)), -len(candidate)),
+    )
+
+
+def item_literals(opcode, argument) -> frozenset[str] | None:
+    if opcode is constants.SUBPATTERN:
+        _, add_flags, _, items = argument
+        if add_flags & re.IGNORECASE:
+            return None
+        return sequence_literals(list(items))
+
+    if opcode is constants.BRANCH:
+        branches: set[str] = set()
+        for items in argument[1]:
+            literals = sequence_literals(list(items))
+            if not literals:
+                return None
+            branches |= literals
+        return frozenset(branches)
+
+    if opcode in REPEATS:
+        minimum, _, items = argument
+        if minimum < 1:
+            return None
+        return sequence_literals(list(items))
+
+    if opcode is constants.IN:
+        if all(code is constants.LITERAL for code, _ in argument):
+            return frozenset(chr(value) for _, value in argument)
+        return None
+
+    return None
@@ -1,16 +1,21 @@
-import tomllib
-from pydantic import BaseModel, ValidationError
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
 
+from .cache import cache_key, read_cache, write_cache
+from .engine import RuleSet, compile_rules
 
-class Pattern(BaseModel):
-    pattern: str
-    attributes: str | None = None
-    foreground_color: str | None = None
-    background_color: str | None = None
+if TYPE_CHECKING:
+    from .models import Config
 
 
-class Config(BaseModel):
-    patterns: dict[str, Pattern]
+def __getattr__(name: str):
+    # The pydantic models are imported on first use, keeping pydantic off the
+    # startup path of the command line
+    if name in ("Config", "Group", "Pattern"):
+        from . import models
+
+        return getattr(models, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 preset = {
@@ -90,21 +95,157 @@ def get_attributes(attributes: str | None):
     return "".join(result)
 
 
-def load_config(config_path: str) -> Config:
-    with open(config_path, "rb") as f:
-        raw_config = tomllib.load(f)
+# Pattern fields and the types pydantic would accept without coercing them
+PATTERN_FIELDS = {
+    "pattern": str,
+    "attributes": str,
+    "foreground_color": str,
+    "background_color": str,
+    "all_matches": bool,
+    "multiline": bool,
+}
+
+# Fields of a styled group, which are all optional strings
+GROUP_FIELDS = ("attributes", "foreground_color", "background_color")
+
+
+def plain_patterns(raw_config: dict) -> dict[str, SimpleNamespace] | None:
+    """Patterns of a raw config that validates as is, None if it needs pydantic."""
+    patterns = raw_config.get("patterns")
+    if not isinstance(patterns, dict):
+        return None
+
+    result: dict[str, SimpleNamespace] = {}
+    for key, table in patterns.items():
+        if not isinstance(table, dict) or not isinstance(table.get("pattern"), str):
+            return None
+
+        values = dict.fromkeys(PATTERN_FIELDS, None) | {
+            "all_matches": False,
+            "multiline": False,
+        }
+        for field, value in table.items():
+            # Unknown fields are ignored, as the pydantic models do
+            if field in PATTERN_FIELDS:
+                if type(value) is not PATTERN_FIELDS[field]:
+                    return None
+                values[field] = value
+
+        groups = plain_groups(table.get("groups", {}))
+        if groups is None:
+            return None
+        result[key] = SimpleNamespace(**values, groups=groups)
+    return result
+
+
+def plain_groups(groups) -> dict[str, SimpleNamespace] | None:
+    if not isinstance(groups, dict):
+        return None
+
+    result: dict[str, SimpleNamespace] = {}
+    for name, table in groups.items():
+        if not isinstance(table, dict):
+            return None
+
+        values = dict.fromkeys(GROUP_FIELDS)
+        for field, value in table.items():
+            if field in GROUP_FIELDS:
+                if type(value) is not str:
+                    return None
+                values[field] = value
+        result[name] = SimpleNamespace(**values)
+    return result
+
+
+def resolve_styles(patterns: dict) -> None:
+    keys = set[str]()
+    for key, value in patterns.items():
+        if key in keys:
+            raise ValueError(f"Duplicate pattern key: {key}")
+
+        keys.add(key)
+        # Fields a group leaves out are inherited when the rules are compiled
+        for group in value.groups.values():
+            if group.foreground_color:
+                group.foreground_color = get_foreground_color(group.foreground_color)
+            if group.background_color:
+                group.background_color = get_background_color(group.background_color)
+            if group.attributes:
+                group.attributes = get_attributes(group.attributes)
+        value.foreground_color = get_foreground_color(value.foreground_color)
+        value.background_color = get_background_color(value.background_color)
+        value.attributes = get_attributes(value.attributes)
+
+
+def build_config(raw_config: dict, binary: bool, all_matches: bool) -> "Config":
+    from pydantic import ValidationError
+
+    from .models import Config
+
     try:
         config = Config(**raw_config)
+        resolve_styles(config.patterns)
 
-        keys = set[str]()
-        for key, value in config.patterns.items():
-            if key in keys:
-                raise ValueError(f"Duplicate pattern key: {key}")
-
-            keys.add(key)
-            value.foreground_color = get_foreground_color(value.foreground_color)
-            value.background_color = get_background_color(value.background_color)
-            value.attributes = get_attributes(value.attributes)
+        if binary:
+            config._binary_rules = compile_rules(config.patterns, binary, all_matches)
+        else:
+            config._rules = compile_rules(config.patterns, all_matches=all_matches)
     except ValidationError as e:
         raise ValueError(f"TOML validation error: {e}")
     return config
+
+
+def load_config(
+    config_path: str,
+    binary: bool = False,
+    all_matches: bool = False,
+) -> "Config":
+    import tomllib
+
+    with open(config_path, "rb") as f:
+        raw_config = tomllib.load(f)
+    return build_config(raw_config, binary, all_matches)
+
+
+def load_rules(
+    config_path: str,
+    binary: bool = False,
+    all_matches: bool = False,
+    rebuild: bool = False,
+) -> RuleSet:
+    """Load a config file straight into a rule set for text or binary lines.
+
+    Compiled rule sets are cached under the content hash of the file, so an
+    unchanged config skips parsing and validation; rebuild ignores the cache.
+    Configs that validate as they are skip pydantic entirely; anything else
+    goes through the Config model, which coerces values or reports errors.
+    """
+    with open(config_path, "rb") as f:
+        data = f.read()
+
+    key = cache_key(data, binary, all_matches)
+    rules = None if rebuild else read_cache(key)
+    if rules is not None:
+        return rules
+
+    # Only parsed when the cache cannot be used
+    import tomllib
+
+    rules = build_rules(tomllib.loads(data.decode()), binary, all_matches)
+    write_cache(key, rules)
+    return rules
+
+
+def build_rules(
+    raw_config: dict,
+    binary: bool = False,
+    all_matches: bool = False,
+) -> RuleSet:
+    """Compile a config as parsed from TOML into a rule set."""
+    patterns = plain_patterns(raw_config)
+    if patterns is None:
+        config = build_config(raw_config, binary, all_matches)
+        return config.binary_rules if binary else config.rules
+
+    resolve_styles(patterns)
+    return compile_rules(patterns, binary, all_matches)
@@ -0,0 +1,173 @@
+import asyncio
+import os
+import shlex
+import stat
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Iterator
+
+from .follow import follow_file
+from .source import iter_file_lines
+
+# Lines buffered per source before its reader has to wait for the display
+QUEUE_LINES = 256
+
+# Lines taken from one source before moving on to the next
+BATCH_LINES = 16
+
+LINE_LIMIT = 1024 * 1024
+
+
+class Source(ABC):
+    """A named stream of lines, read into a bounded queue."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    @abstractmethod
+    async def run(self, put):
+        """Await put with each line, without its newline."""
+
+
+class CommandSource(Source):
+    def __init__(self, command: str):
+        try:
+            words = shlex.split(command)
+        except ValueError as error:
+            raise ValueError(f"Invalid command: {command} ({error})")
+        super().__init__(words[0] if words else command)
+        self.command = command
+
+    async def run(self, put):
+        process = await asyncio.create_subprocess_shell(
+            self.command, stdout=asyncio.subprocess.PIPE, limit=LINE_LIMIT
+        )
+        assert process.stdout is not None
+        try:
+            while line := await process.stdout.readline():
+                await put(line.removesuffix(b"\n"))
+        finally:
+            if process.returncode is None:
+                process.terminate()
+            await process.wait()
+
+
+class PipeSource(Source):
+    """FIFOs and other pipes, read through the event loop."""
+
+    def __init__(self, path: str):
+        super().__init__(os.path.basename(path))
+        self.path = path
+
+    async def run(self, put):
+        loop = asyncio.get_running_loop()
+        # Opening a FIFO blocks until a writer shows up
+        file = await asyncio.to_thread(open, self.path, "rb", 0)
+        reader = asyncio.StreamReader(limit=LINE_LIMIT)
+        transport, _ = await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader), file
+        )
+        try:
+            while line := await reader.readline():
+                await put(line.removesuffix(b"\n"))
+        finally:
+            transport.close()
+
+
+class FileSource(Source):
+    """Regular files, read or followed on a thread since they cannot be polled."""
+
+    def __init__(self, path: str, follow: int | None = None):
+        super().__init__(os.path.basename(path))
+        self.path = path
+        self.follow = follow
+
+    def lines(self) -> Iterator[bytes]:
+        if self.follow is not None:
+            return follow_file(self.path, True, self.follow)
+        return iter_file_lines(self.path, True)
+
+    async def run(self, put):
+        loop = asyncio.get_running_loop()
+        done = loop.create_future()
+
+        def read():
+            try:
+                for line in self.lines():
+                    asyncio.run_coroutine_threadsafe(put(line), loop).result()
+                loop.call_soon_threadsafe(done.set_result, None)
+            except BaseException as error:
+                if not loop.is_closed():
+                    loop.call_soon_threadsafe(done.set_exception, error)
+
+        threading.Thread(target=read, daemon=True).start()
+        await done
+
+
+def create_source(path: str, follow: int | None = None) -> Source:
+    if path == "-":
+        regular = stat.S_ISREG(os.fstat(0).st_mode)
+        source = FileSource("/dev/stdin") if regular else PipeSource("/dev/stdin")
+        source.name = "stdin"
+        return source
+    if not stat.S_ISREG(os.stat(path).st_mode):
+        return PipeSource(path)
+    return FileSource(path, follow)
+
+
+async def merge_sources(sources: list[Source]) -> AsyncIterator[tuple[int, bytes]]:
+    """Interleave the lines of several sources as (source index, line).
+
+    Sources are visited round robin, taking at most BATCH_LINES from each,
+    and every source has its own bounded queue, so a noisy source neither
+    starves the others nor grows memory without bound.
+    """
+    queues = [asyncio.Queue[bytes | None](QUEUE_LINES) for _ in sources]
+    ready = asyncio.Event()
+
+    def putter(queue: asyncio.Queue):
+        async def put(line: bytes | None):
+            await queue.put(line)
+            ready.set()
+
+        return put
+
+    errors: list[Exception] = []
+
+    async def run(source: Source, put):
+        try:
+            await source.run(put)
+        except Exception as error:
+            errors.append(error)
+        finally:
+            await put(None)
+
+    tasks = [
+        asyncio.create_task(run(source, putter(queue)))
+        for source, queue in zip(sources, queues)
+    ]
+
+    try:
+        active = len(sources)
+        while active:
+            ready.clear()
+            for index, queue in enumerate(queues):
+                for _ in range(BATCH_LINES):
+                    try:
+                        line = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        break
+                    if line is None:
+                        active -= 1
+                        break
+                    yield index, line
+
+            # Surface reader errors such as a file that disappeared
+            if errors:
+                raise errors[0]
+
+            if active and all(queue.empty() for queue in queues):
+                await ready.wait()
+    finally:
+        for task in tasks:
+            task.cancel()
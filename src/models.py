@@ -0,0 +1,39 @@
+from pydantic import BaseModel, PrivateAttr
+
+from .engine import RuleSet, compile_rules
+
+
+class Group(BaseModel):
+    attributes: str | None = None
+    foreground_color: str | None = None
+    background_color: str | None = None
+
+
+class Pattern(BaseModel):
+    pattern: str
+    attributes: str | None = None
+    foreground_color: str | None = None
+    background_color: str | None = None
+    all_matches: bool = False
+    multiline: bool = False
+    groups: dict[str, Group] = {}
+
+
+class Config(BaseModel):
+    patterns: dict[str, Pattern]
+
+    _rules: RuleSet | None = PrivateAttr(default=None)
+    _binary_rules: RuleSet | None = PrivateAttr(default=None)
+
+    @property
+    def rules(self) -> RuleSet:
+        # Compiled lazily for configs built in code, eagerly by load_config
+        if self._rules is None:
+            self._rules = compile_rules(self.patterns)
+        return self._rules
+
+    @property
+    def binary_rules(self) -> RuleSet:
+        if self._binary_rules is None:
+            self._binary_rules = compile_rules(self.patterns, binary=True)
+        return self._binary_rules
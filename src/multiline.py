@@ -0,0 +1,234 @@
+import re
+from bisect import bisect_right
+from collections import deque
+from collections.abc import Iterable, Iterator, Sequence
+from operator import itemgetter
+
+# Parsed like required_literals does, see literals.py
+from re import _compiler as compiler, _constants as constants, _parser as parser
+
+from .block import reaches_newline
+from .engine import RuleSet, group_spans
+from .processor import render
+
+# Lines held back at most, which is also the most lines a match can span
+MULTILINE_WINDOW = 100
+
+
+def multiline_spans(rules: RuleSet, lines: Sequence) -> tuple[list[list[int]], int]:
+    """Spans the multiline rules leave on each of lines, matched as one text.
+
+    Every match is styled, each line getting the part of it that falls on
+    the line, followed by the parts of its styled groups. Also returns the
+    number of the first line a match reaching the end of the text starts
+    in, as more lines could extend that match, or len(lines) if no match
+    does.
+    """
+    newline = b"\n" if isinstance(lines[0], bytes) else "\n"
+    text = newline.join(lines)
+    starts = [0] * len(lines)
+    offset = 0
+    for number, line in enumerate(lines):
+        starts[number] = offset
+        offset += len(line) + 1
+
+    found: list[list[int]] = [[] for _ in lines]
+    held = len(lines)
+    for index in rules.multiline:
+        rule = rules.rules[index]
+        for matching in rule.regex.finditer(text):
+            start, end = matching.span()
+            if end == start:
+                continue
+
+            first = bisect_right(starts, start) - 1
+            if end == len(text):
+                held = min(held, first)
+            spans = [(start, end, index)]
+            if rule.groups:
+                found_groups: list[int] = []
+                group_spans(found_groups, matching, rule.groups)
+                values = iter(found_groups)
+                # Groups in lookarounds are kept within the match
+                for group_start, group_end, style in zip(values, values, values):
+                    spans.append((max(group_start, start), min(group_end, end), style))
+
+            for number in range(first, bisect_right(starts, end - 1)):
+                offset = starts[number]
+                length = len(lines[number])
+                for span_start, span_end, style in spans:
+                    # Newlines between lines are part of no line
+                    span_start = max(span_start - offset, 0)
+                    span_end = min(span_end - offset, length)
+                    if span_end > span_start:
+                        found[number] += (span_start, span_end, style)
+    return found, held
+
+
+def partial_regexes(regex: re.Pattern) -> tuple[re.Pattern, ...]:
+    """Regexes finding the start of a match of regex that more lines could complete.
+
+    The pattern is cut before each of its top-level parts that can match a
+    newline, and the part before the cut is anchored to the end of the
+    text. Parts inside groups and repeats are not cut into.
+    """
+    try:
+        parsed = parser.parse(regex.pattern, regex.flags)
+    except re.error:
+        return ()
+    items = list(parsed)
+    partials = []
+    for number, (opcode, argument) in enumerate(items):
+        # Matches that begin with a newline style nothing before it
+        if (
+            not number
+            or opcode is constants.AT
+            or not reaches_newline([(opcode, argument)], regex.flags)
+        ):
+            continue
+        head = parser.SubPattern(
+            parsed.state, [*items[:number], (constants.AT, constants.AT_END_STRING)]
+        )
+        try:
+            partials.append(compiler.compile(head, regex.flags))
+        except re.error:
+            continue
+    return tuple(partials)
+
+
+def partial_start(rules: RuleSet, lines: Sequence) -> int:
+    """Number of the first line a partial match of a multiline rule starts in.
+
+    A partial match is the start of a match that runs up to the end of the
+    text, so the next lines could complete it, see partial_regexes. Returns
+    len(lines) if there is none.
+    """
+    if rules.partials is None:
+        rules.partials = tuple(
+            partial
+            for index in rules.multiline
+            for partial in partial_regexes(rules.rules[index].regex)
+        )
+    newline = b"\n" if isinstance(lines[0], bytes) else "\n"
+    text = newline.join(lines)
+    held = len(lines)
+    for partial in rules.partials:
+        matching = partial.search(text)
+        if matching and matching.end() > matching.start():
+            held = min(held, text.count(newline, 0, matching.start()))
+    return held
+
+
+def merge_spans(spans: list[int], multiline: list[int], count: int) -> list[int]:
+    """Spans of line and multiline rules together, in rule order.
+
+    Spans starting at the same position are drawn in the order given, so
+    they are ordered as if every rule had been matched in turn. Styles from
+    count on are groups, which stay behind the match they belong to.
+    """
+    if not spans:
+        return multiline
+    matches: list[list[int]] = []
+    for found in (spans, multiline):
+        for offset in range(0, len(found), 3):
+            triple = found[offset : offset + 3]
+            if triple[2] < count:
+                matches.append(triple)
+            else:
+                matches[-1] += triple
+    matches.sort(key=itemgetter(2))
+    return [value for match in matches for value in match]
+
+
+class MultilineWindow:
+    """Styles a stream of lines with rules whose matches span several lines.
+
+    A line is held back while a match of a multiline rule reaches the
+    newest line, as the next line could extend that match, and written as
+    soon as a line arrives that the match does not reach. Lines are held
+    the same way while they could begin a match, that is while the start
+    of a pattern up to one of its newlines matches up to the newest line,
+    until the match is completed or a line arrives that fails it. At most
+    window lines are held, the oldest being written once there are more,
+    so memory and the delay of a line stay bounded even when a match never
+    ends. The lines of a match still going on are kept after they are
+    written, so the lines that follow are styled as part of it. A match
+    longer than the window is matched as its first line followed by the
+    most recent lines, which continues repeated lines such as the frames
+    of a stack trace.
+    """
+
+    __slots__ = ("rules", "window", "lines", "written", "pinned")
+
+    def __init__(self, rules: RuleSet, window: int = MULTILINE_WINDOW):
+        if window < 1:
+            raise ValueError(f"Invalid multiline window: {window}")
+
+        self.rules = rules
+        self.window = window
+        self.lines: deque = deque()
+        # Leading lines of the window that were written already
+        self.written = 0
+        # First line of a match going on that no longer fits in the window
+        self.pinned: str | bytes | None = None
+
+    def feed(self, line: str | bytes) -> list:
+        """Add a line and return the lines that can be written now."""
+        self.lines.append(line)
+        return self.settle(final=False)
+
+    def flush(self) -> list:
+        """Return every line held back, e.g. at the end of the input."""
+        if len(self.lines) == self.written:
+            return []
+        return self.settle(final=True)
+
+    def settle(self, final: bool) -> list:
+        # Reloaded rules swap in between lines, never within one
+        rules = self.rules.current
+        lines = list(self.lines)
+        text = lines if self.pinned is None else [self.pinned, *lines]
+        found, held = multiline_spans(rules, text)
+        held = min(held, partial_start(rules, text))
+        if self.pinned is not None:
+            # Numbered by the window again, the pinned line being -1
+            found.pop(0)
+            held -= 1
+
+        # Lines before first no match in progress needs anymore
+        first = max(held, len(lines) - self.window, 0)
+        if held >= first:
+            self.pinned = None
+        elif held >= 0:
+            self.pinned = lines[held]
+
+        end = len(lines) if final else first
+        ready = []
+        for number in range(self.written, end):
+            line = lines[number]
+            spans = rules.spans(line)
+            if found[number]:
+                spans = merge_spans(spans, found[number], len(rules))
+            ready.append(render(rules, line, spans) if spans else line)
+
+        self.written = max(self.written, end) - first
+        for _ in range(first):
+            self.lines.popleft()
+        return ready
+
+
+def process_multiline(
+    rules: RuleSet, lines: Iterable, window: int = MULTILINE_WINDOW
+) -> Iterator:
+    """Process a stream of lines with multiline rules, see MultilineWindow.
+
+    A None in lines stands for the input being idle, which writes out the
+    lines held back rather than waiting for the next line.
+    """
+    matcher = MultilineWindow(rules, window)
+    for line in lines:
+        if line is None:
+            yield from matcher.flush()
+        else:
+            yield from matcher.feed(line)
+    yield from matcher.flush()
@@ -0,0 +1,73 @@
+from typing import IO
+
+FLUSH_POLICIES = ("line", "block", "auto")
+COLOR_POLICIES = ("auto", "always", "never")
+
+BLOCK_SIZE = 64 * 1024
+
+
+def is_terminal(stream: IO) -> bool:
+    try:
+        return stream.isatty()
+    except ValueError:
+        return False
+
+
+def should_color(color: str, stream: IO) -> bool:
+    if color not in COLOR_POLICIES:
+        raise ValueError(f"Invalid color policy: {color}")
+
+    # Matches typer.echo, which stripped escape codes when not on a terminal
+    if color == "auto":
+        return is_terminal(stream)
+    return color == "always"
+
+
+class Writer:
+    """Groups processed lines into large writes.
+
+    The line policy flushes after every line for interactive tails, block
+    writes once block_size characters (or bytes) are pending, and auto picks
+    line on a terminal and block otherwise.
+    """
+
+    __slots__ = ("stream", "pending", "size", "block_size", "newline")
+
+    def __init__(
+        self,
+        stream: IO,
+        flush: str = "auto",
+        binary: bool = False,
+        block_size: int = BLOCK_SIZE,
+    ):
+        if flush not in FLUSH_POLICIES:
+            raise ValueError(f"Invalid flush policy: {flush}")
+        if flush == "auto":
+            flush = "line" if is_terminal(stream) else "block"
+
+        self.stream = stream
+        self.pending: list = []
+        self.size = 0
+        # A block size of zero writes every line straight through
+        self.block_size = block_size if flush == "block" else 0
+        self.newline = b"\n" if binary else "\n"
+
+    def write(self, line: str | bytes):
+        self.pending.append(line)
+        self.pending.append(self.newline)
+        self.size += len(line) + 1
+        if self.size > self.block_size:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            self.stream.write(self.newline[:0].join(self.pending))
+            self.pending.clear()
+            self.size = 0
+        self.stream.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.flush()
@@ -0,0 +1,75 @@
+import mmap
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import batched
+
+from .engine import RuleSet
+from .processor import process_block
+from .source import line_ranges, read_mapped_lines
+
+CHUNK_LINES = 2048
+
+# Set once per worker by the pool initializer, so chunks carry only lines
+worker_rules: RuleSet | None = None
+worker_files: dict[str, mmap.mmap] = {}
+
+
+def initialize_worker(rules: RuleSet):
+    global worker_rules
+    worker_rules = rules
+
+
+def process_chunk(lines: tuple) -> list:
+    return process_block(worker_rules, lines)
+
+
+def process_range(path: str, start: int, end: int, binary: bool) -> list:
+    # Workers map the file themselves, so only offsets cross the pipe
+    mapped = worker_files.get(path)
+    if mapped is None:
+        with open(path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        worker_files[path] = mapped
+
+    return process_block(worker_rules, read_mapped_lines(mapped, binary, start, end))
+
+
+def run_ordered(rules: RuleSet, tasks: Iterable[tuple], jobs: int) -> Iterator:
+    """Run tasks on a pool of worker processes, yielding results in order.
+
+    At most two tasks per worker are in flight, so memory stays bounded by
+    the task size regardless of the input size.
+    """
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=initialize_worker, initargs=(rules,)
+    ) as executor:
+        pending: deque[Future] = deque()
+        for function, *arguments in tasks:
+            pending.append(executor.submit(function, *arguments))
+            if len(pending) >= jobs * 2:
+                yield from pending.popleft().result()
+
+        while pending:
+            yield from pending.popleft().result()
+
+
+def process_parallel(
+    rules: RuleSet,
+    lines: Iterable,
+    jobs: int,
+    chunk_lines: int = CHUNK_LINES,
+) -> Iterator:
+    """Process lines in chunks of chunk_lines, preserving their order."""
+    tasks = ((process_chunk, chunk) for chunk in batched(lines, chunk_lines))
+    yield from run_ordered(rules, tasks, jobs)
+
+
+def process_file_parallel(
+    rules: RuleSet, path: str, mapped: mmap.mmap, jobs: int, binary: bool
+) -> Iterator:
+    """Process a memory-mapped file in line-aligned byte ranges."""
+    tasks = (
+        (process_range, path, start, end, binary) for start, end in line_ranges(mapped)
+    )
+    yield from run_ordered(rules, tasks, jobs)
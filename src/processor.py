@@ -1,87 +1,86 @@
-from dataclasses import dataclass
-import re
-from typing import Literal
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
 
-from .loader import Config
+from .engine import Rule, RuleSet
+from .spans import resolve_spans
 
+if TYPE_CHECKING:
+    from .loader import Config
 
-@dataclass
-class Style:
-    index: int
-    type: Literal["start"] | Literal["end"]
-    id: str
-    attributes: str | None
-    foreground_color: str | None
-    background_color: str | None
 
+RESET = "\x1b[0m"
 
-def get_terminal_style(style: Style | None):
-    if not style:
-        return "\x1b[0m"
 
-    return f"{style.foreground_color}{style.background_color}{style.attributes}"
+def get_terminal_style(rule: Rule | None):
+    if not rule:
+        return RESET
 
+    return rule.style
 
-def process_line(config: Config, line: str) -> str:
-    styles: list[Style] = []
-    for key, values in config.patterns.items():
-        matching = re.search(values.pattern, line)
-        if not matching:
-            continue
 
-        styles.append(
-            Style(
-                index=matching.start(),
-                type="start",
-                id=key,
-                foreground_color=values.foreground_color,
-                background_color=values.background_color,
-                attributes=values.attributes,
-            )
-        )
-        styles.append(
-            Style(
-                index=matching.end(),
-                type="end",
-                id=key,
-                foreground_color=values.foreground_color,
-                background_color=values.background_color,
-                attributes=values.attributes,
-            )
-        )
-
-    styles.sort(key=lambda x: x.index)
-    queued = set[str]()
-
-    result: list[str] = []
-    applied: list[Style] = []
-    previous = 0
+def process_line[T: (str, bytes)](config: "Config | RuleSet", line: T) -> T:
+    binary = isinstance(line, bytes)
+    if isinstance(config, RuleSet):
+        # Reloaded rules swap in between lines, never within one
+        rules = config.current
+    else:
+        rules = config.binary_rules if binary else config.rules
+
+    spans = rules.spans(line)
+    if rules.multiline:
+        from .multiline import merge_spans, multiline_spans
+
+        # Without the lines around it, multiline rules match within the line
+        spans = merge_spans(spans, multiline_spans(rules, [line])[0][0], len(rules))
+    if not spans:
+        return line
+    return render(rules, line, spans)
+
 
-    for style in styles:
-        result.append(line[previous : style.index])
+def process_block(config: "Config | RuleSet", lines: Sequence) -> list:
+    """Process lines as process_line does, matching them as one block.
 
-        if style.type == "start":
-            # Add style to applied stack
-            applied.append(style)
-            result.append(get_terminal_style(style))
-        elif style.type == "end":
-            # Attempt to pop from stack if matching ids
-            if applied and applied[-1].id == style.id:
-                _ = applied.pop()
+    Lines are str or bytes without their newlines, all of the same type.
+    """
+    if not lines:
+        return []
+    if isinstance(config, RuleSet):
+        rules = config.current
+    else:
+        rules = config.binary_rules if isinstance(lines[0], bytes) else config.rules
 
-                # Derive next color from stack
-                while applied and applied[-1].id in queued:
-                    queued.remove(applied[-1].id)
-                    _ = applied.pop()
+    found = rules.block_spans(lines)
+    if rules.multiline:
+        from .multiline import merge_spans, multiline_spans
 
-                # Found the next color, now we need to apply it
-                previous_style = applied[-1] if applied else None
-                result.append(get_terminal_style(previous_style))
-            else:
-                queued.add(style.id)
+        # The block is all there is, so matches reaching its end are final
+        multiline, _ = multiline_spans(rules, lines)
+        found = [merge_spans(*pair, len(rules)) for pair in zip(found, multiline)]
+    return [
+        render(rules, line, spans) if spans else line
+        for line, spans in zip(lines, found)
+    ]
+
+
+def render[T: (str, bytes)](rules: RuleSet, line: T, spans: list[int]) -> T:
+    """Line with the escape sequences for its spans inserted."""
+    transitions = rules.transitions
+    result: list[T] = []
+    previous = 0
+    active = -1
+    changes = iter(resolve_spans(spans))
+    for position, index in zip(changes, changes):
+        if index == active:
+            continue
 
-        previous = style.index
+        sequence = transitions.get((active, index))
+        if sequence is None:
+            sequence = rules.transition(active, index)
+        result.append(line[previous:position])
+        result.append(sequence)
+        previous = position
+        active = index
 
     result.append(line[previous:])
 
-    return "".join(result)
+    return line[:0].join(result)
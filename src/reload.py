@@ -0,0 +1,105 @@
+import os
+import pickle
+import sys
+import threading
+from collections.abc import Callable
+
+from .engine import RuleSet
+from .follow import InotifyWaiter, PollWaiter, create_waiter
+
+# Time given to a writer to finish the file before it is read
+SETTLE_INTERVAL = 0.1
+
+
+def file_signature(path: str) -> tuple[int, int, int] | None:
+    try:
+        status = os.stat(path)
+    except OSError:
+        return None
+    return status.st_ino, status.st_size, status.st_mtime_ns
+
+
+class ReloadingRuleSet(RuleSet):
+    """Rules recompiled in the background whenever their config file changes.
+
+    The new rule set replaces the current one in a single assignment, so
+    each line is matched entirely by the old or entirely by the new rules.
+    A config that fails to load leaves the current rules in place.
+    """
+
+    __slots__ = ("current", "path", "load", "signature", "waiter", "closed")
+
+    def __init__(
+        self,
+        path: str,
+        rules: RuleSet,
+        load: Callable[[], RuleSet],
+        waiter: InotifyWaiter | PollWaiter | None = None,
+    ):
+        self.current = rules
+        self.path = path
+        self.load = load
+        self.signature = file_signature(path)
+        self.waiter = waiter or create_waiter(path)
+        self.closed = threading.Event()
+        threading.Thread(target=self.watch, daemon=True).start()
+
+    @property
+    def rules(self):
+        return self.current.rules
+
+    @property
+    def styles(self):
+        return self.current.styles
+
+    @property
+    def transitions(self):
+        return self.current.transitions
+
+    @property
+    def multiline(self):
+        return self.current.multiline
+
+    def matches(self, line: str | bytes):
+        return self.current.matches(line)
+
+    def spans(self, line: str | bytes):
+        return self.current.spans(line)
+
+    def transition(self, current, target):
+        return self.current.transition(current, target)
+
+    def watch(self):
+        while not self.closed.is_set():
+            self.waiter.wait()
+            # Let the writer finish, e.g. an editor saving in place
+            if not self.closed.wait(SETTLE_INTERVAL):
+                self.reload()
+        self.waiter.close()
+
+    def close(self):
+        """Stop watching once the waiter next wakes up."""
+        self.closed.set()
+
+    def reload(self) -> bool:
+        signature = file_signature(self.path)
+        # A missing file is usually an editor replacing it, so wait for the new one
+        if signature is None or signature == self.signature:
+            return False
+
+        self.signature = signature
+        try:
+            rules = self.load()
+        except (OSError, ValueError) as error:
+            print(
+                f"Keeping previous rules, {self.path} failed to load: {error}",
+                file=sys.stderr,
+            )
+            return False
+
+        self.current = rules
+        return True
+
+    def __reduce__(self):
+        # Worker processes get the rules in effect when they start
+        return self.current.__reduce_ex__(pickle.HIGHEST_PROTOCOL)
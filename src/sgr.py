@@ -0,0 +1,113 @@
+import re
+
+RESET = "\x1b[0m"
+
+SEQUENCE = re.compile(r"\x1b\[([0-9;]*)m")
+
+# Codes that turn an attribute off again; 22 ends bold and dim together
+ATTRIBUTE_OFF = {1: 22, 2: 22, 3: 23, 4: 24, 5: 25, 7: 27, 8: 28}
+
+
+class SgrState:
+    """Colors and attributes a style leaves the terminal in.
+
+    Colors are SGR parameters such as "31" or "38;2;255;0;0", None for the
+    terminal default.
+    """
+
+    __slots__ = ("foreground", "background", "attributes")
+
+    def __init__(
+        self,
+        foreground: str | None = None,
+        background: str | None = None,
+        attributes: frozenset[int] = frozenset(),
+    ):
+        self.foreground = foreground
+        self.background = background
+        self.attributes = attributes
+
+
+DEFAULT = SgrState()
+
+
+def parse_style(style: str) -> SgrState | None:
+    """Parse a style made of SGR sequences, None if it holds anything else."""
+    foreground = background = None
+    attributes: set[int] = set()
+
+    position = 0
+    while position < len(style):
+        sequence = SEQUENCE.match(style, position)
+        if sequence is None:
+            return None
+        position = sequence.end()
+
+        parameters = sequence.group(1).split(";")
+        index = 0
+        while index < len(parameters):
+            if not parameters[index].isdigit():
+                return None
+            code = int(parameters[index])
+            if code in (38, 48):
+                # Extended colors: 5;n or 2;r;g;b
+                mode = parameters[index + 1] if index + 1 < len(parameters) else ""
+                length = {"5": 3, "2": 5}.get(mode, 0)
+                if not length or index + length > len(parameters):
+                    return None
+                color = ";".join(parameters[index : index + length])
+                if code == 38:
+                    foreground = color
+                else:
+                    background = color
+                index += length
+                continue
+
+            if 30 <= code <= 37 or 90 <= code <= 97:
+                foreground = str(code)
+            elif 40 <= code <= 47 or 100 <= code <= 107:
+                background = str(code)
+            elif code == 39:
+                foreground = None
+            elif code == 49:
+                background = None
+            elif code in ATTRIBUTE_OFF:
+                attributes.add(code)
+            else:
+                return None
+            index += 1
+
+    return SgrState(foreground, background, frozenset(attributes))
+
+
+def sequence(codes: list[str]) -> str:
+    return "".join(f"\x1b[{code}m" for code in codes)
+
+
+def transition(current: SgrState | None, target: SgrState | None) -> str:
+    """Shortest escape sequence taking the terminal from current to target.
+
+    None stands for no style at all, which is always reached by a reset.
+    """
+    if target is None:
+        return RESET
+    current = current or DEFAULT
+
+    off = {ATTRIBUTE_OFF[code] for code in current.attributes - target.attributes}
+    on = target.attributes - current.attributes
+    if 22 in off:
+        # Turning off bold or dim turns off both, so restore the one kept
+        on |= target.attributes & {1, 2}
+
+    codes = [str(code) for code in sorted(off)]
+    if current.foreground != target.foreground:
+        codes.append(target.foreground or "39")
+    if current.background != target.background:
+        codes.append(target.background or "49")
+    codes += [str(code) for code in sorted(on)]
+
+    changes = sequence(codes)
+    if current is DEFAULT:
+        return changes
+    # Starting over is shorter when most of the state changes
+    return min(changes, RESET + transition(DEFAULT, target), key=len)
@@ -0,0 +1,133 @@
+import mmap
+import os
+import select
+import stat
+import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import IO
+
+CHUNK_BYTES = 1024 * 1024
+READ_SIZE = 64 * 1024
+
+# Quiet time after which a pipe counts as idle
+IDLE_TIMEOUT = 0.1
+
+
+def iter_lines(stream: IO, newline: str | bytes) -> Iterator:
+    for line in stream:
+        yield line[:-1] if line.endswith(newline) else line
+
+
+def iter_idle_lines(
+    stream: IO[bytes], binary: bool, timeout: float = IDLE_TIMEOUT
+) -> Iterator:
+    """Lines of a pipe or terminal, with None whenever it goes quiet.
+
+    None is yielded once each time no input arrives for timeout seconds, as
+    follow_file(idle=True) does at the end of a file. The stream is read
+    unbuffered, so nothing may have been read from it before.
+    """
+    # select() only takes sockets on Windows
+    if sys.platform == "win32":
+        for line in iter_lines(stream, b"\n"):
+            yield line if binary else decode(line)
+        return
+
+    fd = stream.fileno()
+    pending = b""
+    while True:
+        readable, _, _ = select.select([fd], [], [], timeout)
+        if not readable:
+            yield None
+            select.select([fd], [], [])
+        chunk = os.read(fd, READ_SIZE)
+        if not chunk:
+            break
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line if binary else decode(line)
+    if pending:
+        yield pending if binary else decode(pending)
+
+
+def decode(line: bytes) -> str:
+    # Never fail on bad bytes: they become lone surrogates, which stdout is
+    # set up to write back as the same bytes
+    return line.decode("utf-8", "surrogateescape")
+
+
+@contextmanager
+def map_file(path: str):
+    """Memory-map a regular file, or yield None when it cannot be mapped.
+
+    Pipes, character devices and empty files cannot be mapped and are read
+    as a stream instead.
+    """
+    with open(path, "rb") as file:
+        status = os.fstat(file.fileno())
+        if not stat.S_ISREG(status.st_mode) or status.st_size == 0:
+            yield None
+            return
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def iter_mapped_lines(
+    mapped: mmap.mmap, binary: bool, start: int = 0, end: int | None = None
+) -> Iterator:
+    """Lines of the mapping between two line-aligned offsets."""
+    end = len(mapped) if end is None else end
+    mapped.seek(start)
+    readline = mapped.readline
+    while mapped.tell() < end:
+        line = readline()
+        if line.endswith(b"\n"):
+            line = line[:-1]
+        yield line if binary else decode(line)
+
+
+def read_mapped_lines(mapped: mmap.mmap, binary: bool, start: int, end: int) -> list:
+    """Lines of the mapping between two line-aligned offsets, decoded at once.
+
+    Newlines cannot be part of a multi-byte sequence, so decoding the range
+    escapes bad bytes exactly as decoding each line does.
+    """
+    data = mapped[start:end]
+    newline = b"\n"
+    if not binary:
+        data = decode(data)
+        newline = "\n"
+    lines = data.split(newline)
+    # The last line ends the range, or was the last line of the file
+    if not lines[-1]:
+        lines.pop()
+    return lines
+
+
+def iter_file_lines(path: str, binary: bool, idle: bool = False) -> Iterator:
+    """Lines of a file, with None when a pipe goes quiet if idle is set."""
+    with map_file(path) as mapped:
+        if mapped is not None:
+            yield from iter_mapped_lines(mapped, binary)
+            return
+
+        with open(path, "rb") as file:
+            if idle:
+                yield from iter_idle_lines(file, binary)
+                return
+            for line in iter_lines(file, b"\n"):
+                yield line if binary else decode(line)
+
+
+def line_ranges(mapped: mmap.mmap, chunk_bytes: int = CHUNK_BYTES) -> Iterator:
+    """Split a mapping into (start, end) offsets that never cut a line."""
+    size = len(mapped)
+    start = 0
+    while start < size:
+        end = mapped.find(b"\n", min(start + chunk_bytes, size) - 1)
+        end = size if end == -1 else end + 1
+        yield start, end
+        start = end
@@ -0,0 +1,56 @@
+from collections.abc import Sequence
+
+
+def resolve_spans(spans: Sequence[int]) -> list[int]:
+    """Turn possibly overlapping spans into style changes along a line.
+
+    Spans are flat start, end, style triples and the result is flat
+    position, style pairs with -1 meaning no style, at most one change per
+    position. Styles are indexes, such as a rule's position in its rule set.
+    A span starting inside another is drawn on top of it; when a span ends
+    before the spans drawn on top of it, it is queued and dropped once they
+    end, so crossing spans keep their later style. Sorting dominates, so
+    lines with m spans resolve in O(m log m).
+    """
+    if len(spans) == 3:
+        # Most lines match a single pattern, which needs no sorting
+        start, end, style = spans
+        return [start, style, end, -1] if end > start else [start, -1]
+
+    # Events pack a position and the offset of the span's start or end into
+    # one int, so they sort natively; ties keep the order spans were given
+    # in, starts before their own end
+    count = len(spans)
+    shift = count.bit_length()
+    events = [spans[offset] << shift | offset for offset in range(0, count, 3)]
+    events += [spans[offset] << shift | offset for offset in range(1, count, 3)]
+    events.sort()
+
+    mask = (1 << shift) - 1
+    changes: list[int] = []
+    # Spans are tracked by the offset of their start
+    applied: list[int] = []
+    queued = set[int]()
+
+    for event in events:
+        offset = event & mask
+        if not offset % 3:
+            applied.append(offset)
+            style = spans[offset + 2]
+        elif applied and applied[-1] == offset - 1:
+            applied.pop()
+            while applied and applied[-1] in queued:
+                queued.remove(applied.pop())
+            style = spans[applied[-1] + 2] if applied else -1
+        else:
+            queued.add(offset - 1)
+            continue
+
+        # Only the last of several changes at one position is ever seen
+        position = event >> shift
+        if changes and changes[-2] == position:
+            changes[-1] = style
+        else:
+            changes += (position, style)
+
+    return changes
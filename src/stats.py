@@ -0,0 +1,141 @@
+import time
+
+from .budget import BudgetedRuleSet, MatchBudget, MatchTimeout
+from .engine import RuleSet, all_matches, group_spans
+
+
+class PatternStats:
+    """Time spent on one pattern, the lines it was tried on and its matches."""
+
+    __slots__ = ("key", "time", "attempts", "hits")
+
+    def __init__(self, key: str):
+        self.key = key
+        # Nanoseconds, including the literal check that may skip the regex
+        self.time = 0
+        self.attempts = 0
+        self.hits = 0
+
+
+class Profile:
+    """Per-pattern statistics and totals for a run, kept across reloads."""
+
+    __slots__ = ("patterns", "lines", "size", "started")
+
+    def __init__(self):
+        self.patterns: dict[str, PatternStats] = {}
+        self.lines = 0
+        self.size = 0
+        self.started = time.perf_counter()
+
+    def pattern(self, key: str) -> PatternStats:
+        stats = self.patterns.get(key)
+        if stats is None:
+            stats = self.patterns[key] = PatternStats(key)
+        return stats
+
+    def summary(self) -> str:
+        elapsed = time.perf_counter() - self.started
+        lines = [
+            f"{self.lines:,} lines, {self.size / 1e6:,.1f} MB in {elapsed:.2f} s"
+            f" ({self.lines / elapsed:,.0f} lines/s, {self.size / elapsed / 1e6:,.1f} MB/s)"
+        ]
+        if not self.patterns:
+            return lines[0]
+
+        width = max(len("pattern"), *(len(key) for key in self.patterns))
+        lines.append(
+            f"{'pattern':<{width}} {'time ms':>10} {'attempts':>12} {'hits':>12} {'µs/attempt':>11}"
+        )
+        # Slowest first, as those are the patterns worth rewriting
+        for stats in sorted(self.patterns.values(), key=lambda stats: -stats.time):
+            average = stats.time / stats.attempts / 1000 if stats.attempts else 0.0
+            lines.append(
+                f"{stats.key:<{width}} {stats.time / 1e6:>10.1f} {stats.attempts:>12,}"
+                f" {stats.hits:>12,} {average:>11.2f}"
+            )
+        return "\n".join(lines)
+
+
+class ProfiledRuleSet(BudgetedRuleSet):
+    """Rules matched one at a time while timing each of them.
+
+    Lines served from a line cache are never matched, so they are not
+    counted either. With a budget, overruns are skipped as they are without
+    profiling.
+    """
+
+    __slots__ = ("profile", "counters")
+
+    def __init__(
+        self, rules: RuleSet, profile: Profile, budget: MatchBudget | None = None
+    ):
+        super().__init__(rules, budget)
+        self.profile = profile
+        self.counters = [profile.pattern(rule.key) for rule in rules.rules]
+
+    def spans(self, line: str | bytes) -> list[int]:
+        profile = self.profile
+        profile.lines += 1
+        profile.size += len(
+            line if isinstance(line, bytes) else line.encode(errors="surrogateescape")
+        )
+
+        clock = time.perf_counter_ns
+        rules = self.rules
+        counters = self.counters
+        active = self.active
+        found: list[int] = []
+        find = line.find
+        position = 0
+        index = -1
+        size = attempts = hits = start = 0
+        while position < len(active):
+            first = position
+            try:
+                self.arm()
+                while position < len(active):
+                    index = active[position]
+                    rule = rules[index]
+                    stats = counters[index]
+                    position += 1
+                    size = len(found)
+                    attempts, hits = stats.attempts, stats.hits
+                    start = clock()
+                    if rule.required:
+                        for literal in rule.required:
+                            if find(literal) != -1:
+                                break
+                        else:
+                            stats.time += clock() - start
+                            continue
+
+                    stats.attempts += 1
+                    if rule.all_matches:
+                        for matching in all_matches(rule.regex, line):
+                            found += (*matching.span(), index)
+                            if rule.groups:
+                                group_spans(found, matching, rule.groups)
+                            stats.hits += 1
+                    else:
+                        matching = rule.regex.search(line)
+                        if matching:
+                            found += (matching.start(), matching.end(), index)
+                            if rule.groups:
+                                group_spans(found, matching, rule.groups)
+                            stats.hits += 1
+                    stats.time += clock() - start
+            except MatchTimeout:
+                if position > first:
+                    # Charged up to the alarm, so overrunning patterns stand out
+                    stats.time += clock() - start
+                if position - first > 1:
+                    # Armed before this pattern began, so it starts over
+                    del found[size:]
+                    stats.attempts, stats.hits = attempts, hits
+                    position -= 1
+                elif position > first:
+                    self.skip(index)
+            finally:
+                self.disarm()
+        return found
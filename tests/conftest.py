@@ -1,10 +1,13 @@
-from typing import TYPE_CHECKING
+import pytest
 
-if TYPE_CHECKING:
-    import pytest
 
+@pytest.fixture(autouse=True)
+def cache_home(tmp_path_factory, monkeypatch):
+    # Keep compiled configs out of the user's cache
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path_factory.mktemp("cache")))
 
-def pytest_itemcollected(item: "pytest.Item") -> None:
+
+def pytest_itemcollected(item: pytest.Item) -> None:
     if item.config.getoption("verbose") > 0:
         doc = item.function.__doc__  # pyright: ignore[reportUnknownMemberType, reportAttributeAccessIssue]
         if doc:
@@ -0,0 +1,144 @@
+from pathlib import Path
+
+from src.analysis import analyze_rules, estimate_costs
+from src.cli import run_check
+from src.engine import compile_rules
+from src.loader import Pattern, load_rules
+
+EXAMPLES = Path(__file__).parent.parent / "examples"
+
+
+def messages(pattern: str) -> list[str]:
+    rules = compile_rules({"test": Pattern(pattern=pattern)})
+    return [finding.message for finding in analyze_rules(rules)]
+
+
+def suggestions(pattern: str) -> list[str | None]:
+    rules = compile_rules({"test": Pattern(pattern=pattern)})
+    return [finding.suggestion for finding in analyze_rules(rules)]
+
+
+class TestAnalyzeRules:
+    def test_analyze_nested_quantifiers(self):
+        """unbounded repeats inside unbounded repeats are flagged.
+
+        Example:
+            >>> [str(finding) for finding in analyze_rules(rules)]
+            ['test: a repeated group contains another unbounded repeat, ...']
+        """
+        assert any("unbounded repeat" in message for message in messages("x(a+)+"))
+        assert any(
+            "unbounded repeat" in message for message in messages(r"x(?:\w+\s?)*y")
+        )
+        # Atomic groups, possessive and bounded repeats do not backtrack into themselves
+        assert messages("x(?>a+)+") == []
+        assert messages("x(a++)+") == []
+        assert messages(r"x(\d{1,3}\.){3}") == []
+
+    def test_analyze_leading_any(self):
+        """a leading .* is flagged with an anchored rewrite.
+
+        Example:
+            >>> suggestions(".*ERROR")
+            ['^.*ERROR']
+        """
+        assert suggestions(".*ERROR") == ["^.*ERROR"]
+        assert suggestions("^.*ERROR") == []
+
+    def test_analyze_unanchored_suffix(self):
+        """an unanchored .* suffix is flagged, suggesting a word boundary.
+
+        Example:
+            >>> suggestions("at .*")
+            ['\\\\bat .*']
+        """
+        assert suggestions("at .*") == [r"\bat .*"]
+        assert suggestions(r"\s+at .*") == [r"^\s+at .*"]
+        assert suggestions("^    .*") == []
+
+    def test_analyze_missing_literal(self):
+        """patterns without a required literal are flagged unless anchored.
+
+        Example:
+            >>> messages(r"\\d+")
+            ['has no literal text every match contains, ...']
+        """
+        assert len(messages(r"\d+")) == 1
+        assert messages(r"^\d+") == []
+        assert messages(r"\bERROR\b") == []
+
+    def test_analyze_examples(self):
+        """the example configs only have the unanchored .* suffixes flagged.
+
+        Example:
+            $ easel check examples/*.toml
+        """
+        flagged = {}
+        for path in sorted(EXAMPLES.glob("*.toml")):
+            findings = analyze_rules(load_rules(str(path)))
+            if findings:
+                flagged[path.stem] = [finding.key for finding in findings]
+
+        assert flagged == {
+            "git": ["author", "date"],
+            "node": ["stack_trace"],
+            "tomcat": ["stack"],
+        }
+
+
+class TestEstimateCosts:
+    def test_estimate_costs_runaway(self):
+        """patterns backtracking catastrophically on a sample line are stopped.
+
+        Example:
+            >>> profile, findings = estimate_costs(rules, ["aaaa…a!"], budget_ms=10)
+            >>> [finding.key for finding in findings]
+            ['nested']
+        """
+        rules = compile_rules(
+            {"nested": Pattern(pattern="^(a+)+$"), "bang": Pattern(pattern="!")}
+        )
+        lines = ["a" * 40 + "!"] * 3
+        profile, findings = estimate_costs(rules, lines, budget_ms=10)
+
+        assert [finding.key for finding in findings] == ["nested"]
+        # Stopped after the first line
+        assert profile.patterns["nested"].attempts == 1
+        assert profile.patterns["bang"].attempts == 3
+
+    def test_run_check(self, tmp_path, capsys):
+        """easel check reports findings and fails when there are any.
+
+        Example:
+            $ easel check examples/node.toml
+            examples/node.toml: 1 finding
+            stack_trace: ends in an unanchored .*, ...
+              try: \\bat .*
+        """
+        sample = tmp_path / "sample.log"
+        sample.write_text("2024-10-10 INFO started\n")
+
+        assert run_check([str(EXAMPLES / "node.toml")], str(sample)) == 1
+        output = capsys.readouterr().out
+        assert "node.toml: 1 finding" in output
+        assert "try: \\bat .*" in output
+        assert "cost on 1 sample lines" in output
+
+        assert run_check([str(EXAMPLES / "app.toml")]) == 0
+        assert "app.toml: 0 findings" in capsys.readouterr().out
+
+    def test_run_check_without_interval_timers(self, monkeypatch, capsys):
+        """patterns are timed without a budget where there are no interval timers.
+
+        Example:
+            $ easel check examples/app.toml  # on Windows
+            Note: no interval timers on this platform, so runaway patterns ...
+        """
+        monkeypatch.setattr("src.analysis.INTERVAL_TIMERS", False)
+        monkeypatch.setattr("src.budget.INTERVAL_TIMERS", False)
+
+        assert run_check([str(EXAMPLES / "app.toml")]) == 0
+        output = capsys.readouterr().out
+        assert output.startswith("Note: no interval timers on this platform")
+        assert "app.toml: 0 findings" in output
+        assert "cost on" in output
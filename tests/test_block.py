@@ -0,0 +1,131 @@
+import re
+from pathlib import Path
+
+from benchmarks.corpus import GENERATORS, generate_lines
+from src.block import block_regex
+from src.loader import Config, Pattern, get_foreground_color, load_config
+from src.processor import process_block, process_line
+
+EXAMPLES = Path(__file__).parent.parent / "examples"
+
+RED = get_foreground_color("red")
+
+# Lines that sit at the edges of what a pattern sees of its neighbours
+EDGE_LINES = [
+    "",
+    "x",
+    'say "hi" then "bye"',
+    "trailing   ",
+    "   leading",
+    "start middle end",
+    "end",
+    "start",
+    "",
+    "ab ab ab",
+    "tab\there",
+    "done",
+]
+
+
+def config(*patterns: str, all_matches: bool = False) -> Config:
+    return Config(
+        patterns={
+            f"p{index}": Pattern(
+                pattern=pattern, foreground_color=RED, all_matches=all_matches
+            )
+            for index, pattern in enumerate(patterns)
+        }
+    )
+
+
+class TestBlockRegex:
+    def test_block_regex_line_bound(self):
+        """patterns that stay within a line are searched with MULTILINE.
+
+        Example:
+            >>> block_regex(re.compile("^ERROR$"))
+            re.compile('^ERROR$', re.MULTILINE)
+        """
+        for pattern in [
+            "^ERROR$",
+            r"\bat .*",
+            r"[^\n\"]*",
+            r"(?<=\S)x(?!\d)",
+            r"\S+\d",
+        ]:
+            assert block_regex(re.compile(pattern)).flags & re.MULTILINE
+
+    def test_block_regex_newline(self):
+        """patterns that can match a newline or see the whole string are not.
+
+        Example:
+            >>> block_regex(re.compile(r"\\s+$")) is None
+            True
+        """
+        for pattern in [
+            r"\s+$",
+            r'"[^"]*"',
+            r"\Aa",
+            r"a\Z",
+            "(?s)a.b",
+            r"a(?=\W)",
+            r"[\D]",
+        ]:
+            assert block_regex(re.compile(pattern)) is None
+        assert block_regex(re.compile(rb"^\w+")) is not None
+
+
+class TestProcessBlock:
+    def test_process_block_edges(self):
+        """blocks are styled exactly as their lines are one at a time.
+
+        Example:
+            >>> process_block(config("^end$", r"\\s+$"), ["end", "start  "])
+            ['[fg:red]end[reset]', 'start[fg:red]  [reset]']
+        """
+        patterns = [
+            "^start",
+            "end$",
+            "^$",
+            r"\s+$",
+            r'"[^"]*"',
+            r"\bab\b",
+            r"(?<=\s)\w+",
+            r"\w+(?=\s|$)",
+            r"\Ax|done\Z",
+            "x*",
+            r"\t",
+        ]
+        for all_matches in (False, True):
+            rules = config(*patterns, all_matches=all_matches)
+            expected = [process_line(rules, line) for line in EDGE_LINES]
+            assert process_block(rules, EDGE_LINES) == expected
+            binary = [line.encode() for line in EDGE_LINES]
+            assert process_block(rules, binary) == [line.encode() for line in expected]
+
+    def test_process_block_examples(self):
+        """the example configs style generated corpora identically as blocks.
+
+        Example:
+            >>> lines = generate_lines("git", 2000)
+            >>> process_block(config, lines) == [process_line(config, line) for line in lines]
+            True
+        """
+        for name in GENERATORS:
+            rules = load_config(
+                str(EXAMPLES / f"{name}.toml"), all_matches=name == "app"
+            )
+            lines = generate_lines(name, 500)
+            assert process_block(rules, lines) == [
+                process_line(rules, line) for line in lines
+            ]
+
+    def test_process_block_embedded_newlines(self):
+        """lines holding newlines are still matched one at a time.
+
+        Example:
+            >>> process_block(config("^b"), ["a\\nb"])
+            ['a\\nb']
+        """
+        assert process_block(config("^b"), ["a\nb", "b"]) == ["a\nb", f"{RED}b\x1b[0m"]
+        assert process_block(config("^b"), []) == []
@@ -0,0 +1,124 @@
+import time
+from pathlib import Path
+
+import pytest
+from src.budget import BudgetedRuleSet, MatchBudget
+from src.cli import run
+from src.loader import Config, Pattern, get_foreground_color, get_reset
+from src.processor import process_line
+
+EXAMPLES = Path(__file__).parent.parent / "examples"
+
+RED = get_foreground_color("red")
+BLUE = get_foreground_color("blue")
+RESET = get_reset()
+
+CONFIG = Config(
+    patterns={
+        # Backtracks exponentially on a run of a's that does not end the line
+        "nested": Pattern(
+            pattern="^(a+)+$", foreground_color=RED, background_color="", attributes=""
+        ),
+        "bang": Pattern(
+            pattern="!", foreground_color=BLUE, background_color="", attributes=""
+        ),
+    }
+)
+
+SLOW_LINE = "a" * 40 + "!"
+
+
+class SleepingRegex:
+    """Stands in for a regex whose search takes a set time and never matches."""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+
+    def search(self, line: str):
+        time.sleep(self.seconds)
+        return None
+
+
+class TestMatchBudget:
+    def test_match_budget_skips_slow_pattern(self):
+        """a pattern running past the budget is skipped, the others still apply.
+
+        Example:
+            >>> rules = BudgetedRuleSet(config.rules, MatchBudget(10))
+            >>> process_line(rules, "aaaa…a!")
+            'aaaa…a[fg:blue]![reset]'
+        """
+        budget = MatchBudget(10)
+        rules = BudgetedRuleSet(CONFIG.rules, budget)
+
+        assert process_line(rules, SLOW_LINE) == f"{'a' * 40}{BLUE}!{RESET}"
+        assert budget.overruns == {"nested": 1}
+        # Fast lines match as without a budget
+        assert process_line(rules, "aaa") == process_line(CONFIG, "aaa")
+
+    def test_match_budget_per_pattern(self):
+        """a pattern is only skipped for running past a budget of its own.
+
+        Example:
+            >>> rules = BudgetedRuleSet(config.rules, MatchBudget(100))
+            >>> rules.spans(line)  # 70 ms, then 50 ms, then 150 ms
+            []
+            >>> budget.overruns
+            {'slow': 1}
+        """
+        config = Config(
+            patterns={key: Pattern(pattern=key) for key in ("first", "second", "slow")}
+        )
+        for rule, seconds in zip(config.rules.rules, (0.07, 0.05, 0.15)):
+            rule.regex = SleepingRegex(seconds)
+        budget = MatchBudget(100)
+        rules = BudgetedRuleSet(config.rules, budget)
+
+        assert rules.spans("first second slow") == []
+        # second ran out of time begun by first, which is not its fault
+        assert budget.overruns == {"slow": 1}
+
+    def test_match_budget_disables_pattern(self):
+        """a pattern overrunning disable_after times is no longer tried.
+
+        Example:
+            >>> budget = MatchBudget(10, disable_after=2)
+            >>> rules = BudgetedRuleSet(config.rules, budget)
+            >>> for _ in range(3):
+            ...     process_line(rules, "aaaa…a!")
+            >>> budget.overruns, budget.disabled
+            ({'nested': 2}, {'nested'})
+        """
+        budget = MatchBudget(10, disable_after=2)
+        rules = BudgetedRuleSet(CONFIG.rules, budget)
+        for _ in range(3):
+            process_line(rules, SLOW_LINE)
+
+        assert budget.overruns == {"nested": 2}
+        assert budget.disabled == {"nested"}
+        assert process_line(rules, "aaa") == "aaa"
+        # Rule sets built later, e.g. on reload, leave it disabled
+        assert BudgetedRuleSet(CONFIG.rules, budget).active == (1,)
+
+    def test_match_budget_invalid(self):
+        """a budget has to be positive.
+
+        Example:
+            >>> MatchBudget(0)
+            Traceback (most recent call last):
+            ValueError: Invalid match timeout: 0
+        """
+        with pytest.raises(ValueError, match="Invalid match timeout: 0"):
+            MatchBudget(0)
+
+    def test_match_timeout_without_interval_timers(self, monkeypatch, capsys):
+        """--match-timeout is rejected where there are no interval timers.
+
+        Example:
+            $ easel -c examples/app.toml --match-timeout 50 app.log  # on Windows
+            --match-timeout needs interval timers, which this platform lacks
+        """
+        monkeypatch.setattr("src.budget.INTERVAL_TIMERS", False)
+
+        assert run(str(EXAMPLES / "app.toml"), ["-"], match_timeout=50) == 1
+        assert "--match-timeout needs interval timers" in capsys.readouterr().err
@@ -0,0 +1,131 @@
+import io
+import os
+import pickle
+import re
+
+import pytest
+from src.cache import RulePickler, cache_directory, cache_key, read_cache
+from src.engine import compile_rules
+from src.loader import Pattern, load_rules
+
+CONFIG = '[patterns.error]\npattern = "ERROR"\nforeground_color = "red"\n'
+
+
+class TestRulePickler:
+    def test_rule_pickler_round_trip(self):
+        """compiled regexes are restored without recompiling them.
+
+        Example:
+            >>> buffer = io.BytesIO()
+            >>> RulePickler(buffer).dump(re.compile(r"\\bfox"))
+            >>> pickle.loads(buffer.getvalue())
+            re.compile('\\\\bfox')
+        """
+        for regex in (
+            re.compile(r"\bfox\w+"),
+            re.compile("(?i)quick"),
+            re.compile(r"(?P<word>b\w+) (?P=word)"),
+            re.compile(rb"\xff+fox"),
+            re.compile("(?x) a b  # comment"),
+        ):
+            buffer = io.BytesIO()
+            RulePickler(buffer, pickle.HIGHEST_PROTOCOL).dump(regex)
+            restored = pickle.loads(buffer.getvalue())
+
+            assert restored == regex
+            assert restored.groupindex == regex.groupindex
+
+    def test_rule_pickler_rule_set(self):
+        """rule sets keep their matches after a round trip.
+
+        Example:
+            >>> pickle.loads(buffer.getvalue()).matches("a fox")
+            [(<Rule fox>, 2, 5)]
+        """
+        rules = compile_rules(
+            {"fox": Pattern(pattern="fox"), "word": Pattern(pattern=r"(?P<w>a)")}
+        )
+        buffer = io.BytesIO()
+        RulePickler(buffer, pickle.HIGHEST_PROTOCOL).dump(rules)
+        restored = pickle.loads(buffer.getvalue())
+
+        line = "a fox"
+        assert [(r.key, s, e) for r, s, e in restored.matches(line)] == [
+            (r.key, s, e) for r, s, e in rules.matches(line)
+        ]
+
+
+class TestLoadRulesCache:
+    def test_load_rules_cached(self, tmp_path):
+        """an unchanged config is loaded from the cache.
+
+        Example:
+            >>> load_rules("path/to/config.toml")  # compiles and caches
+            >>> load_rules("path/to/config.toml")  # loads the cached rules
+        """
+        config_file = tmp_path / "config.toml"
+        config_file.write_text(CONFIG)
+        rules = load_rules(str(config_file))
+        key = cache_key(CONFIG.encode(), False, False)
+
+        cached = read_cache(key)
+        assert cached is not None
+        assert cached.rules[0].regex == rules.rules[0].regex
+        assert cached.rules[0].style == rules.rules[0].style
+
+        # Editing the config changes its key
+        config_file.write_text(CONFIG.replace("red", "blue"))
+        assert load_rules(str(config_file)).rules[0].style == "\x1b[34m\x1b[49m"
+
+    def test_load_rules_rebuild(self, tmp_path):
+        """a damaged cache entry is rebuilt, and rebuild ignores the cache.
+
+        Example:
+            >>> load_rules("path/to/config.toml", rebuild=True)
+        """
+        config_file = tmp_path / "config.toml"
+        config_file.write_text(CONFIG)
+        load_rules(str(config_file))
+
+        key = cache_key(CONFIG.encode(), False, False)
+        path = os.path.join(cache_directory(), f"{key}.pickle")
+        with open(path, "wb") as file:
+            file.write(b"damaged")
+
+        assert read_cache(key) is None
+        assert load_rules(str(config_file)).rules[0].key == "error"
+        assert read_cache(key) is not None
+
+        with open(path, "wb") as file:
+            file.write(b"damaged")
+        assert load_rules(str(config_file), rebuild=True).rules[0].key == "error"
+        assert read_cache(key) is not None
+
+    @pytest.mark.skipif(not hasattr(os, "getuid"), reason="no file owners")
+    def test_read_cache_private(self, tmp_path, monkeypatch):
+        """entries others could have written are never unpickled.
+
+        Example:
+            $ chmod g+w ~/.cache/easel
+            >>> read_cache(key) is None
+            True
+        """
+        config_file = tmp_path / "config.toml"
+        config_file.write_text(CONFIG)
+        load_rules(str(config_file))
+        key = cache_key(CONFIG.encode(), False, False)
+        directory = cache_directory()
+        path = os.path.join(directory, f"{key}.pickle")
+
+        assert os.stat(directory).st_mode & 0o777 == 0o700
+        assert os.stat(path).st_mode & 0o777 == 0o600
+        assert read_cache(key) is not None
+
+        os.chmod(path, 0o620)
+        assert read_cache(key) is None
+        os.chmod(path, 0o600)
+        os.chmod(directory, 0o707)
+        assert read_cache(key) is None
+        os.chmod(directory, 0o700)
+        monkeypatch.setattr(os, "getuid", lambda: os.stat(path).st_uid + 1)
+        assert read_cache(key) is None
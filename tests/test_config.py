@@ -1,5 +1,9 @@
+from pathlib import Path
+
 import pytest
-from src.loader import load_config
+from src.loader import load_config, load_rules
+
+EXAMPLES = Path(__file__).parent.parent / "examples"
 
 
 class TestLoadConfig:
@@ -76,3 +80,80 @@ attributes = "invalid"
         with pytest.raises(ValueError, match="Invalid attribute: invalid"):
             load_config(str(config_file))
 
+
+class TestLoadRules:
+    def test_load_rules_matches_load_config(self):
+        """load_rules compiles the same rules as load_config.
+
+        Example:
+            >>> load_rules("examples/app.toml").rules[0].style == (
+            ...     load_config("examples/app.toml").rules.rules[0].style
+            ... )
+            True
+        """
+        for path in sorted(EXAMPLES.glob("*.toml")):
+            fast = load_rules(str(path))
+            validated = load_config(str(path)).rules
+
+            assert [(r.key, r.regex, r.style) for r in fast.rules] == [
+                (r.key, r.regex, r.style) for r in validated.rules
+            ]
+
+    def test_load_rules_validation(self, tmp_path):
+        """configs needing validation go through the pydantic models.
+
+        Example:
+            config_content = '''
+            [patterns.test]
+            foreground_color = "red"
+            '''
+            >>> load_rules("path/to/config.toml")
+            Traceback (most recent call last):
+                ...
+            ValueError: TOML validation error: ...
+        """
+        config_file = tmp_path / "test.toml"
+        config_file.write_text('[patterns.test]\nforeground_color = "red"\n')
+
+        with pytest.raises(ValueError, match="TOML validation error"):
+            load_rules(str(config_file))
+
+        # Coerced by pydantic rather than rejected
+        config_file.write_text(
+            '[patterns.test]\npattern = "test"\nall_matches = "true"\n'
+        )
+
+        assert load_rules(str(config_file)).rules[0].all_matches
+
+    def test_load_rules_groups(self, tmp_path):
+        """styled groups load the same with and without the pydantic models.
+
+        Example:
+            config_content = '''
+            [patterns.access]
+            pattern = '"(?P<method>[A-Z]+) (?P<path>\\S+)'
+            foreground_color = "white"
+            groups.method.foreground_color = "blue"
+            '''
+            >>> load_rules("path/to/config.toml").styles[1].style
+            '\\x1b[34m\\x1b[49m'
+        """
+        config_file = tmp_path / "test.toml"
+        config_file.write_text(
+            "[patterns.access]\n"
+            "pattern = '\"(?P<method>[A-Z]+) (?P<path>\\S+)'\n"
+            'background_color = "black"\n'
+            'groups.method.foreground_color = "blue"\n'
+            'groups.path.attributes = "bold"\n'
+        )
+        fast = load_rules(str(config_file), rebuild=True)
+        validated = load_config(str(config_file)).rules
+
+        assert [(s.key, s.style) for s in fast.styles] == [
+            (s.key, s.style) for s in validated.styles
+        ]
+        # The background of the pattern carries over to its groups
+        assert [s.style for s in fast.styles[1:]] == [
+            "\x1b[34m\x1b[40m",
+            "\x1b[39m\x1b[40m\x1b[1m",
+        ]
@@ -0,0 +1,288 @@
+import re
+
+import pytest
+from src.budget import BudgetedRuleSet
+from src.engine import RuleSet, compile_rules
+from src.loader import Config, Group, Pattern, load_config
+
+
+class TestCompileRules:
+    def test_compile_rules_resolves_patterns(self):
+        """compile_rules produces compiled regexes and joined styles.
+
+        Example:
+            >>> rules = compile_rules({"fox": Pattern(pattern="fox", foreground_color="[fg]")})
+            >>> rules.rules[0].regex
+            re.compile('fox')
+            >>> rules.rules[0].style
+            '[fg]'
+        """
+        rules = compile_rules(
+            {
+                "fox": Pattern(
+                    pattern="fox",
+                    foreground_color="\x1b[31m",
+                    background_color="\x1b[42m",
+                    attributes="\x1b[1m",
+                )
+            }
+        )
+
+        assert isinstance(rules, RuleSet)
+        assert len(rules) == 1
+        assert isinstance(rules.rules[0].regex, re.Pattern)
+        assert rules.rules[0].key == "fox"
+        assert rules.rules[0].style == "\x1b[31m\x1b[42m\x1b[1m"
+
+    def test_compile_rules_missing_styles(self):
+        """missing style fields compile to empty sequences.
+
+        Example:
+            >>> compile_rules({"fox": Pattern(pattern="fox")}).rules[0].style
+            ''
+        """
+        rules = compile_rules({"fox": Pattern(pattern="fox")})
+
+        assert rules.rules[0].style == ""
+
+    def test_compile_rules_invalid_pattern(self):
+        """compile_rules raises ValueError for an invalid regex.
+
+        Example:
+            >>> compile_rules({"broken": Pattern(pattern="(")})
+            Traceback (most recent call last):
+                ...
+            ValueError: Invalid pattern: broken (...)
+        """
+        with pytest.raises(ValueError, match="Invalid pattern: broken"):
+            compile_rules({"broken": Pattern(pattern="(")})
+
+    def test_rule_set_matches(self):
+        """matches reports the first match of every rule, in rule order.
+
+        Example:
+            >>> rules = compile_rules({"fox": Pattern(pattern="fox"), "o": Pattern(pattern="o")})
+            >>> [(rule.key, start, end) for rule, start, end in rules.matches("brown fox")]
+            [('fox', 6, 9), ('o', 2, 3)]
+        """
+        rules = compile_rules(
+            {
+                "fox": Pattern(pattern="fox"),
+                "o": Pattern(pattern="o"),
+                "missing": Pattern(pattern="zebra"),
+            }
+        )
+
+        assert [
+            (rule.key, start, end) for rule, start, end in rules.matches("brown fox")
+        ] == [
+            ("fox", 6, 9),
+            ("o", 2, 3),
+        ]
+        assert rules.matches("") == []
+
+    def test_compile_rules_required_literals(self):
+        """compiled rules carry the literals their pattern requires.
+
+        Example:
+            >>> compile_rules({"error": Pattern(pattern=r"\\bERROR\\b")}).rules[0].required
+            ('ERROR',)
+        """
+        rules = compile_rules({"error": Pattern(pattern=r"\bERROR\b")})
+
+        assert rules.rules[0].required == ("ERROR",)
+        assert rules.matches("an ERROR here")[0][1:] == (3, 8)
+        assert rules.matches("an error here") == []
+
+    def test_compile_rules_binary(self):
+        """binary rule sets hold bytes regexes and escape codes.
+
+        Example:
+            >>> rules = compile_rules({"fox": Pattern(pattern="fox", foreground_color="[fg]")}, binary=True)
+            >>> rules.rules[0].regex, rules.rules[0].style
+            (re.compile(b'fox'), b'[fg]')
+        """
+        rules = compile_rules(
+            {"fox": Pattern(pattern=r"\bfox", foreground_color="\x1b[31m")},
+            binary=True,
+        )
+
+        assert rules.rules[0].regex.pattern == rb"\bfox"
+        assert rules.rules[0].style == b"\x1b[31m"
+        assert rules.rules[0].required == (b"fox",)
+        assert rules.matches(b"\xff fox")[0][1:] == (2, 5)
+
+    def test_compile_rules_all_matches(self):
+        """rules with all_matches report every non-empty match.
+
+        Example:
+            >>> rules = compile_rules({"status": Pattern(pattern="200")}, all_matches=True)
+            >>> [(s, e) for _, s, e in rules.matches("200 OK 200 bytes")]
+            [(0, 3), (7, 10)]
+        """
+        patterns = {
+            "status": Pattern(pattern="200"),
+            "empty": Pattern(pattern="z*", all_matches=True),
+        }
+        line = "200 OK 200 bytes"
+
+        rules = compile_rules(patterns)
+        assert [(r.key, s, e) for r, s, e in rules.matches(line)] == [("status", 0, 3)]
+
+        rules = compile_rules(patterns, all_matches=True)
+        assert [(r.key, s, e) for r, s, e in rules.matches(line)] == [
+            ("status", 0, 3),
+            ("status", 7, 10),
+        ]
+
+    def test_rule_set_spans(self):
+        """spans reports matches as flat start, end, rule index triples.
+
+        Example:
+            >>> rules = compile_rules({"a": Pattern(pattern="a"), "b": Pattern(pattern="b")})
+            >>> rules.spans("b a")
+            [2, 3, 0, 0, 1, 1]
+        """
+        patterns = {"a": Pattern(pattern="a"), "b": Pattern(pattern="b")}
+
+        rules = compile_rules(patterns)
+        assert rules.spans("b a") == [2, 3, 0, 0, 1, 1]
+        assert rules.spans("c") == []
+
+    def test_config_rules_cached(self):
+        """Config.rules compiles once and reuses the rule set.
+
+        Example:
+            >>> config = Config(patterns={"fox": Pattern(pattern="fox")})
+            >>> config.rules is config.rules
+            True
+        """
+        config = Config(patterns={"fox": Pattern(pattern="fox")})
+
+        assert config.rules is config.rules
+
+    def test_load_config_compiles_rules(self, tmp_path):
+        """load_config compiles the rule set with resolved escape codes.
+
+        Example:
+            config_content = '''
+            [patterns.test]
+            pattern = "test"
+            foreground_color = "red"
+            '''
+            >>> load_config("path/to/config.toml").rules.rules[0].style
+            '\\x1b[31m\\x1b[49m'
+        """
+        config_file = tmp_path / "test.toml"
+        config_file.write_text(
+            '[patterns.test]\npattern = "test"\nforeground_color = "red"\n'
+        )
+        config = load_config(str(config_file))
+
+        assert config.rules.rules[0].style == "\x1b[31m\x1b[49m"
+
+    def test_load_config_invalid_pattern(self, tmp_path):
+        """load_config raises ValueError for an invalid regex.
+
+        Example:
+            >>> load_config("path/to/config.toml")
+            Traceback (most recent call last):
+                ...
+            ValueError: Invalid pattern: test (...)
+        """
+        config_file = tmp_path / "test.toml"
+        config_file.write_text('[patterns.test]\npattern = "(unclosed"\n')
+
+        with pytest.raises(ValueError, match="Invalid pattern: test"):
+            load_config(str(config_file))
+
+
+GROUP_PATTERNS = {
+    "access": Pattern(
+        pattern=r'^(?P<ip>\S+) "(?P<request>(?P<method>[A-Z]+) \S+)" (\d{3})',
+        groups={
+            "request": Group(attributes="\x1b[1m"),
+            "method": Group(foreground_color="\x1b[34m"),
+            "ip": Group(foreground_color="\x1b[36m"),
+            "4": Group(foreground_color="\x1b[33m"),
+        },
+    ),
+    "error": Pattern(
+        pattern=r"(?P<code>5\d\d)", groups={"code": Group()}, all_matches=True
+    ),
+}
+
+GROUP_LINES = ['10.0.0.1 "GET /" 500', '10.0.0.1 "GET /"', "500 502", ""]
+
+
+class TestGroups:
+    def test_group_spans(self):
+        """styled groups follow their match, outer groups first, styles after the rules.
+
+        Example:
+            >>> rules = compile_rules(GROUP_PATTERNS)
+            >>> rules.spans('10.0.0.1 "GET /" 500')
+            [0, 20, 0, 0, 8, 2, 10, 15, 3, 10, 13, 4, 17, 20, 5, 17, 20, 1, 17, 20, 6]
+        """
+        rules = compile_rules(GROUP_PATTERNS)
+
+        assert [style.key for style in rules.styles] == [
+            "access",
+            "error",
+            "access.ip",
+            "access.request",
+            "access.method",
+            "access.4",
+            "error.code",
+        ]
+        assert rules.spans(GROUP_LINES[0]) == [
+            *(0, 20, 0),
+            *(0, 8, 2),
+            *(10, 15, 3),
+            *(10, 13, 4),
+            *(17, 20, 5),
+            *(17, 20, 1),
+            *(17, 20, 6),
+        ]
+        assert [(r.key, s, e) for r, s, e in rules.matches(GROUP_LINES[0])] == [
+            ("access", 0, 20),
+            ("error", 17, 20),
+        ]
+
+        spans = [rules.spans(line) for line in GROUP_LINES]
+        for binary in (False, True):
+            rules = compile_rules(GROUP_PATTERNS, binary)
+            lines = [line.encode() for line in GROUP_LINES] if binary else GROUP_LINES
+            assert [rules.spans(line) for line in lines] == spans
+            assert rules.block_spans(lines) == spans
+            assert [BudgetedRuleSet(rules, None).spans(line) for line in lines] == spans
+
+    def test_group_inherits_style(self):
+        """fields a group leaves out come from the nearest styled group around it.
+
+        Example:
+            >>> rules = compile_rules(GROUP_PATTERNS)
+            >>> rules.styles[4].style  # method, inside the bold request
+            '[fg:blue][bold]'
+        """
+        rules = compile_rules(GROUP_PATTERNS)
+        styles = {style.key: style.style for style in rules.styles}
+
+        assert styles["access.request"] == "\x1b[1m"
+        assert styles["access.method"] == "\x1b[34m\x1b[1m"
+        assert styles["access.ip"] == "\x1b[36m"
+
+    def test_group_invalid(self):
+        """compile_rules raises ValueError for groups the pattern does not have.
+
+        Example:
+            >>> compile_rules({"fox": Pattern(pattern="(fox)", groups={"2": Group()})})
+            Traceback (most recent call last):
+                ...
+            ValueError: Invalid group: 2 in pattern fox
+        """
+        for name in ("2", "0", "missing"):
+            with pytest.raises(
+                ValueError, match=f"Invalid group: {name} in pattern fox"
+            ):
+                compile_rules({"fox": Pattern(pattern="(fox)", groups={name: Group()})})
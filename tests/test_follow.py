@@ -0,0 +1,182 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+from src.follow import InotifyWaiter, PollWaiter, follow_file, tail_offset
+
+
+class TestTailOffset:
+    def test_tail_offset_last_lines(self, tmp_path):
+        """tail_offset finds where the last n lines start.
+
+        Example:
+            >>> with open("path/to/file.log", "rb") as file:  # b"a\\nb\\nc\\n"
+            ...     tail_offset(file, 2)
+            2
+        """
+        path = tmp_path / "file.log"
+        path.write_bytes(b"a\nb\nc\n")
+
+        with open(path, "rb") as file:
+            assert tail_offset(file, 2) == 2
+            assert tail_offset(file, 0) == 6
+            assert tail_offset(file, 10) == 0
+
+    def test_tail_offset_without_final_newline(self, tmp_path):
+        """an unterminated last line counts as a line.
+
+        Example:
+            >>> with open("path/to/file.log", "rb") as file:  # b"a\\nb\\nc"
+            ...     tail_offset(file, 1)
+            4
+        """
+        path = tmp_path / "file.log"
+        path.write_bytes(b"a\nb\nc")
+
+        with open(path, "rb") as file:
+            assert tail_offset(file, 1) == 4
+
+
+class TestFollowFile:
+    def test_follow_file_appended(self, tmp_path):
+        """lines appended to the file are yielded as they arrive.
+
+        Example:
+            >>> lines = follow_file("path/to/file.log", binary=False, count=1)
+            >>> next(lines)
+            'last existing line'
+        """
+        path = tmp_path / "file.log"
+        path.write_text("old\nlast\n")
+        lines = follow_file(str(path), binary=False, count=1, waiter=PollWaiter(0.01))
+
+        assert next(lines) == "last"
+
+        with open(path, "a") as file:
+            file.write("new\npart")
+
+        assert next(lines) == "new"
+
+        with open(path, "a") as file:
+            file.write("ial\n")
+
+        assert next(lines) == "partial"
+        lines.close()
+
+    def test_follow_file_rotated(self, tmp_path):
+        """a rotated file is reopened from the start.
+
+        Example:
+            >>> os.rename("file.log", "file.log.1")  # then file.log is recreated
+            >>> next(lines)
+            'first line of the new file'
+        """
+        path = tmp_path / "file.log"
+        path.write_bytes(b"old\n")
+        lines = follow_file(str(path), binary=True, count=1, waiter=PollWaiter(0.01))
+
+        assert next(lines) == b"old"
+
+        with open(path, "ab") as file:
+            file.write(b"before\n")
+
+        assert next(lines) == b"before"
+
+        os.rename(path, tmp_path / "file.log.1")
+        path.write_bytes(b"rotated\n")
+
+        assert next(lines) == b"rotated"
+        lines.close()
+
+    def test_follow_file_truncated(self, tmp_path):
+        """a truncated file is read again from the start.
+
+        Example:
+            >>> open("file.log", "w").write("fresh\\n")
+            >>> next(lines)
+            'fresh'
+        """
+        path = tmp_path / "file.log"
+        path.write_text("a long first line\n")
+        lines = follow_file(str(path), binary=False, count=1, waiter=PollWaiter(0.01))
+
+        assert next(lines) == "a long first line"
+
+        path.write_text("fresh\n")
+
+        assert next(lines) == "fresh"
+        lines.close()
+
+    def test_follow_file_idle(self, tmp_path):
+        """with idle set, None marks that the file was read to its end.
+
+        Example:
+            >>> lines = follow_file("path/to/file.log", binary=False, count=1, idle=True)
+            >>> next(lines), next(lines)
+            ('last', None)
+        """
+        path = tmp_path / "file.log"
+        path.write_text("last\n")
+        lines = follow_file(str(path), False, 1, PollWaiter(0.01), idle=True)
+
+        assert next(lines) == "last"
+        assert next(lines) is None
+
+        with open(path, "a") as file:
+            file.write("new\n")
+
+        # More idle markers may come before the write is seen
+        assert next(line for line in lines if line is not None) == "new"
+        lines.close()
+
+
+@pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="inotify is linux only"
+)
+class TestInotifyWaiter:
+    def test_inotify_waiter_wakes_on_write(self, tmp_path):
+        """the waiter returns as soon as the file is written.
+
+        Example:
+            >>> waiter = InotifyWaiter("path/to/file.log", timeout=5)
+            >>> waiter.wait()  # returns when the file changes
+        """
+        path = tmp_path / "file.log"
+        path.write_text("")
+        waiter = InotifyWaiter(str(path), timeout=5)
+
+        def append():
+            time.sleep(0.05)
+            with open(path, "a") as file:
+                file.write("line\n")
+
+        thread = threading.Thread(target=append)
+        start = time.monotonic()
+        thread.start()
+        waiter.wait()
+        elapsed = time.monotonic() - start
+        thread.join()
+        waiter.close()
+
+        assert elapsed < 2
+
+    def test_inotify_waiter_ignores_other_files(self, tmp_path):
+        """changes to other files in the directory do not wake the waiter.
+
+        Example:
+            >>> waiter = InotifyWaiter("path/to/file.log", timeout=0.2)
+            >>> waiter.wait()  # returns after the timeout
+        """
+        path = tmp_path / "file.log"
+        path.write_text("")
+        waiter = InotifyWaiter(str(path), timeout=0.3)
+        (tmp_path / "other.log").write_text("noise\n")
+
+        start = time.monotonic()
+        waiter.wait()
+        elapsed = time.monotonic() - start
+        waiter.close()
+
+        assert elapsed >= 0.25
@@ -0,0 +1,74 @@
+import io
+import logging
+import sys
+
+from src.formatter import ColorFormatter, QueueColorHandler
+from src.loader import get_foreground_color, get_reset
+
+RED = get_foreground_color("red")
+RESET = get_reset()
+
+CONFIG = {"patterns": {"error": {"pattern": r"\bERROR\b", "foreground_color": "red"}}}
+
+
+def make_record(message: str, *args, level: int = logging.ERROR) -> logging.LogRecord:
+    return logging.LogRecord("app", level, __file__, 1, message, args, None)
+
+
+class TestColorFormatter:
+    def test_color_formatter_format(self):
+        """records are formatted as usual, then colorized.
+
+        Example:
+            >>> formatter = ColorFormatter("config.toml", "%(levelname)s %(message)s")
+            >>> formatter.format(record)
+            '[fg:red]ERROR[reset] disk full on sda'
+        """
+        formatter = ColorFormatter(CONFIG, "%(levelname)s %(message)s")
+        record = make_record("disk full on %s", "sda")
+
+        assert formatter.format(record) == f"{RED}ERROR{RESET} disk full on sda"
+
+    def test_color_formatter_traceback(self):
+        """every line of a traceback is colorized on its own.
+
+        Example:
+            >>> formatter.format(record_with_traceback)
+            '[fg:red]ERROR[reset] failed\\nTraceback ...\\nValueError: [fg:red]ERROR[reset]'
+        """
+        formatter = ColorFormatter(CONFIG, "%(levelname)s %(message)s")
+        try:
+            raise ValueError("ERROR")
+        except ValueError:
+            record = logging.LogRecord(
+                "app", logging.ERROR, __file__, 1, "failed", None, sys.exc_info()
+            )
+
+        lines = formatter.format(record).split("\n")
+        assert lines[0] == f"{RED}ERROR{RESET} failed"
+        assert lines[-1] == f"ValueError: {RED}ERROR{RESET}"
+
+
+class TestQueueColorHandler:
+    def test_queue_color_handler(self):
+        """records are colorized and written by the listener, in order.
+
+        Example:
+            >>> handler = QueueColorHandler("config.toml", "%(message)s", handler=stream_handler)
+            >>> logging.getLogger("app").addHandler(handler)
+        """
+        stream = io.StringIO()
+        handler = QueueColorHandler(
+            CONFIG, "%(message)s", handler=logging.StreamHandler(stream)
+        )
+        arguments = ["ERROR"]
+        handler.handle(make_record("first %s", arguments))
+        # Merged when logged, not when the listener gets to it
+        arguments.append("late")
+        handler.handle(make_record("second ERROR"))
+        handler.close()
+
+        assert (
+            stream.getvalue()
+            == f"first ['{RED}ERROR{RESET}']\nsecond {RED}ERROR{RESET}\n"
+        )
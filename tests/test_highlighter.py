@@ -0,0 +1,112 @@
+from pathlib import Path
+
+from src import Highlighter
+from src.loader import get_foreground_color, get_reset, load_config, load_rules
+
+EXAMPLES = Path(__file__).parent.parent / "examples"
+
+RED = get_foreground_color("red")
+RESET = get_reset()
+
+RAW_CONFIG = {
+    "patterns": {"error": {"pattern": r"\bERROR\b", "foreground_color": "red"}}
+}
+
+
+class TestHighlighter:
+    def test_highlighter_sources(self):
+        """highlighters build from a path, a parsed config, a Config or rules alike.
+
+        Example:
+            >>> highlighter = Highlighter({"patterns": {"error": {"pattern": "ERROR", "foreground_color": "red"}}})
+            >>> highlighter.highlight("an ERROR here")
+            'an [fg:red]ERROR[reset] here'
+        """
+        path = EXAMPLES / "app.toml"
+        line = "2024-10-10 13:55:37 ERROR request failed from 10.0.0.7"
+        expected = Highlighter(str(path)).highlight(line)
+
+        assert Highlighter(path).highlight(line) == expected
+        assert Highlighter(load_config(str(path))).highlight(line) == expected
+        assert Highlighter(load_rules(str(path))).highlight(line) == expected
+        assert (
+            Highlighter(RAW_CONFIG).highlight("an ERROR here")
+            == f"an {RED}ERROR{RESET} here"
+        )
+
+    def test_highlighter_binary(self):
+        """binary highlighters take and return bytes.
+
+        Example:
+            >>> Highlighter(config, binary=True).highlight(b"ERROR")
+            b'[fg:red]ERROR[reset]'
+        """
+        highlighter = Highlighter(RAW_CONFIG, binary=True)
+
+        assert highlighter.highlight(b"ERROR") == f"{RED}ERROR{RESET}".encode()
+        assert (
+            highlighter.highlight_block(b"ERROR\nok\n")
+            == f"{RED}ERROR{RESET}\nok\n".encode()
+        )
+
+    def test_highlighter_iter(self):
+        """highlight_iter is lazy and keeps newlines out of the match.
+
+        Example:
+            >>> list(highlighter.highlight_iter(["ERROR  \\n", "ok"]))
+            ['ERROR[fg:red]  [reset]\\n', 'ok']
+        """
+        highlighter = Highlighter(
+            {"patterns": {"space": {"pattern": r"\s+$", "foreground_color": "red"}}}
+        )
+        lines = iter(["ERROR  \n", "ok"])
+        result = highlighter.highlight_iter(lines)
+
+        assert next(result) == f"ERROR{RED}  {RESET}\n"
+        assert next(lines) == "ok"
+
+    def test_highlighter_iter_multiline(self):
+        """highlight_iter styles matches across lines, holding lines as needed.
+
+        Example:
+            >>> list(highlighter.highlight_iter(["java.lang.Exception: boom\\n", "    at Foo.bar\\n"]))
+            ['java.lang.[fg:red]Exception: boom[reset]\\n', '[fg:red]    at Foo.bar[reset]\\n']
+        """
+        highlighter = Highlighter(
+            {
+                "patterns": {
+                    "trace": {
+                        "pattern": r"Exception.*\n\s+at .*",
+                        "foreground_color": "red",
+                        "multiline": True,
+                    }
+                }
+            }
+        )
+        lines = ["java.lang.Exception: boom\n", "    at Foo.bar\n", "done"]
+
+        assert list(highlighter.highlight_iter(lines)) == [
+            f"java.lang.{RED}Exception: boom{RESET}\n",
+            f"{RED}    at Foo.bar{RESET}\n",
+            "done",
+        ]
+        assert highlighter.highlight_block("".join(lines)) == "".join(
+            highlighter.highlight_iter(lines)
+        )
+
+    def test_highlighter_block(self):
+        """highlight_block styles text as highlighting each of its lines does.
+
+        Example:
+            >>> highlighter.highlight_block("ERROR\\nok\\n")
+            '[fg:red]ERROR[reset]\\nok\\n'
+        """
+        highlighter = Highlighter(EXAMPLES / "tomcat.toml")
+        lines = (EXAMPLES.parent / "README.md").read_text().splitlines()[:200]
+        text = "\n".join(lines)
+
+        expected = "\n".join(highlighter.highlight(line) for line in lines)
+        assert highlighter.highlight_block(text) == expected
+        assert highlighter.highlight_block(text + "\n") == expected + "\n"
+        assert highlighter.highlight_block("") == ""
+        assert highlighter.highlight_block("\n\n") == "\n\n"
@@ -0,0 +1,140 @@
+from pathlib import Path
+
+import pytest
+from src.line_cache import LineCache
+from src.loader import (
+    Config,
+    Pattern,
+    get_attributes,
+    get_foreground_color,
+    get_reset,
+    load_config,
+)
+from src.processor import process_line
+
+EXAMPLES = Path(__file__).parent.parent / "examples"
+
+RED = get_foreground_color("red")
+
+CONFIG = Config(
+    patterns={
+        "health": Pattern(
+            pattern="health",
+            foreground_color=RED,
+            background_color="",
+            attributes="",
+        ),
+    }
+)
+
+
+class TestLineCache:
+    def test_line_cache_hits(self):
+        """repeated lines are served from the cache with the same output.
+
+        Example:
+            >>> cache = LineCache(config.rules, size=100)
+            >>> cache.process("GET /health"), cache.process("GET /health")
+            ('GET [fg:red]health[reset]', 'GET [fg:red]health[reset]')
+            >>> cache.hits, cache.misses
+            (1, 1)
+        """
+        cache = LineCache(CONFIG.rules, size=100)
+        lines = ["GET /health", "GET /health", "GET /other", "GET /health"]
+
+        assert [cache.process(line) for line in lines] == [
+            process_line(CONFIG, line) for line in lines
+        ]
+        assert (cache.hits, cache.misses) == (2, 2)
+        assert cache.hit_rate == 0.5
+
+    def test_line_cache_evicts_least_recent(self):
+        """the cache holds at most size lines, dropping the least recently used.
+
+        Example:
+            >>> cache = LineCache(config.rules, size=2)
+            >>> for line in ("a", "b", "a", "c"):
+            ...     cache.process(line)
+            >>> list(cache.entries)
+            ['a', 'c']
+        """
+        cache = LineCache(CONFIG.rules, size=2)
+        for line in ("a", "b", "a", "c"):
+            cache.process(line)
+
+        assert list(cache.entries) == ["a", "c"]
+
+    def test_line_cache_prefix(self):
+        """lines differing only in their prefix share an entry.
+
+        Example:
+            >>> cache = LineCache(config.rules, size=100, prefix=9)
+            >>> cache.process("13:55:36 GET /health")
+            '13:55:36 GET /[fg:red]health[reset]'
+        """
+        cache = LineCache(CONFIG.rules, size=100, prefix=9)
+        lines = [f"13:55:{second:02} GET /health" for second in range(60)]
+
+        assert [cache.process(line) for line in lines] == [
+            process_line(CONFIG, line) for line in lines
+        ]
+        # The prefixes match nothing so need no entry, the rest of the line is shared
+        assert (cache.hits, cache.misses) == (59, 1)
+        assert lines[0] == "13:55:00 GET /health"
+        assert cache.process(lines[0]) == f"13:55:00 GET /{RED}health{get_reset()}"
+
+    def test_line_cache_prefix_matches_whole_line(self):
+        """matches across the split or anchored to the line start style as uncached.
+
+        Example:
+            >>> cache = LineCache(config.rules, size=100, prefix=22)
+            >>> line = "2024-10-10 13:55:36 ERROR request failed"
+            >>> cache.process(line) == process_line(config, line)
+            True
+        """
+        config = load_config(str(EXAMPLES / "app.toml"))
+        lines = [
+            "2024-10-10 13:55:36 ERROR request failed from 10.0.0.7",
+            "2024-10-10 13:55:37 2024-10-10 13:55:37 INFO repeated timestamp",
+            "2024-10-10",
+        ]
+
+        for prefix in (10, 20, 22):
+            cache = LineCache(config.rules, size=100, prefix=prefix)
+            for line in lines + lines:
+                assert cache.process(line) == process_line(config, line), (prefix, line)
+
+    def test_line_cache_prefix_adjacent(self):
+        """matches meeting at the split are styled as process_line styles them.
+
+        Example:
+            >>> cache = LineCache(config.rules, size=100, prefix=5)
+            >>> cache.process("abcdefgh")
+            '[fg:red][bold]abcde[normal]fgh[reset]'
+        """
+        config = Config(
+            patterns={
+                "head": Pattern(
+                    pattern="abcde",
+                    foreground_color=RED,
+                    attributes=get_attributes("bold"),
+                ),
+                "tail": Pattern(pattern="fgh", foreground_color=RED),
+            }
+        )
+        cache = LineCache(config.rules, size=100, prefix=5)
+
+        assert cache.process("abcdefgh") == process_line(config, "abcdefgh")
+        assert cache.process("abcde fgh") == process_line(config, "abcde fgh")
+
+    def test_line_cache_invalid_size(self):
+        """the cache needs room for at least one line.
+
+        Example:
+            >>> LineCache(config.rules, size=0)
+            Traceback (most recent call last):
+                ...
+            ValueError: Invalid line cache size: 0
+        """
+        with pytest.raises(ValueError, match="Invalid line cache size: 0"):
+            LineCache(CONFIG.rules, size=0)
@@ -0,0 +1,73 @@
+import re
+
+from src.literals import required_literals
+
+
+class TestRequiredLiterals:
+    def test_required_literals_plain(self):
+        """a plain literal pattern requires itself.
+
+        Example:
+            >>> required_literals(re.compile("SEVERE"))
+            ('SEVERE',)
+        """
+        result = required_literals(re.compile("SEVERE"))
+
+        assert result == ("SEVERE",)
+
+    def test_required_literals_anchors(self):
+        """zero-width anchors do not split a literal.
+
+        Example:
+            >>> required_literals(re.compile(r"\\bERROR\\b"))
+            ('ERROR',)
+        """
+        result = required_literals(re.compile(r"\bERROR\b"))
+
+        assert result == ("ERROR",)
+
+    def test_required_literals_alternation(self):
+        """alternations require any one of their branches.
+
+        Example:
+            >>> required_literals(re.compile("(GET|POST)"))
+            ('GET', 'POST')
+        """
+        result = required_literals(re.compile("(GET|POST|PUT)"))
+
+        assert result == ("GET", "POST", "PUT")
+
+    def test_required_literals_longest(self):
+        """the longest required literal is chosen.
+
+        Example:
+            >>> required_literals(re.compile(r"\\d+ at [a-z]+ Exception"))
+            (' Exception',)
+        """
+        result = required_literals(re.compile(r"\d+ at [a-z]+ Exception"))
+
+        assert result == (" Exception",)
+
+    def test_required_literals_optional(self):
+        """optional parts are not required.
+
+        Example:
+            >>> required_literals(re.compile("(?:abc)?d"))
+            ('d',)
+        """
+        assert required_literals(re.compile("(?:abc)?d")) == ("d",)
+        assert required_literals(re.compile("(?:abc)*")) == ()
+
+    def test_required_literals_none(self):
+        """patterns without literals or matching case-insensitively require nothing.
+
+        Example:
+            >>> required_literals(re.compile(".+"))
+            ()
+            >>> required_literals(re.compile("(?i)error"))
+            ()
+        """
+        assert required_literals(re.compile(".+")) == ()
+        assert required_literals(re.compile("(?i)error")) == ()
+        assert required_literals(re.compile("(?i:error)")) == ()
+        assert required_literals(re.compile("error", re.IGNORECASE)) == ()
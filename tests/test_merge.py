@@ -0,0 +1,138 @@
+import asyncio
+import os
+import threading
+
+import pytest
+from src.merge import (
+    BATCH_LINES,
+    CommandSource,
+    FileSource,
+    PipeSource,
+    Source,
+    create_source,
+    merge_sources,
+)
+
+
+class LineSource(Source):
+    def __init__(self, name: str, lines: list[bytes]):
+        super().__init__(name)
+        self.lines = lines
+
+    async def run(self, put):
+        for line in self.lines:
+            await put(line)
+
+
+def collect(sources) -> list[tuple[int, bytes]]:
+    async def run():
+        return [item async for item in merge_sources(sources)]
+
+    return asyncio.run(run())
+
+
+class TestMergeSources:
+    def test_merge_sources_all_lines(self, tmp_path):
+        """every line of every source is yielded, in order within a source.
+
+        Example:
+            >>> collect([FileSource("a.log"), CommandSource("seq 2")])
+            [(0, b'a'), (1, b'1'), (1, b'2')]
+        """
+        path = tmp_path / "a.log"
+        path.write_bytes(b"one\ntwo\n")
+        result = collect([FileSource(str(path)), CommandSource("seq 3")])
+
+        assert [line for index, line in result if index == 0] == [b"one", b"two"]
+        assert [line for index, line in result if index == 1] == [b"1", b"2", b"3"]
+
+    def test_merge_sources_fair(self):
+        """a noisy source does not starve a quiet one.
+
+        Example:
+            >>> result = collect([LineSource("noisy", noisy), LineSource("quiet", quiet)])
+            >>> [index for index, _ in result].index(1) == BATCH_LINES
+            True
+        """
+        noisy = [b"%d" % index for index in range(5000)]
+        quiet = [b"a", b"b", b"c"]
+        result = collect([LineSource("noisy", noisy), LineSource("quiet", quiet)])
+        order = [index for index, _ in result]
+
+        assert len(result) == 5003
+        # Queued together, so the quiet lines follow the first batch of the noisy source
+        assert order[: BATCH_LINES + 3] == [0] * BATCH_LINES + [1] * 3
+
+    def test_merge_sources_pipe(self, tmp_path):
+        """FIFOs are read through the event loop.
+
+        Example:
+            >>> collect([PipeSource("path/to/fifo")])
+            [(0, b'from fifo')]
+        """
+        path = tmp_path / "fifo"
+        os.mkfifo(path)
+
+        def write():
+            with open(path, "wb") as fifo:
+                fifo.write(b"from fifo\n")
+
+        thread = threading.Thread(target=write)
+        thread.start()
+        result = collect([create_source(str(path))])
+        thread.join()
+
+        assert result == [(0, b"from fifo")]
+
+    def test_merge_sources_error(self, tmp_path):
+        """errors raised by a source are surfaced.
+
+        Example:
+            >>> collect([FileSource("missing.log")])
+            Traceback (most recent call last):
+                ...
+            FileNotFoundError: ...
+        """
+        with pytest.raises(FileNotFoundError):
+            collect([FileSource(str(tmp_path / "missing.log"))])
+
+
+class TestCreateSource:
+    def test_create_source_kinds(self, tmp_path):
+        """regular files become file sources and FIFOs pipe sources.
+
+        Example:
+            >>> type(create_source("app.log")).__name__
+            'FileSource'
+        """
+        path = tmp_path / "app.log"
+        path.write_text("")
+        fifo = tmp_path / "fifo"
+        os.mkfifo(fifo)
+
+        assert isinstance(create_source(str(path)), FileSource)
+        assert isinstance(create_source(str(fifo)), PipeSource)
+        assert create_source(str(path)).name == "app.log"
+
+    def test_command_source_name(self):
+        """command sources are named after the program they run.
+
+        Example:
+            >>> CommandSource("docker logs -f web").name
+            'docker'
+        """
+        assert CommandSource("docker logs -f web").name == "docker"
+
+    def test_command_source_invalid(self):
+        """commands that cannot be split into words are rejected.
+
+        Example:
+            >>> CommandSource('echo "a')
+            Traceback (most recent call last):
+                ...
+            ValueError: Invalid command: echo "a (No closing quotation)
+        """
+        with pytest.raises(ValueError, match="Invalid command: echo"):
+            CommandSource('echo "a')
+        with pytest.raises(TypeError):
+            Source("abstract")
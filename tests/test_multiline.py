@@ -0,0 +1,219 @@
+import os
+import sys
+
+import pytest
+from src.loader import Config, Group, Pattern, get_foreground_color, get_reset
+from src.multiline import MultilineWindow, process_multiline
+from src.processor import process_block, process_line
+from src.source import iter_idle_lines
+
+RED = get_foreground_color("red")
+YELLOW = get_foreground_color("yellow")
+RESET = get_reset()
+
+CONFIG = Config(
+    patterns={
+        "trace": Pattern(
+            pattern=r"^\S.*Exception.*(?:\n\s+at .*)*",
+            foreground_color=YELLOW,
+            multiline=True,
+        ),
+        "error": Pattern(pattern=r"\bERROR\b", foreground_color=RED),
+    }
+)
+
+LINES = [
+    "INFO started",
+    "ERROR java.lang.NullPointerException",
+    "    at a.b(C.java:1)",
+    "    at d.e(F.java:2)",
+    "INFO next",
+]
+
+
+def styled(line: str) -> str:
+    return f"{YELLOW}{line}{RESET}"
+
+
+class TestMultilineWindow:
+    def test_multiline_window_styles_every_line(self):
+        """each line of a match is styled, under the styles of line rules.
+
+        Example:
+            >>> list(process_multiline(config.rules, lines))
+            ['INFO started', '[fg:red]ERROR[fg:yellow] java.lang...', '[fg:yellow]    at a.b(C.java:1)[reset]', ...]
+        """
+        result = list(process_multiline(CONFIG.rules, LINES))
+
+        assert result == [
+            "INFO started",
+            f"{RED}ERROR{YELLOW} java.lang.NullPointerException{RESET}",
+            styled("    at a.b(C.java:1)"),
+            styled("    at d.e(F.java:2)"),
+            "INFO next",
+        ]
+        # The whole text at once styles lines the same
+        assert process_block(CONFIG, LINES) == result
+
+    def test_multiline_window_holds_lines(self):
+        """lines are held while a match reaches the newest line.
+
+        Example:
+            >>> matcher.feed("ERROR java.lang.NullPointerException")
+            []
+            >>> matcher.feed("INFO next")
+            ['...NullPointerException...']
+        """
+        matcher = MultilineWindow(CONFIG.rules)
+
+        assert matcher.feed("INFO started") == ["INFO started"]
+        assert matcher.feed("x Exception") == []
+        assert matcher.feed("    at a.b(C.java:1)") == []
+        assert matcher.feed("INFO next") == [
+            styled("x Exception"),
+            styled("    at a.b(C.java:1)"),
+            "INFO next",
+        ]
+        assert matcher.flush() == []
+
+    def test_multiline_window_holds_partial_match(self):
+        """lines are held while they could begin a match, until it completes or fails.
+
+        Example:
+            >>> matcher = MultilineWindow(Config(patterns={"trace": Pattern(
+            ...     pattern=r"Exception.*\\n\\s+at .*", multiline=True)}).rules)
+            >>> matcher.feed("java.lang.Exception: boom")
+            []
+            >>> matcher.feed("    at Foo.bar")
+            []
+            >>> matcher.feed("INFO next")
+            ['java.lang.[fg:yellow]Exception: boom[reset]', '[fg:yellow]    at Foo.bar[reset]', 'INFO next']
+        """
+        config = Config(
+            patterns={
+                "trace": Pattern(
+                    pattern=r"Exception.*\n\s+at .*",
+                    foreground_color=YELLOW,
+                    multiline=True,
+                ),
+            }
+        )
+        matcher = MultilineWindow(config.rules)
+
+        assert matcher.feed("java.lang.Exception: boom") == []
+        assert matcher.feed("    at Foo.bar") == []
+        assert matcher.feed("INFO next") == [
+            f"java.lang.{styled('Exception: boom')}",
+            styled("    at Foo.bar"),
+            "INFO next",
+        ]
+        # A line failing the match writes the line that began it unstyled
+        assert matcher.feed("Exception: bang") == []
+        assert matcher.feed("INFO next") == ["Exception: bang", "INFO next"]
+        assert matcher.flush() == []
+
+    def test_multiline_window_flush_continues(self):
+        """lines flushed while idle still style the lines that follow.
+
+        Example:
+            >>> matcher.flush()
+            ['[fg:yellow]x Exception[reset]']
+        """
+        matcher = MultilineWindow(CONFIG.rules)
+        matcher.feed("x Exception")
+
+        assert matcher.flush() == [styled("x Exception")]
+        assert matcher.feed("    at a.b(C.java:1)") == []
+        assert matcher.flush() == [styled("    at a.b(C.java:1)")]
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="select() needs sockets")
+    def test_process_multiline_idle_pipe(self):
+        """a line held back is written once the pipe it comes from goes quiet.
+
+        Example:
+            $ (echo "x Exception"; sleep 3; echo INFO) | easel -c ml.toml
+            [fg:yellow]x Exception[reset]     <- right away, not after 3s
+            INFO
+        """
+        read_fd, write_fd = os.pipe()
+        with open(read_fd, "rb", buffering=0) as stream:
+            lines = iter_idle_lines(stream, binary=False, timeout=0.01)
+            result = process_multiline(CONFIG.rules, lines)
+            os.write(write_fd, b"x Exception\n")
+
+            assert next(result) == styled("x Exception")
+            os.write(write_fd, b"INFO next\n")
+            os.close(write_fd)
+            assert list(result) == ["INFO next"]
+
+    def test_multiline_window_bounded(self):
+        """a match that never ends holds at most window lines, and goes on styling.
+
+        Example:
+            >>> matcher = MultilineWindow(rules, window=3)
+            >>> for frame in frames:
+            ...     written += matcher.feed(frame)
+            >>> len(matcher.lines)
+            3
+        """
+        matcher = MultilineWindow(CONFIG.rules, window=3)
+        frames = [f"    at frame{index}" for index in range(10)]
+        written = matcher.feed("x Exception")
+        for frame in frames:
+            written += matcher.feed(frame)
+            assert len(matcher.lines) <= 3
+
+        assert written == [styled("x Exception"), *map(styled, frames[:-3])]
+        assert matcher.flush() == list(map(styled, frames[-3:]))
+
+    def test_multiline_window_invalid(self):
+        """the window has to hold at least one line.
+
+        Example:
+            >>> MultilineWindow(rules, window=0)
+            Traceback (most recent call last):
+            ValueError: Invalid multiline window: 0
+        """
+        with pytest.raises(ValueError, match="Invalid multiline window: 0"):
+            MultilineWindow(CONFIG.rules, window=0)
+
+    def test_multiline_single_line(self):
+        """on their own, lines are matched by multiline rules within the line.
+
+        Example:
+            >>> process_line(config, "x Exception")
+            '[fg:yellow]x Exception[reset]'
+        """
+        assert process_line(CONFIG, "x Exception") == styled("x Exception")
+        assert process_line(CONFIG, "    at a.b(C.java:1)") == "    at a.b(C.java:1)"
+
+    def test_multiline_groups(self):
+        """styled groups of a multiline match are split over the lines they cover.
+
+        Example:
+            >>> list(process_multiline(rules, ["x Exception", "    at a.b"]))
+            ['[fg:red]x Exception[reset]', '[fg:yellow]    at [fg:red]a.b[reset]']
+        """
+        config = Config(
+            patterns={
+                "trace": Pattern(
+                    pattern=r"^(?P<first>\S.*Exception.*)(?:\n\s+at (?P<frame>.*))*",
+                    foreground_color=YELLOW,
+                    multiline=True,
+                    groups={
+                        "first": Group(foreground_color=RED),
+                        "frame": Group(foreground_color=RED),
+                    },
+                ),
+            }
+        )
+        lines = ["x Exception", "    at a.b", "    at c.d"]
+        result = list(process_multiline(config.rules, lines))
+
+        # Only the last repetition of a group is styled, as in re
+        assert result == [
+            f"{RED}x Exception{RESET}",
+            styled("    at a.b"),
+            f"{YELLOW}    at {RED}c.d{RESET}",
+        ]
+        assert process_block(config, lines) == result
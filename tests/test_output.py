@@ -0,0 +1,119 @@
+import io
+
+import pytest
+from src.output import Writer, should_color
+
+
+class FlushCounter(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.flushes = 0
+
+    def flush(self):
+        self.flushes += 1
+        super().flush()
+
+
+class TestWriter:
+    def test_writer_line_policy(self):
+        """the line policy writes and flushes every line.
+
+        Example:
+            >>> stream = io.StringIO()
+            >>> writer = Writer(stream, "line")
+            >>> writer.write("hello")
+            >>> stream.getvalue()
+            'hello\\n'
+        """
+        stream = FlushCounter()
+        writer = Writer(stream, "line")
+        writer.write("one")
+        writer.write("two")
+
+        assert stream.getvalue() == "one\ntwo\n"
+        assert stream.flushes == 2
+
+    def test_writer_block_policy(self):
+        """the block policy holds lines until the block size is reached.
+
+        Example:
+            >>> stream = io.StringIO()
+            >>> with Writer(stream, "block", block_size=8) as writer:
+            ...     writer.write("one")
+            ...     stream.getvalue()
+            ''
+            >>> stream.getvalue()
+            'one\\n'
+        """
+        stream = FlushCounter()
+        writer = Writer(stream, "block", block_size=8)
+        writer.write("one")
+        writer.write("two")
+
+        assert stream.getvalue() == ""
+
+        writer.write("three")
+
+        assert stream.getvalue() == "one\ntwo\nthree\n"
+
+        writer.write("four")
+        writer.flush()
+
+        assert stream.getvalue() == "one\ntwo\nthree\nfour\n"
+
+    def test_writer_auto_policy(self):
+        """the auto policy uses blocks when not writing to a terminal.
+
+        Example:
+            >>> Writer(io.StringIO(), "auto").block_size
+            65536
+        """
+        writer = Writer(io.StringIO(), "auto")
+
+        assert writer.block_size > 0
+
+    def test_writer_binary(self):
+        """binary writers join bytes lines.
+
+        Example:
+            >>> stream = io.BytesIO()
+            >>> with Writer(stream, binary=True) as writer:
+            ...     writer.write(b"\\xff")
+            >>> stream.getvalue()
+            b'\\xff\\n'
+        """
+        stream = io.BytesIO()
+        with Writer(stream, binary=True) as writer:
+            writer.write(b"\xff")
+
+        assert stream.getvalue() == b"\xff\n"
+
+    def test_writer_invalid_policy(self):
+        """an unknown flush policy raises ValueError.
+
+        Example:
+            >>> Writer(io.StringIO(), "invalid")
+            Traceback (most recent call last):
+                ...
+            ValueError: Invalid flush policy: invalid
+        """
+        with pytest.raises(ValueError, match="Invalid flush policy: invalid"):
+            Writer(io.StringIO(), "invalid")
+
+
+class TestShouldColor:
+    def test_should_color_policies(self):
+        """auto colors only terminals, always and never are fixed.
+
+        Example:
+            >>> should_color("auto", io.StringIO())
+            False
+            >>> should_color("always", io.StringIO())
+            True
+        """
+        assert should_color("auto", io.StringIO()) is False
+        assert should_color("always", io.StringIO()) is True
+        assert should_color("never", io.StringIO()) is False
+
+        with pytest.raises(ValueError, match="Invalid color policy: invalid"):
+            should_color("invalid", io.StringIO())
@@ -0,0 +1,89 @@
+from src.loader import Config, Pattern, get_foreground_color
+from src.parallel import process_file_parallel, process_parallel
+from src.processor import process_line
+from src.source import map_file
+
+
+def make_config() -> Config:
+    return Config(
+        patterns={
+            "fox": Pattern(
+                pattern="fox",
+                foreground_color=get_foreground_color("red"),
+                background_color="",
+                attributes="",
+            ),
+            "number": Pattern(
+                pattern=r"\d+",
+                foreground_color=get_foreground_color("green"),
+                background_color="",
+                attributes="",
+            ),
+        }
+    )
+
+
+class TestProcessParallel:
+    def test_process_parallel_preserves_order(self):
+        """parallel processing returns the same lines in the original order.
+
+        Example:
+            >>> config = Config(patterns={"fox": Pattern(pattern="fox", foreground_color="[fg:red]")})
+            >>> list(process_parallel(config.rules, ["fox 1", "dog 2"], jobs=2))
+            ['[fg:red]fox[reset] 1', 'dog 2']
+        """
+        config = make_config()
+        lines = [
+            f"fox {index}" if index % 3 else f"dog {index}" for index in range(500)
+        ]
+        result = list(process_parallel(config.rules, lines, jobs=2, chunk_lines=7))
+
+        assert result == [process_line(config, line) for line in lines]
+
+    def test_process_parallel_bytes(self):
+        """parallel processing works on bytes rule sets.
+
+        Example:
+            >>> list(process_parallel(config.binary_rules, [b"fox"], jobs=2))
+            [b'[fg:red]fox[reset]']
+        """
+        config = make_config()
+        lines = [b"\xff fox %d" % index for index in range(50)]
+        result = list(
+            process_parallel(config.binary_rules, lines, jobs=2, chunk_lines=4)
+        )
+
+        assert result == [process_line(config, line) for line in lines]
+
+    def test_process_parallel_empty(self):
+        """empty input produces no output.
+
+        Example:
+            >>> list(process_parallel(config.rules, [], jobs=2))
+            []
+        """
+        result = list(process_parallel(make_config().rules, [], jobs=2))
+
+        assert result == []
+
+    def test_process_file_parallel(self, tmp_path):
+        """workers process byte ranges of a mapped file in order.
+
+        Example:
+            >>> with map_file("path/to/file.log") as mapped:
+            ...     list(process_file_parallel(config.rules, "path/to/file.log", mapped, 2, False))
+            ['[fg:red]fox[reset] 1', 'dog 2']
+        """
+        config = make_config()
+        lines = [
+            f"fox {index}" if index % 3 else f"dog {index}" for index in range(500)
+        ]
+        path = tmp_path / "file.log"
+        path.write_text("\n".join(lines))
+
+        with map_file(str(path)) as mapped:
+            result = list(
+                process_file_parallel(config.rules, str(path), mapped, 2, False)
+            )
+
+        assert result == [process_line(config, line) for line in lines]
@@ -1,13 +1,19 @@
+from pathlib import Path
+
 from src.processor import process_line
 from src.loader import (
     Config,
+    Group,
     Pattern,
+    load_config,
     get_foreground_color,
     get_background_color,
     get_attributes,
     get_reset,
 )
 
+EXAMPLES = Path(__file__).parent.parent / "examples"
+
 
 class TestProcessLines:
     def test_process_lines_no_matches(self):
@@ -269,7 +275,7 @@ class TestProcessLines:
             ...     )
             ... })
             >>> process_line(config, "The quick brown fox jumps over the lazy dog.")
-            '[fg:red][bg:default][italic]The quick brown [fg:white][bg:red][bold]fox[fg:red][bg:default][italic] jumps over the lazy dog.[reset][bg:reset][fg:reset]'
+            '[fg:red][italic]The quick brown [reset][fg:white][bg:red][bold]fox[reset][fg:red][italic] jumps over the lazy dog.[reset]'
         """
         config = Config(
             patterns={
@@ -289,7 +295,8 @@ class TestProcessLines:
         )
         lines = ["The quick brown fox jumps over the lazy dog."]
         result = [process_line(config, line) for line in lines]
-        expected = f"{get_foreground_color('red')}{get_background_color('')}{get_attributes('italic')}The quick brown {get_foreground_color('white')}{get_background_color('red')}{get_attributes('bold')}fox{get_foreground_color('red')}{get_background_color('')}{get_attributes('italic')} jumps over the lazy dog.{get_reset()}"
+        # Only the parts that differ are emitted, unless resetting is shorter
+        expected = f"{get_foreground_color('red')}{get_attributes('italic')}The quick brown {get_reset()}{get_foreground_color('white')}{get_background_color('red')}{get_attributes('bold')}fox{get_reset()}{get_foreground_color('red')}{get_attributes('italic')} jumps over the lazy dog.{get_reset()}"
         assert result == [expected]
 
     def test_process_lines_overlapping_style_on_left(self):
@@ -449,7 +456,7 @@ class TestProcessLines:
             ...     )
             ... })
             >>> process_line(config, "The quick brown fox jumps over the lazy dog.")
-            '[fg:red][fg:reset]The quick brown fox jumps over the lazy dog.'
+            'The quick brown fox jumps over the lazy dog.'
         """
         config = Config(
             patterns={
@@ -464,8 +471,8 @@ class TestProcessLines:
         lines = ["The quick brown fox jumps over the lazy dog."]
         result = [process_line(config, line) for line in lines]
 
-        # \b matches at position 0 (first match)
-        expected = f"{get_foreground_color('red')}{get_reset()}The quick brown fox jumps over the lazy dog."
+        # \b matches at position 0 (first match), which styles nothing
+        expected = "The quick brown fox jumps over the lazy dog."
         assert result == [expected]
 
     def test_long_line_performance(self):
@@ -837,3 +844,135 @@ class TestProcessLines:
         # Complex overlaps
         expected = f"The {get_foreground_color('red')}brown {get_foreground_color('blue')}fox {get_foreground_color('green')}jumps over{get_reset()} the lazy dog."
         assert result == [expected]
+
+    def test_process_lines_bytes(self):
+        """bytes lines are styled with bytes escape codes, invalid utf-8 untouched.
+
+        Example:
+            >>> config = Config(patterns={
+            ...     "fox": Pattern(
+            ...         pattern="fox",
+            ...         foreground_color="[fg:red]"
+            ...     )
+            ... })
+            >>> process_line(config, b"caf\\xe9 fox")
+            b'caf\\xe9 [fg:red]fox[reset]'
+        """
+        config = Config(
+            patterns={
+                "fox": Pattern(
+                    pattern="fox",
+                    foreground_color=get_foreground_color("red"),
+                    background_color="",
+                    attributes="",
+                ),
+            }
+        )
+        lines = [b"caf\xe9 fox \xff"]
+        result = [process_line(config, line) for line in lines]
+
+        expected = f"caf\xe9 {get_foreground_color('red')}fox{get_reset()} \xff".encode(
+            "latin-1"
+        )
+        assert result == [expected]
+
+    def test_process_lines_bytes_matches_text(self):
+        """bytes and text processing agree on utf-8 input.
+
+        Example:
+            >>> config = load_config("examples/tomcat.toml")
+            >>> process_line(config, line.encode()) == process_line(config, line).encode()
+            True
+        """
+        lines = [
+            "2024-01-01 12:00:00 INFO GET /index 200 OK 200 bytes",
+            "SEVERE: java.lang.NullPointerException at com.foo.Bar(Bar.java:10)",
+        ]
+        for path in sorted(EXAMPLES.glob("*.toml")):
+            config = load_config(str(path))
+
+            for line in lines:
+                assert (
+                    process_line(config, line.encode())
+                    == process_line(config, line).encode()
+                )
+
+    def test_process_lines_all_matches(self):
+        """with all_matches every occurrence of a pattern is styled.
+
+        Example:
+            >>> config = Config(patterns={
+            ...     "status": Pattern(
+            ...         pattern="200",
+            ...         foreground_color="[fg:red]",
+            ...         all_matches=True
+            ...     )
+            ... })
+            >>> process_line(config, "200 OK 200 bytes")
+            '[fg:red]200[reset] OK [fg:red]200[reset] bytes'
+        """
+        config = Config(
+            patterns={
+                "status": Pattern(
+                    pattern="200",
+                    foreground_color=get_foreground_color("red"),
+                    background_color="",
+                    attributes="",
+                    all_matches=True,
+                ),
+                "size": Pattern(
+                    pattern=r"\d+ bytes",
+                    foreground_color=get_foreground_color("blue"),
+                    background_color="",
+                    attributes="",
+                ),
+            }
+        )
+        lines = ["200 OK 200 bytes"]
+        result = [process_line(config, line) for line in lines]
+
+        red = get_foreground_color("red")
+        blue = get_foreground_color("blue")
+        expected = f"{red}200{get_reset()} OK {blue}200 bytes{get_reset()}"
+        assert result == [expected]
+
+    def test_process_lines_groups(self):
+        """styled groups are drawn on top of their match, nested groups on top of theirs.
+
+        Example:
+            >>> config = Config(patterns={
+            ...     "request": Pattern(
+            ...         pattern=r'"(?P<request>(?P<method>[A-Z]+) \\S+)"',
+            ...         foreground_color="[fg:white]",
+            ...         groups={
+            ...             "request": Group(foreground_color="[fg:green]"),
+            ...             "method": Group(foreground_color="[fg:blue]"),
+            ...         },
+            ...     )
+            ... })
+            >>> process_line(config, 'x "GET /" 200')
+            'x [fg:white]"[fg:green][fg:blue]GET[fg:green] /[fg:white]"[reset] 200'
+        """
+        white = get_foreground_color("white")
+        green = get_foreground_color("green")
+        blue = get_foreground_color("blue")
+        config = Config(
+            patterns={
+                "request": Pattern(
+                    pattern=r'"(?P<request>(?P<method>[A-Z]+) \S+)"( \d+)?',
+                    foreground_color=white,
+                    groups={
+                        "request": Group(foreground_color=green),
+                        "method": Group(foreground_color=blue),
+                        # Did not take part in the match
+                        "3": Group(foreground_color=get_foreground_color("red")),
+                    },
+                )
+            }
+        )
+        result = [process_line(config, line) for line in ['x "GET /"', 'x "GET /" 200']]
+
+        assert result == [
+            f'x {white}"{blue}GET{green} /{white}"{get_reset()}',
+            f'x {white}"{blue}GET{green} /{white}"{get_foreground_color("red")} 200{get_reset()}',
+        ]
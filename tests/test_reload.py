@@ -0,0 +1,114 @@
+import time
+from functools import partial
+
+from src.cli import run
+from src.follow import PollWaiter
+from src.loader import load_rules
+from src.processor import process_line
+from src.reload import ReloadingRuleSet
+
+RED = '[patterns.error]\npattern = "ERROR"\nforeground_color = "red"\n'
+BLUE = '[patterns.error]\npattern = "ERROR"\nforeground_color = "blue"\n'
+
+
+class IdleWaiter:
+    """Never wakes, so tests drive reload() themselves."""
+
+    def wait(self):
+        time.sleep(60)
+
+    def close(self):
+        pass
+
+
+def reloading_rules(path, waiter) -> ReloadingRuleSet:
+    load = partial(load_rules, str(path))
+    return ReloadingRuleSet(str(path), load(), load, waiter)
+
+
+class TestReloadingRuleSet:
+    def test_reload_applies_changes(self, tmp_path):
+        """a changed config replaces the rules.
+
+        Example:
+            >>> rules = ReloadingRuleSet("config.toml", load_rules("config.toml"), load)
+            >>> rules.reload()  # after config.toml changed
+            True
+        """
+        config_file = tmp_path / "config.toml"
+        config_file.write_text(RED)
+        rules = reloading_rules(config_file, IdleWaiter())
+
+        assert process_line(rules, "ERROR") == "\x1b[31mERROR\x1b[0m"
+        rules.close()
+        assert not rules.reload()
+
+        config_file.write_text(BLUE + "\n")
+        assert rules.reload()
+        assert process_line(rules, "ERROR") == "\x1b[34mERROR\x1b[0m"
+        rules.close()
+
+    def test_reload_keeps_rules_on_error(self, tmp_path, capsys):
+        """a config that fails to load keeps the previous rules and warns.
+
+        Example:
+            >>> rules.reload()  # config.toml now holds an invalid pattern
+            False
+        """
+        config_file = tmp_path / "config.toml"
+        config_file.write_text(RED)
+        rules = reloading_rules(config_file, IdleWaiter())
+
+        config_file.write_text('[patterns.error]\npattern = "(unclosed"\n')
+
+        assert not rules.reload()
+        assert "Invalid pattern: error" in capsys.readouterr().err
+        assert process_line(rules, "ERROR") == "\x1b[31mERROR\x1b[0m"
+        rules.close()
+
+    def test_reload_in_background(self, tmp_path):
+        """the watcher thread picks up changes on its own.
+
+        Example:
+            $ easel -c config.toml --reload
+        """
+        config_file = tmp_path / "config.toml"
+        config_file.write_text(RED)
+        rules = reloading_rules(config_file, PollWaiter(0.01))
+
+        config_file.write_text(BLUE + "\n")
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            if process_line(rules, "ERROR") == "\x1b[34mERROR\x1b[0m":
+                break
+            time.sleep(0.01)
+
+        assert process_line(rules, "ERROR") == "\x1b[34mERROR\x1b[0m"
+        rules.close()
+
+    def test_reload_runs_without_workers(self, tmp_path, monkeypatch, capsys):
+        """--reload with --jobs colorizes in one process, with a warning.
+
+        Example:
+            $ easel -c config.toml --reload --jobs 4 app.log
+            Warning: --reload runs with --jobs 1, as workers would miss reloads
+        """
+        config_file = tmp_path / "config.toml"
+        config_file.write_text(RED)
+        log_file = tmp_path / "app.log"
+        log_file.write_text("ERROR\n")
+
+        def no_workers(*args):
+            raise AssertionError("workers were started")
+
+        monkeypatch.setattr("src.parallel.process_file_parallel", no_workers)
+        monkeypatch.setattr("src.parallel.process_parallel", no_workers)
+
+        status = run(
+            str(config_file), [str(log_file)], color="always", jobs=4, reload=True
+        )
+
+        assert status == 0
+        captured = capsys.readouterr()
+        assert captured.out == "\x1b[31mERROR\x1b[0m\n"
+        assert "Warning: --reload runs with --jobs 1" in captured.err
@@ -0,0 +1,86 @@
+from src.loader import get_attributes, get_background_color, get_foreground_color
+from src.sgr import RESET, parse_style, transition
+
+RED = get_foreground_color("red")
+GREEN = get_foreground_color("green")
+
+
+def state(foreground=None, background=None, attributes=None):
+    return parse_style(
+        get_foreground_color(foreground)
+        + get_background_color(background)
+        + get_attributes(attributes)
+    )
+
+
+class TestParseStyle:
+    def test_parse_style_loader_sequences(self):
+        """styles built by the loader parse into colors and attributes.
+
+        Example:
+            >>> style = parse_style("\\x1b[38;2;255;0;0m\\x1b[49m\\x1b[1m")
+            >>> style.foreground, style.background, style.attributes
+            ('38;2;255;0;0', None, frozenset({1}))
+        """
+        style = parse_style("\x1b[38;2;255;0;0m\x1b[49m\x1b[1m\x1b[4m")
+
+        assert style is not None
+        assert style.foreground == "38;2;255;0;0"
+        assert style.background is None
+        assert style.attributes == {1, 4}
+
+    def test_parse_style_other_text(self):
+        """styles holding anything but SGR sequences are not parsed.
+
+        Example:
+            >>> parse_style("[fg:red]") is None
+            True
+        """
+        assert parse_style("[fg:red]") is None
+        assert parse_style("\x1b[0m") is None
+        assert parse_style("\x1b[38;5m") is None
+
+
+class TestTransition:
+    def test_transition_from_plain_text(self):
+        """starting a style skips the parts already at their default.
+
+        Example:
+            >>> transition(None, parse_style("\\x1b[31m\\x1b[49m"))
+            '\\x1b[31m'
+        """
+        assert transition(None, state("red")) == RED
+        assert transition(None, state()) == ""
+        assert transition(state("red"), None) == RESET
+
+    def test_transition_changes_only_differences(self):
+        """only the colors and attributes that change are emitted.
+
+        Example:
+            >>> transition(parse_style("\\x1b[31m\\x1b[4m"), parse_style("\\x1b[32m\\x1b[4m"))
+            '\\x1b[32m'
+        """
+        underlined = state("red", None, "underline")
+        assert transition(underlined, state("green", None, "underline")) == GREEN
+        assert transition(underlined, state("red")) == "\x1b[24m"
+
+    def test_transition_bold_and_dim(self):
+        """turning off bold also turns off dim, which is then restored.
+
+        Example:
+            >>> transition(parse_style("\\x1b[31m\\x1b[1m\\x1b[2m"), parse_style("\\x1b[31m\\x1b[2m"))
+            '\\x1b[22m\\x1b[2m'
+        """
+        result = transition(state("red", None, "bold,dim"), state("red", None, "dim"))
+        assert result == "\x1b[22m\x1b[2m"
+
+    def test_transition_prefers_reset(self):
+        """a reset is used when it is shorter than undoing every change.
+
+        Example:
+            >>> transition(parse_style("\\x1b[31m\\x1b[3m"), parse_style("\\x1b[37m\\x1b[41m\\x1b[1m"))
+            '\\x1b[0m\\x1b[37m\\x1b[41m\\x1b[1m'
+        """
+        italic = state("red", None, "italic")
+        result = transition(italic, state("white", "red", "bold"))
+        assert result == RESET + "\x1b[37m\x1b[41m\x1b[1m"
@@ -0,0 +1,165 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from src.source import (
+    iter_file_lines,
+    iter_idle_lines,
+    line_ranges,
+    map_file,
+    read_mapped_lines,
+)
+
+ROOT = Path(__file__).parent.parent
+CONFIG = str(ROOT / "examples" / "app.toml")
+
+
+class TestIterFileLines:
+    def test_iter_file_lines_text(self, tmp_path):
+        """file lines are read from the mapping without their newline.
+
+        Example:
+            >>> list(iter_file_lines("path/to/file.log", binary=False))
+            ['one', 'two']
+        """
+        path = tmp_path / "file.log"
+        path.write_bytes(b"one\ntwo\n\nlast")
+        result = list(iter_file_lines(str(path), binary=False))
+
+        assert result == ["one", "two", "", "last"]
+
+    def test_iter_file_lines_binary(self, tmp_path):
+        """binary lines keep invalid utf-8 bytes; text lines escape them.
+
+        Example:
+            >>> list(iter_file_lines("path/to/file.log", binary=True))
+            [b'\\xff']
+        """
+        path = tmp_path / "file.log"
+        path.write_bytes(b"\xff\n")
+
+        assert list(iter_file_lines(str(path), binary=True)) == [b"\xff"]
+        assert list(iter_file_lines(str(path), binary=False)) == ["\udcff"]
+
+    def test_invalid_utf8_round_trip(self, tmp_path):
+        """bad bytes come out unchanged, whether read from a file or from stdin.
+
+        Example:
+            $ printf 'ERROR \\xff\\n' | easel -c examples/app.toml | od -c
+            ... E R R O R ... 377 \\n
+        """
+        path = tmp_path / "file.log"
+        data = b"ERROR \xff\xfe done\n"
+        path.write_bytes(data)
+        command = [sys.executable, "main.py", "-c", CONFIG, "--color", "always"]
+
+        from_file = subprocess.run([*command, str(path)], cwd=ROOT, capture_output=True)
+        from_stdin = subprocess.run(command, cwd=ROOT, input=data, capture_output=True)
+
+        assert from_file.stdout == from_stdin.stdout
+        assert from_file.stdout.endswith(b" \xff\xfe done\n")
+
+    def test_iter_file_lines_empty(self, tmp_path):
+        """empty files cannot be mapped and produce no lines.
+
+        Example:
+            >>> list(iter_file_lines("path/to/empty.log", binary=False))
+            []
+        """
+        path = tmp_path / "empty.log"
+        path.write_bytes(b"")
+
+        with map_file(str(path)) as mapped:
+            assert mapped is None
+        assert list(iter_file_lines(str(path), binary=False)) == []
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="select() needs sockets")
+class TestIterIdleLines:
+    def test_iter_idle_lines(self):
+        """None marks that a pipe went quiet; a partial line waits for its newline.
+
+        Example:
+            >>> lines = iter_idle_lines(pipe, binary=False, timeout=0.01)
+            >>> next(lines), next(lines)
+            ('one', None)
+        """
+        read_fd, write_fd = os.pipe()
+        with open(read_fd, "rb", buffering=0) as stream:
+            lines = iter_idle_lines(stream, binary=False, timeout=0.01)
+            os.write(write_fd, b"one\ntw")
+
+            assert next(lines) == "one"
+            assert next(lines) is None
+            os.write(write_fd, b"o\nlast")
+            os.close(write_fd)
+            assert list(lines) == ["two", "last"]
+
+    def test_iter_idle_lines_fifo(self, tmp_path):
+        """FIFOs given as files are read the same way when idle is set.
+
+        Example:
+            >>> list(iter_file_lines("path/to/fifo", binary=True, idle=True))
+            [b'one']
+        """
+        path = tmp_path / "fifo"
+        os.mkfifo(path)
+        write_fd = os.open(path, os.O_RDWR)
+        os.write(write_fd, b"one\n")
+        lines = iter_file_lines(str(path), binary=True, idle=True)
+
+        assert next(lines) == b"one"
+        assert next(lines) is None
+        os.close(write_fd)
+        lines.close()
+
+
+class TestLineRanges:
+    def test_line_ranges_aligned(self, tmp_path):
+        """ranges cover the whole file and end on line boundaries.
+
+        Example:
+            >>> list(line_ranges(mapped, chunk_bytes=4))
+            [(0, 6), (6, 12), (12, 15)]
+        """
+        path = tmp_path / "file.log"
+        path.write_bytes(b"aaaaa\nbbbbb\ncc\n")
+
+        with map_file(str(path)) as mapped:
+            result = list(line_ranges(mapped, chunk_bytes=4))
+
+        assert result == [(0, 6), (6, 12), (12, 15)]
+
+    def test_line_ranges_without_final_newline(self, tmp_path):
+        """the last range runs to the end of the file.
+
+        Example:
+            >>> list(line_ranges(mapped, chunk_bytes=100))
+            [(0, 7)]
+        """
+        path = tmp_path / "file.log"
+        path.write_bytes(b"abc\ndef")
+
+        with map_file(str(path)) as mapped:
+            assert list(line_ranges(mapped, chunk_bytes=100)) == [(0, 7)]
+            assert list(line_ranges(mapped, chunk_bytes=2)) == [(0, 4), (4, 7)]
+
+    def test_read_mapped_lines(self, tmp_path):
+        """a range is split into the lines iter_file_lines reads, bad bytes included.
+
+        Example:
+            >>> read_mapped_lines(mapped, binary=False, start=0, end=len(mapped))
+            ['caf\\udcc3', '', 'ok\\udce2\\udc82', 'last']
+        """
+        path = tmp_path / "file.log"
+        path.write_bytes(b"caf\xc3\n\nok\xe2\x82\nlast")
+
+        with map_file(str(path)) as mapped:
+            for binary in (False, True):
+                lines = []
+                for start, end in line_ranges(mapped, chunk_bytes=4):
+                    lines += read_mapped_lines(mapped, binary, start, end)
+                assert lines == list(iter_file_lines(str(path), binary))
+            assert read_mapped_lines(mapped, False, 0, 6) == ["caf\udcc3", ""]
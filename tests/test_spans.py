@@ -0,0 +1,51 @@
+from src.spans import resolve_spans
+
+
+class TestResolveSpans:
+    def test_resolve_spans_nested(self):
+        """a span inside another restores the outer style when it ends.
+
+        Example:
+            >>> resolve_spans([0, 10, 0, 2, 5, 1])
+            [0, 0, 2, 1, 5, 0, 10, -1]
+        """
+        spans = [0, 10, 0, 2, 5, 1]
+
+        assert resolve_spans(spans) == [0, 0, 2, 1, 5, 0, 10, -1]
+
+    def test_resolve_spans_crossing(self):
+        """a span ending under a later one is dropped once that one ends.
+
+        Example:
+            >>> resolve_spans([0, 5, 0, 3, 8, 1])
+            [0, 0, 3, 1, 8, -1]
+        """
+        spans = [0, 5, 0, 3, 8, 1]
+
+        assert resolve_spans(spans) == [0, 0, 3, 1, 8, -1]
+
+    def test_resolve_spans_adjacent(self):
+        """a span starting where another ends replaces it in a single change.
+
+        Example:
+            >>> resolve_spans([0, 3, 0, 3, 6, 1])
+            [0, 0, 3, 1, 6, -1]
+        """
+        spans = [0, 3, 0, 3, 6, 1]
+
+        assert resolve_spans(spans) == [0, 0, 3, 1, 6, -1]
+
+    def test_resolve_spans_many(self):
+        """many adjacent spans of the same style each get their own changes.
+
+        Example:
+            >>> resolve_spans([0, 2, 0, 3, 5, 0])
+            [0, 0, 2, -1, 3, 0, 5, -1]
+        """
+        spans = []
+        for index in range(500):
+            spans += (index * 3, index * 3 + 2, 0)
+        changes = resolve_spans(spans)
+
+        assert len(changes) == 2000
+        assert changes[-4:] == [1497, 0, 1499, -1]
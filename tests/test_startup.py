@@ -0,0 +1,103 @@
+import inspect
+import subprocess
+import sys
+from pathlib import Path
+
+import typer.main
+from src.cli import COMMAND_OPTIONS, parse_args, run
+from src.command import app
+
+ROOT = Path(__file__).parent.parent
+CONFIG = str(ROOT / "examples" / "app.toml")
+
+# Modules the fast path must not import
+HEAVY_MODULES = ("typer", "click", "rich", "pydantic", "asyncio", "concurrent")
+
+
+class TestParseArgs:
+    def test_parse_args_plain(self):
+        """plain command lines are parsed without typer.
+
+        Example:
+            >>> parse_args(["-c", "config.toml", "-j4", "app.log"])["jobs"]
+            4
+        """
+        options = parse_args(
+            ["-c", "config.toml", "-j4", "--color=always", "-e", "ls", "app.log", "-"]
+        )
+
+        assert options is not None
+        assert options["config"] == "config.toml"
+        assert options["jobs"] == 4
+        assert options["color"] == "always"
+        assert options["commands"] == ["ls"]
+        assert options["files"] == ["app.log", "-"]
+        assert options["all_matches"] is False
+
+    def test_parse_args_defers_to_typer(self):
+        """help, unknown options, bad values and a missing config go to typer.
+
+        Example:
+            >>> parse_args(["-c", "config.toml", "--help"]) is None
+            True
+        """
+        for args in (
+            ["-c", "config.toml", "--help"],
+            ["-c", "config.toml", "--version"],
+            ["-c", "config.toml", "--unknown"],
+            ["-c", "config.toml", "-j", "many"],
+            ["-c", "config.toml", "-n", "-1"],
+            ["-c", "config.toml", "--binary=yes"],
+            ["-c"],
+            ["app.log"],
+        ):
+            assert parse_args(args) is None
+
+    def test_command_options_match(self):
+        """the fast path, the typer command and run() take the same options.
+
+        Example:
+            >>> COMMAND_OPTIONS[5]
+            (('-j', '--jobs'), 'jobs', 'count', 1)
+        """
+        params = {param.name: param for param in typer.main.get_command(app).params}
+        defaults = {
+            name: parameter.default
+            for name, parameter in inspect.signature(run).parameters.items()
+        }
+
+        for names, key, _, default in COMMAND_OPTIONS:
+            assert sorted(params[key].opts) == sorted(names)
+            assert params[key].default == default
+            if default is not None:
+                assert defaults[key] == default
+        keys = {key for _, key, _, _ in COMMAND_OPTIONS}
+        assert set(defaults) == keys | {"files"}
+
+
+class TestStartup:
+    def test_startup_skips_heavy_imports(self):
+        """colorizing with a plain command line never imports typer or pydantic.
+
+        Example:
+            $ python -X importtime main.py -c config.toml < /dev/null
+        """
+        script = (
+            "import sys\n"
+            "from src.cli import main\n"
+            "try:\n"
+            f"    main(['-c', {CONFIG!r}])\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "print(' '.join(sys.modules), file=sys.stderr)\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=ROOT,
+            input=b"",
+            capture_output=True,
+            check=True,
+        )
+        modules = {name.split(".")[0] for name in result.stderr.decode().split()}
+
+        assert modules.isdisjoint(HEAVY_MODULES)
@@ -0,0 +1,123 @@
+from src.budget import MatchBudget
+from src.loader import Config, Pattern, get_foreground_color
+from src.processor import process_line
+from src.stats import Profile, ProfiledRuleSet
+
+RED = get_foreground_color("red")
+
+CONFIG = Config(
+    patterns={
+        "error": Pattern(
+            pattern="ERROR", foreground_color=RED, background_color="", attributes=""
+        ),
+        "digits": Pattern(
+            pattern=r"\d+", foreground_color=RED, background_color="", attributes=""
+        ),
+    }
+)
+
+
+class TestProfiledRuleSet:
+    def test_profiled_rule_set_output(self):
+        """profiling leaves the styled output unchanged.
+
+        Example:
+            >>> rules = ProfiledRuleSet(config.rules, Profile())
+            >>> process_line(rules, "ERROR 42") == process_line(config, "ERROR 42")
+            True
+        """
+        rules = ProfiledRuleSet(CONFIG.rules, Profile())
+        lines = ["ERROR 42", "ok", "200 ERROR", ""]
+
+        assert [process_line(rules, line) for line in lines] == [
+            process_line(CONFIG, line) for line in lines
+        ]
+
+    def test_profiled_rule_set_counts(self):
+        """patterns count the lines their regex ran on and their matches.
+
+        Example:
+            >>> profile = Profile()
+            >>> rules = ProfiledRuleSet(config.rules, profile)
+            >>> process_line(rules, "ERROR 42")
+            >>> profile.pattern("error").attempts, profile.pattern("error").hits
+            (1, 1)
+        """
+        profile = Profile()
+        rules = ProfiledRuleSet(CONFIG.rules, profile)
+        for line in ["ERROR 42", "ok", "héllo 7"]:
+            process_line(rules, line)
+
+        error, digits = profile.patterns["error"], profile.patterns["digits"]
+        # The required literal skips the regex on lines without ERROR
+        assert (error.attempts, error.hits) == (1, 1)
+        assert (digits.attempts, digits.hits) == (3, 2)
+        assert error.time > 0 and digits.time > 0
+        assert (profile.lines, profile.size) == (3, 18)
+
+    def test_profile_shared_across_rule_sets(self):
+        """rule sets sharing a profile add to the same pattern statistics.
+
+        Example:
+            >>> profile = Profile()
+            >>> first = ProfiledRuleSet(config.rules, profile)
+            >>> second = ProfiledRuleSet(config.rules, profile)
+            >>> first.counters[0] is second.counters[0]
+            True
+        """
+        profile = Profile()
+        first = ProfiledRuleSet(CONFIG.rules, profile)
+        second = ProfiledRuleSet(CONFIG.rules, profile)
+        process_line(first, "1")
+        process_line(second, "2")
+
+        assert first.counters[1] is second.counters[1]
+        assert profile.patterns["digits"].hits == 2
+
+    def test_profile_summary(self):
+        """the summary lists totals, then patterns from slowest to fastest.
+
+        Example:
+            >>> print(profile.summary())
+            2 lines, 0.0 MB in 0.01 s (200 lines/s, 0.0 MB/s)
+            pattern   time ms     attempts         hits  µs/attempt
+            digits        0.0            2            2        2.00
+            error         0.0            1            1        1.00
+        """
+        profile = Profile()
+        rules = ProfiledRuleSet(CONFIG.rules, profile)
+        process_line(rules, "ERROR 1")
+        profile.patterns["error"].time = 0
+        profile.patterns["digits"].time = 5_000_000
+
+        lines = profile.summary().splitlines()
+
+        assert lines[0].startswith("1 lines, 0.0 MB in ")
+        assert lines[1].split() == [
+            "pattern",
+            "time",
+            "ms",
+            "attempts",
+            "hits",
+            "µs/attempt",
+        ]
+        assert lines[2].split() == ["digits", "5.0", "1", "1", "5000.00"]
+        assert lines[3].split() == ["error", "0.0", "1", "1", "0.00"]
+
+    def test_profiled_rule_set_budget(self):
+        """with a budget, slow patterns are skipped and charged their time.
+
+        Example:
+            >>> budget = MatchBudget(10)
+            >>> rules = ProfiledRuleSet(config.rules, profile, budget)
+            >>> process_line(rules, "aaaa…a!")
+            'aaaa…a'
+        """
+        config = Config(patterns={"nested": Pattern(pattern="^(a+)+$")})
+        profile = Profile()
+        budget = MatchBudget(10)
+        rules = ProfiledRuleSet(config.rules, profile, budget)
+
+        assert process_line(rules, "a" * 40 + "!") == "a" * 40 + "!"
+        assert budget.overruns == {"nested": 1}
+        assert profile.patterns["nested"].time >= 5_000_000
@@ -1,4 +1,7 @@
-from src.processor import get_terminal_style, Style
+import re
+
+from src.engine import Rule
+from src.processor import get_terminal_style
 
 
 class TestTerminalStyle:
@@ -14,28 +17,14 @@ class TestTerminalStyle:
         assert result == "\x1b[0m"
 
     def test_get_terminal_style_with_styles(self):
-        """get_terminal_style combines style components correctly.
+        """get_terminal_style combines the style components of a rule.
 
         Example:
-            >>> style = Style(
-            ...     index=0,
-            ...     type="start",
-            ...     id="test",
-            ...     foreground_color="[fg:red]",
-            ...     background_color="[bg:green]",
-            ...     attributes="[bold]"
-            ... )
-            >>> get_terminal_style(style)
+            >>> rule = Rule("test", re.compile("x"), "[fg:red]", "[bg:green]", "[bold]")
+            >>> get_terminal_style(rule)
             '[fg:red][bg:green][bold]'
         """
-        style = Style(
-            index=0,
-            type="start",
-            id="test",
-            foreground_color="\x1b[31m",
-            background_color="\x1b[42m",
-            attributes="\x1b[1m",
-        )
-        result = get_terminal_style(style)
-
-        assert result == "\x1b[31m\x1b[42m\x1b[1m"
\ No newline at end of file
+        rule = Rule("test", re.compile("x"), "\x1b[31m", "\x1b[42m", "\x1b[1m")
+        result = get_terminal_style(rule)
+
+        assert result == "\x1b[31m\x1b[42m\x1b[1m"